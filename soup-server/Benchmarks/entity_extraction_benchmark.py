@@ -0,0 +1,84 @@
+"""
+------------------------------------------------------------------------
+File : entity_extraction_benchmark.py
+Description: Micro-benchmark of the entity nodes extraction
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Services.Graph.graph_service import entity_values_from_frame
+
+
+# The previous extraction (Python loop over the unique values)
+def loop_entity_values(df, entity_columns):
+    unique_values_data = []
+    for col in entity_columns:
+        unique_values = df[col].unique()
+        for value in unique_values:
+            if not str(value) == "nan":
+                unique_values_data.append({'type': col, 'value': value})
+    return pd.DataFrame(unique_values_data)
+
+
+# Create a synthetic event log with high-cardinality entity columns
+def create_event_log(rows, seed=42):
+    rng = np.random.default_rng(seed)
+
+    orders = rng.integers(0, rows // 2, rows).astype(str)
+    items = rng.integers(0, rows, rows).astype(str)
+    customers = rng.integers(0, 1000, rows).astype(str)
+
+    # 10% of the events refer to two items, 5% have no customer
+    multi_items = rng.random(rows) < 0.1
+    items[multi_items] = np.char.add(np.char.add(items[multi_items], ','), orders[multi_items])
+
+    df = pd.DataFrame({'order_id': 'o' + pd.Series(orders),
+                       'item_id': 'i' + pd.Series(items),
+                       'customer_id': 'c' + pd.Series(customers)})
+    df.loc[rng.random(rows) < 0.05, 'customer_id'] = np.nan
+    return df
+
+
+# Best time of the repeated runs
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+# Run the benchmark
+def main(sizes=(10_000, 100_000, 1_000_000), repeat=3):
+    entity_columns = ['order_id', 'item_id', 'customer_id']
+
+    print(f"{'rows':>10} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>8} {'entities':>10}")
+
+    for rows in sizes:
+        df = create_event_log(rows)
+
+        loop_time = best_time(lambda: loop_entity_values(df, entity_columns), repeat)
+        vectorized_time = best_time(lambda: entity_values_from_frame(df, entity_columns), repeat)
+        entities = len(entity_values_from_frame(df, entity_columns))
+
+        print(f"{rows:>10} {loop_time:>10.3f} {vectorized_time:>15.3f} "
+              f"{loop_time / vectorized_time:>7.1f}x {entities:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+------------------------------------------------------------------------
+File : graph_sanitize_benchmark.py
+Description: Micro-benchmark of the graph records sanitization
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import sys
+import math
+import time
+import random
+
+from pathlib import Path
+from neo4j.time import DateTime
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Shared.support_config import memgraph_datetime_to_string
+from Services.support_service import SupportService
+
+
+# The previous extraction (each node sanitized again for each of its edges)
+def loop_extract_graph_data(data):
+    graph_data = []
+    unique_nodes = set()
+    unique_edges = set()
+
+    for record in data:
+        source = record['source']
+        source['id'] = record['source_id']
+
+        edge = record['edge']
+        edge['id'] = record['edge_id']
+
+        target = record['target']
+        target['id'] = record['target_id']
+
+        for key, value in source.items():
+            if isinstance(value, (int, float)) and math.isnan(value):
+                source[key] = None
+            elif isinstance(value, DateTime):
+                source[key] = memgraph_datetime_to_string(value)
+
+        for key, value in target.items():
+            if isinstance(value, (int, float)) and math.isnan(value):
+                target[key] = None
+            elif isinstance(value, DateTime):
+                target[key] = memgraph_datetime_to_string(value)
+
+        unique_nodes.add(str(source['id']))
+        unique_nodes.add(str(target['id']))
+        unique_edges.add(str(edge['id']))
+
+        graph_data.append({'node_source': source, 'edge': edge, 'node_target': target})
+
+    return {
+        'graph_data': graph_data,
+        'unique_nodes_count': len(unique_nodes),
+        'unique_edges_count': len(unique_edges)
+    }
+
+
+# Create the synthetic event nodes (timestamp, activity and a cost that is NaN for 5% of the events)
+def create_nodes(nodes, seed=42):
+    rng = random.Random(seed)
+
+    return [{'Timestamp': DateTime(2024, 1 + i % 12, 1 + i % 28, i % 24, i % 60, i % 60, (i % 1000) * 1000),
+             'ActivityName': f'Activity {i % 50}',
+             'Cost': float('nan') if rng.random() < 0.05 else rng.random() * 100,
+             'EventID': i} for i in range(nodes)]
+
+
+# Create the records like the driver does (new dictionaries for each record, nodes shared by their edges)
+def create_records(nodes, edges, seed=42):
+    rng = random.Random(seed)
+    records = []
+
+    for edge_id in range(edges):
+        source_id, target_id = rng.randrange(len(nodes)), rng.randrange(len(nodes))
+        records.append({'source': dict(nodes[source_id]), 'source_id': source_id,
+                        'edge': {'Type': 'order', 'ID': f'o{edge_id % 1000}', 'edge_weight': 1}, 'edge_id': edge_id,
+                        'target': dict(nodes[target_id]), 'target_id': target_id})
+
+    return records
+
+
+# Best time of the repeated runs (the records are created again because they are changed in place)
+def best_time(function, nodes, edges, repeat):
+    times = []
+    for _ in range(repeat):
+        records = create_records(nodes, edges)
+        start_time = time.perf_counter()
+        function(records)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+# Run the benchmark
+def main(sizes=((2_000, 10_000), (20_000, 100_000), (200_000, 1_000_000)), repeat=3):
+    print(f"{'edges':>10} {'nodes':>10} {'loop (s)':>10} {'memo (s)':>10} {'speedup':>8}")
+
+    for node_count, edges in sizes:
+        nodes = create_nodes(node_count)
+
+        loop_time = best_time(loop_extract_graph_data, nodes, edges, repeat)
+        memo_time = best_time(SupportService.extract_graph_data, nodes, edges, repeat)
+
+        print(f"{edges:>10} {node_count:>10} {loop_time:>10.3f} {memo_time:>10.3f} {loop_time / memo_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
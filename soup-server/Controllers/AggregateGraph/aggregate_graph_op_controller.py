@@ -11,8 +11,8 @@ License : MIT
 """
 
 # Import
-from flask import Blueprint
-from Shared.support_config import get_db_connector
+from flask import Blueprint, request
+from Shared.support_config import get_db_connector, get_page_parameters, is_ndjson_request
 from Services.AggregateGraph.aggregate_graph_op_service import *
 from Models.logger_model import Logger
 
@@ -36,8 +36,11 @@ def get_class_nodes():
     response = ApiResponse()
 
     try:
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationClassGraphService.get_class_nodes_s(database_connector)
+        return OperationClassGraphService.get_class_nodes_s(database_connector, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -90,8 +93,11 @@ def get_obs_relationships():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationClassGraphService.get_obs_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationClassGraphService.get_obs_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -145,8 +151,11 @@ def get_dfc_relationships():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationClassGraphService.get_dfc_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationClassGraphService.get_dfc_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -13,7 +13,7 @@ License : MIT
 # Import
 import json
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from Shared.support_config import get_db_connector
 from Services.Graph.graph_service import GraphService
 from Models.api_response_model import ApiResponse
@@ -57,8 +57,6 @@ def create_graph():
             logger.error("Invalid file format. The file must be csv")
             return jsonify(response.to_dict()), 400
 
-        copy_file = request.files['copy_file']
-
         # Dataset information
         dataset_name = request.form.get('dataset_name')
         dataset_description = request.form.get('dataset_description')
@@ -89,10 +87,14 @@ def create_graph():
                 trigger_target_rows.append({'trigger': trigger, 'target': target})
                 index += 1
 
+        # Build the graph in background (opt-in), the job progress is sent with SocketIO
+        run_async = request.args.get('async', '0') in ['1', 'true']
+        socketio = current_app.config.get('socketio')
+
         # Execute service
-        return GraphService.create_new_dataset_s(file, copy_file, dataset_name, dataset_description, all_columns,
+        return GraphService.create_new_dataset_s(file, dataset_name, dataset_description, all_columns,
                                                  standard_column, filtered_column, values_column, trigger_target_rows,
-                                                 database_connector)
+                                                 database_connector, run_async, socketio)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -12,7 +12,7 @@ License : MIT
 
 # Import
 from flask import Blueprint, request
-from Shared.support_config import get_db_connector
+from Shared.support_config import get_db_connector, get_page_parameters, is_ndjson_request
 from Services.Graph.op_graph_service import *
 from Services.generic_graph_service import GenericGraphService
 from Models.logger_model import Logger
@@ -37,8 +37,11 @@ def get_event_nodes():
     response = ApiResponse()
 
     try:
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationGraphService.get_event_nodes_s(database_connector)
+        return OperationGraphService.get_event_nodes_s(database_connector, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -94,8 +97,11 @@ def get_entity_nodes():
     try:
         distinct = request.args.get('distinct', type=str)
 
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationGraphService.get_entity_nodes_s(database_connector, distinct)
+        return OperationGraphService.get_entity_nodes_s(database_connector, distinct, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -149,8 +155,11 @@ def get_corr_relationships():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationGraphService.get_corr_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationGraphService.get_corr_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -204,8 +213,11 @@ def get_df_relationships():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationGraphService.get_df_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationGraphService.get_df_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
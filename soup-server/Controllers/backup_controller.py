@@ -0,0 +1,107 @@
+"""
+------------------------------------------------------------------------
+File : backup_controller.py
+Description: Controller for the backup and restore of the datasets
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from flask import Blueprint, request, jsonify
+from Services.backup_service import BackupService
+from Models.api_response_model import ApiResponse
+from Models.logger_model import Logger
+
+# Init the bp
+backup_controller_bp = Blueprint('backup_controller_bp', __name__)
+
+# Engine logger setup
+logger = Logger()
+
+
+@backup_controller_bp.route('/api/v2/backup', methods=['GET'])
+def download_backup():
+    """
+    Download the backup of the datasets (datasets query argument: comma separated names, all if missing;
+    compression query argument: gzip or zstd)
+    :return: the streamed backup (ApiResponse model on error)
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Retrieve data from request
+        dataset_names = get_dataset_names(request.args.get('datasets', type=str))
+        compression = request.args.get('compression', default='gzip', type=str)
+
+        # Execute service
+        return BackupService.export_backup_s(dataset_names, compression)
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
+
+
+@backup_controller_bp.route('/api/v2/backup', methods=['POST'])
+def save_backup():
+    """
+    Save the backup of the datasets on the Engine (backup_name, datasets and compression in the body)
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Retrieve data from request
+        data = request.get_json()
+        backup_name = data.get('backup_name')
+        dataset_names = data.get('datasets') or None
+        compression = data.get('compression') or 'gzip'
+
+        # Execute service
+        return BackupService.save_backup_s(backup_name, dataset_names, compression)
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
+
+
+@backup_controller_bp.route('/api/v2/backup/restore', methods=['POST'])
+def restore_backup():
+    """
+    Restore the datasets from the backup sent as request body (datasets query argument: comma separated names,
+    all the datasets of the backup if missing)
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Retrieve data from request (the body is read while it is restored)
+        dataset_names = get_dataset_names(request.args.get('datasets', type=str))
+
+        # Execute service
+        return BackupService.restore_backup_s(request.stream, dataset_names)
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
+
+
+# Get the dataset names of the comma separated argument (None for all the datasets)
+def get_dataset_names(datasets):
+    dataset_names = [dataset_name.strip() for dataset_name in (datasets or '').split(',') if dataset_name.strip()]
+    return dataset_names or None
@@ -0,0 +1,52 @@
+"""
+------------------------------------------------------------------------
+File : export_controller.py
+Description: Controller for the columnar export of the graph data
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from flask import Blueprint, request, jsonify
+from Shared.support_config import get_db_connector
+from Services.export_service import ExportService
+from Models.api_response_model import ApiResponse
+from Models.logger_model import Logger
+
+# Init the bp
+export_controller_bp = Blueprint('export_controller_bp', __name__)
+
+# Engine database setup
+database_connector = get_db_connector()
+
+# Engine logger setup
+logger = Logger()
+
+
+@export_controller_bp.route('/api/v2/export/<kind>', methods=['GET'])
+def export_graph_data(kind):
+    """
+    Export the graph data (event-nodes, entity-nodes, corr, df, obs, dfc) as Arrow IPC stream or Parquet file
+    (format query argument: arrow or parquet)
+    :param kind: the export kind
+    :return: the Arrow IPC stream or the Parquet file (ApiResponse model on error)
+    """
+
+    response = ApiResponse()
+
+    try:
+        export_format = request.args.get('format', default='arrow', type=str)
+
+        # Execute service
+        return ExportService.export_graph_data_s(database_connector, kind, export_format)
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
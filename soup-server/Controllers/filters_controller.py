@@ -73,6 +73,7 @@ def process_analysis():
         # Retrieve data from request
         dataset_name = request.get_json()['dataset_name']
         analysis_name = request.get_json()['analysis_name']
+        breakdown = request.args.get('breakdown', default='0', type=str) in ['1', 'true', 'True']
 
         # Check the name
         if not analysis_name or not dataset_name:
@@ -84,7 +85,7 @@ def process_analysis():
             return jsonify(response.to_dict()), 400
 
         # Execute service
-        return FiltersService.process_analyses_s(database_connector, dataset_name, analysis_name)
+        return FiltersService.process_analyses_s(database_connector, dataset_name, analysis_name, breakdown)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
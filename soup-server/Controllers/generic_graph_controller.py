@@ -12,7 +12,7 @@ License : MIT
 
 # Import
 from flask import Blueprint, request, jsonify
-from Shared.support_config import get_db_connector
+from Shared.support_config import get_db_connector, get_page_parameters, is_ndjson_request, get_graph_format
 from Services.docker_service import DockerService
 from Services.generic_graph_service import GenericGraphService
 from Models.api_response_model import ApiResponse
@@ -95,8 +95,15 @@ def get_complete_graph():
         standard_graph = data.get('standard_graph')
         limit = request.args.get('limit', type=int)
 
-        # Execute service
-        return GenericGraphService.get_graph_s(database_connector, standard_graph, limit)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Payload format (format query argument: triples, normalized or columnar)
+        graph_format = get_graph_format(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return GenericGraphService.get_graph_s(database_connector, standard_graph, limit, after, page_size,
+                                               is_ndjson_request(request), graph_format)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
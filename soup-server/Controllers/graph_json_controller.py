@@ -11,8 +11,8 @@ License : MIT
 """
 
 # Import
-from flask import Blueprint, jsonify
-from Shared.support_config import get_db_connector
+from flask import Blueprint, request, jsonify
+from Shared.support_config import get_db_connector, get_page_parameters, is_ndjson_request
 from Models.api_response_model import ApiResponse
 from Services.AggregateGraph.aggregate_graph_op_service import OperationClassGraphService
 from Services.Graph.op_graph_service import OperationGraphService
@@ -39,8 +39,11 @@ def get_json_graph_event_nodes():
     response = ApiResponse()
 
     try:
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationGraphService.get_event_nodes_s(database_connector)
+        return OperationGraphService.get_event_nodes_s(database_connector, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -60,8 +63,11 @@ def get_json_graph_entity_nodes():
     response = ApiResponse()
 
     try:
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationGraphService.get_entity_nodes_s(database_connector)
+        return OperationGraphService.get_entity_nodes_s(database_connector, None, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -81,8 +87,11 @@ def get_json_graph_corr_rel():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationGraphService.get_corr_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationGraphService.get_corr_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -102,8 +111,11 @@ def get_json_graph_df_rel():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationGraphService.get_df_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationGraphService.get_df_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -124,8 +136,11 @@ def get_json_graph_class_nodes():
     response = ApiResponse()
 
     try:
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
         # Execute service
-        return OperationClassGraphService.get_class_nodes_s(database_connector)
+        return OperationClassGraphService.get_class_nodes_s(database_connector, after, page_size)
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -145,8 +160,11 @@ def get_json_graph_obs_rel():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationClassGraphService.get_obs_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationClassGraphService.get_obs_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
@@ -166,8 +184,11 @@ def get_json_graph_df_c_rel():
     response = ApiResponse()
 
     try:
-        # Execute service
-        return OperationClassGraphService.get_dfc_relationships_s(database_connector)
+        # Keyset pagination (after and page_size query arguments)
+        after, page_size = get_page_parameters(request.args)
+
+        # Execute service (NDJSON streaming if requested)
+        return OperationClassGraphService.get_dfc_relationships_s(database_connector, after, page_size, is_ndjson_request(request))
     except Exception as e:
         response.http_status_code = 500
         response.response_data = None
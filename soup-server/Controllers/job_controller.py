@@ -0,0 +1,88 @@
+"""
+------------------------------------------------------------------------
+File : job_controller.py
+Description: Controller for the background graph build jobs
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from flask import Blueprint, jsonify, current_app
+from Services.job_service import JobService
+from Models.api_response_model import ApiResponse
+from Models.logger_model import Logger
+
+# Init the bp
+job_controller_bp = Blueprint('job_controller_bp', __name__)
+
+# Engine logger setup
+logger = Logger()
+
+
+@job_controller_bp.route('/api/v2/jobs', methods=['GET'])
+def get_jobs():
+    """
+    Get all the background jobs
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Execute service
+        return JobService.get_jobs_s()
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
+
+
+@job_controller_bp.route('/api/v2/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the status (and the result) of a background job
+    :param job_id: the job id
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Execute service
+        return JobService.get_job_s(job_id)
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
+
+
+@job_controller_bp.route('/api/v2/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Cancel a background job
+    :param job_id: the job id
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        # Execute service
+        return JobService.cancel_job_s(job_id, current_app.config.get('socketio'))
+    except Exception as e:
+        response.http_status_code = 500
+        response.response_data = None
+        response.message = f'Internal Server Error : {str(e)}'
+
+        logger.error(f'Internal Server Error : {str(e)}')
+        return jsonify(response.to_dict()), 500
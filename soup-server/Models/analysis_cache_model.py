@@ -0,0 +1,79 @@
+"""
+------------------------------------------------------------------------
+File : analysis_cache_model.py
+Description: Analysis results cache model class
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import threading
+
+from collections import OrderedDict
+
+# Max number of analysis results kept in memory
+max_cached_analyses = int(os.getenv("SOUP_ANALYSIS_CACHE_SIZE", 32))
+
+
+# Analysis results cache model class (process-wide LRU)
+class AnalysisCache:
+    _entries = OrderedDict()
+    _lock = threading.Lock()
+
+    # The cache key of the analysis currently applied as filter view in Memgraph
+    active_key = None
+
+    # Get a cached result
+    @staticmethod
+    def get(dataset_name, cache_key):
+        with AnalysisCache._lock:
+            entry = AnalysisCache._entries.get((dataset_name, cache_key))
+
+            if entry is not None:
+                AnalysisCache._entries.move_to_end((dataset_name, cache_key))
+
+            return entry
+
+    # Save a result (the least recently used results are evicted)
+    @staticmethod
+    def put(dataset_name, cache_key, entry):
+        with AnalysisCache._lock:
+            AnalysisCache._entries[(dataset_name, cache_key)] = entry
+            AnalysisCache._entries.move_to_end((dataset_name, cache_key))
+
+            while len(AnalysisCache._entries) > max(max_cached_analyses, 0):
+                AnalysisCache._entries.popitem(last=False)
+
+    # Remove the results of a dataset
+    @staticmethod
+    def invalidate(dataset_name):
+        with AnalysisCache._lock:
+            for key in [key for key in AnalysisCache._entries if key[0] == dataset_name]:
+                del AnalysisCache._entries[key]
+
+            AnalysisCache.active_key = None
+
+    # Remove the results of a dataset with a different key prefix (previous configuration)
+    @staticmethod
+    def invalidate_stale(dataset_name, key_prefix):
+        with AnalysisCache._lock:
+            for key in [key for key in AnalysisCache._entries
+                        if key[0] == dataset_name and not key[1].startswith(key_prefix)]:
+                del AnalysisCache._entries[key]
+
+    # Set the analysis applied in Memgraph (None when the view is dropped)
+    @staticmethod
+    def set_active(cache_key):
+        with AnalysisCache._lock:
+            AnalysisCache.active_key = cache_key
+
+    # Check the analysis applied in Memgraph
+    @staticmethod
+    def is_active(cache_key):
+        with AnalysisCache._lock:
+            return cache_key is not None and AnalysisCache.active_key == cache_key
@@ -18,11 +18,24 @@ class ApiResponse:
         self.http_status_code = None
         self.response_data = None
         self.message = None
+        self.paginated = False
+        self.next_cursor = None
+
+    # Set the cursor of the next page (keyset pagination)
+    def set_next_cursor(self, next_cursor):
+        self.paginated = True
+        self.next_cursor = next_cursor
 
     # To dict
     def to_dict(self):
-        return {
+        response = {
             "http_status_code": self.http_status_code,
             "response_data": self.response_data,
             "message": self.message
         }
+
+        # The cursor is returned only by the paginated requests (None on the last page)
+        if self.paginated:
+            response["next_cursor"] = self.next_cursor
+
+        return response
@@ -22,6 +22,8 @@ class DatasetProcessInformation:
         self.finish_time = None
         self.init_class_time = None
         self.finish_class_time = None
+        self.init_index_time = None
+        self.finish_index_time = None
         self.init_event_time = None
         self.finish_event_time = None
         self.init_entity_time = None
@@ -36,6 +38,14 @@ class DatasetProcessInformation:
         self.finish_obs_time = None
         self.init_dfc_time = None
         self.finish_dfc_time = None
+        self.init_snapshot_time = None
+        self.finish_snapshot_time = None
+        self.init_restore_time = None
+        self.finish_restore_time = None
+        self.restored_from_snapshot = False
+        self.missing_indexes = []
+        self.corr_key_times = {}
+        self.df_key_times = {}
 
     # To dict
     def to_dict(self):
@@ -44,6 +54,8 @@ class DatasetProcessInformation:
             "finish_time": self.finish_time,
             "init_class_time": self.init_class_time,
             "finish_class_time": self.finish_class_time,
+            "init_index_time": self.init_index_time,
+            "finish_index_time": self.finish_index_time,
             "init_event_time": self.init_event_time,
             "finish_event_time": self.finish_event_time,
             "init_entity_time": self.init_entity_time,
@@ -58,4 +70,12 @@ class DatasetProcessInformation:
             "finish_obs_time": self.finish_obs_time,
             "init_dfc_time": self.init_dfc_time,
             "finish_dfc_time": self.finish_dfc_time,
+            "init_snapshot_time": self.init_snapshot_time,
+            "finish_snapshot_time": self.finish_snapshot_time,
+            "init_restore_time": self.init_restore_time,
+            "finish_restore_time": self.finish_restore_time,
+            "restored_from_snapshot": self.restored_from_snapshot,
+            "missing_indexes": self.missing_indexes,
+            "corr_key_times": self.corr_key_times,
+            "df_key_times": self.df_key_times,
         }
@@ -0,0 +1,153 @@
+"""
+------------------------------------------------------------------------
+File : docker_client_model.py
+Description: Docker client model class (process-wide client and container handles)
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import time
+import docker
+import threading
+
+from Models.logger_model import Logger
+
+# Seconds a container handle is reused before a new inspect
+container_cache_ttl = float(os.getenv("SOUP_DOCKER_CACHE_TTL", 30))
+
+# The container events that invalidate the cached handles
+INVALIDATING_EVENTS = ['start', 'restart', 'stop', 'die', 'destroy', 'rename']
+
+# Engine logger setup
+logger = Logger()
+
+
+# Docker client model class (one client for the process, container handles cached with a TTL)
+class DockerClient:
+    _client = None
+    _containers = {}
+    _lock = threading.Lock()
+    _events_thread = None
+    _events_retry_at = 0.0
+
+    # Docker API calls of the current thread (request)
+    _calls = threading.local()
+
+    # Get the client
+    @staticmethod
+    def get_client():
+        """
+        Get the process-wide Docker client (created on first use) and start the events listener
+        :return: the Docker client
+        """
+        with DockerClient._lock:
+            if DockerClient._client is None:
+                DockerClient.count_api_call()
+                DockerClient._client = docker.from_env()
+
+            # The listener is started again (at most once for each TTL) if it stopped
+            listening = DockerClient._events_thread is not None and DockerClient._events_thread.is_alive()
+
+            if not listening and time.monotonic() >= DockerClient._events_retry_at:
+                DockerClient._events_retry_at = time.monotonic() + container_cache_ttl
+                DockerClient._events_thread = threading.Thread(target=listen_container_events, daemon=True)
+                DockerClient._events_thread.start()
+
+            return DockerClient._client
+
+    # Get a container handle
+    @staticmethod
+    def get_container(container_key):
+        """
+        Get the container handle from the cache (inspected again after the TTL, a restart or a NotFound error)
+        :param container_key: the container id or name
+        :return: the container handle
+        """
+        with DockerClient._lock:
+            cached = DockerClient._containers.get(container_key)
+
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        client = DockerClient.get_client()
+
+        DockerClient.count_api_call()
+        container = CachedContainer(container_key, client.containers.get(container_key))
+
+        with DockerClient._lock:
+            DockerClient._containers[container_key] = (container, time.monotonic() + container_cache_ttl)
+
+        return container
+
+    # Invalidate the container handles
+    @staticmethod
+    def invalidate(container_key=None):
+        """
+        Remove a container handle from the cache (all the handles if the key is None)
+        :param container_key: the container id or name
+        """
+        with DockerClient._lock:
+            if container_key is None:
+                DockerClient._containers.clear()
+            else:
+                DockerClient._containers.pop(container_key, None)
+
+    # Count a Docker API call
+    @staticmethod
+    def count_api_call():
+        DockerClient._calls.count = getattr(DockerClient._calls, 'count', 0) + 1
+
+    # Reset the Docker API calls counter of the current thread
+    @staticmethod
+    def reset_api_calls():
+        DockerClient._calls.count = 0
+
+    # Get the Docker API calls counter of the current thread
+    @staticmethod
+    def get_api_calls():
+        return getattr(DockerClient._calls, 'count', 0)
+
+
+# Container handle: it counts the Docker API calls and invalidates the cache on NotFound
+class CachedContainer:
+
+    # Init model
+    def __init__(self, container_key, container):
+        self._container_key = container_key
+        self._container = container
+
+    # Delegate to the container (the methods are wrapped)
+    def __getattr__(self, name):
+        attribute = getattr(self._container, name)
+
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            DockerClient.count_api_call()
+
+            try:
+                return attribute(*args, **kwargs)
+            except docker.errors.NotFound:
+                DockerClient.invalidate(self._container_key)
+                raise
+
+        return call
+
+
+# Listen the container events and invalidate the handles (the TTL still applies if the listener stops)
+def listen_container_events():
+    try:
+        client = docker.from_env()
+
+        for _ in client.events(decode=True, filters={'type': 'container', 'event': INVALIDATING_EVENTS}):
+            DockerClient.invalidate()
+
+    except Exception as e:
+        logger.warning(f'Docker events listener stopped: {str(e)}')
@@ -12,20 +12,41 @@ License : MIT
 
 # Import
 import io
+import os
 import json
 import tarfile
-import docker
 import shutil
+import tempfile
 
 from pathlib import Path
 from typing import Optional
+from Models.docker_client_model import DockerClient
+from Models.metadata_catalog_model import MetadataCatalog
+
+# Size of the file chunks sent in the streamed tar archives
+tar_chunk_size = 1024 * 1024
+
+# The soup-volume mounted on the Engine: the /soup files are read and written directly (no exec, no tar archive).
+# If the variable is not set or the folder is not mounted, the docker exec path is used
+shared_volume_path = os.getenv("SOUP_SHARED_VOLUME")
+
+# Print the dataset folders and the metadata files (configs, svg, analyses) of /soup, NUL separated:
+# <D|F> NUL <path> NUL <content> NUL (the folders have no content)
+SOUP_METADATA_SCRIPT = (
+    'exec 2>/dev/null; cd /soup || exit 0; '
+    'for path in */; do [ -d "$path" ] && printf \'D\\0%s\\0\\0\' "${path%/}"; done; '
+    'for path in */*_config.json */*_config.svg */Analyses/*.json; do '
+    '[ -f "$path" ] && printf \'F\\0%s\\0\' "$path" && cat "$path" && printf \'\\0\'; done; '
+    'exit 0'
+)
 
 
 # Docker File Manager model class
 class DockerFileManager:
 
     @staticmethod
-    def copy_file_to_container(container_id, dataset_name, file_path, is_entity=False, is_json=False, is_svg=False):
+    def copy_file_to_container(container_id, dataset_name, file_path, is_entity=False, is_json=False, is_svg=False,
+                               is_snapshot=False):
         """
         Copy specific file to the docker container
         :param container_id: the container unique id
@@ -34,55 +55,74 @@ class DockerFileManager:
         :param is_entity: if the file is for entity
         :param is_json: if the file is json file
         :param is_svg: if the file is svg file
+        :param is_snapshot: if the file is the graph snapshot
         :return: success or error message with content
         """
 
-        # 1. Check the file
-        temp_path = Path(file_path)
-        if not temp_path.exists():
-            return "Error: The specified file does not exist."
+        file_name = get_dataset_file_name(dataset_name, is_entity, is_json, is_svg, is_snapshot)
+        result, container_file_paths = DockerFileManager.copy_files_to_container(container_id, dataset_name,
+                                                                                 [(file_path, file_name)])
 
-        # 2. Determine the file name based on is_entity
-        file_name = f'{dataset_name}.csv'
+        if result != 'success':
+            return result, None
 
-        if is_entity:
-            file_name = f"{dataset_name}_entity.csv"
-        elif is_json:
-            file_name = f"{dataset_name}_config.json"
-        elif is_svg:
-            file_name = f"{dataset_name}_config.svg"
+        return "success", container_file_paths[0]
+
+    @staticmethod
+    def copy_files_to_container(container_id, dataset_name, files):
+        """
+        Copy the dataset files to the docker container with a single archive (one put_archive call).
+        The tar archive is streamed chunk by chunk while it is uploaded (the files are never loaded in memory)
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :param files: the (file path, file name on the container) list
+        :return: success or error message with the container file paths
+        """
+
+        # 1. Check the files
+        files = [(Path(file_path), file_name) for file_path, file_name in files]
+
+        for file_path, _ in files:
+            if not file_path.exists():
+                return f"Error: The specified file {file_path} does not exist.", None
 
         try:
+            container_directory = f'/soup/{dataset_name}'
+            container_file_paths = [f'{container_directory}/{file_name}' for _, file_name in files]
+
+            # 2. Shared volume: plain streaming copies
+            if get_shared_path(container_directory) is not None:
+                for (file_path, file_name), container_file_path in zip(files, container_file_paths):
+                    copy_to_shared_volume(file_path, container_file_path)
+                    update_dataset_catalog(container_id, dataset_name, file_path, file_name)
+
+                return "success", container_file_paths
+
             # 3. Get the client Docker env
-            client = docker.from_env()
-            container = client.containers.get(container_id)
+            container = DockerClient.get_container(container_id)
 
             # 4. Check the folder
-            container_directory = f'/soup/{dataset_name}'
-            result = container.exec_run(
-                ['sh', '-c', f'if [ ! -d {container_directory} ]; then mkdir -p {container_directory}; fi'])
-            print("Directory creation result:", result.output)
-
-            # 5. Create a tar archive
-            tarstream = io.BytesIO()
-            with tarfile.open(fileobj=tarstream, mode='w') as tar:
-                tar.add(temp_path, arcname=f"./{file_name}")
-            tarstream.seek(0)
+            result = container.exec_run(['mkdir', '-p', container_directory])
+            if result.exit_code != 0:
+                return f"Error: Failed to create directory {container_directory} in container.", None
 
-            # 6. Copy the content on the container
-            print(f"Attempting to copy to: {container_directory}/{file_name}")
-            success = container.put_archive(container_directory, tarstream)
+            # 5. Copy the content on the container (streamed tar archive)
+            print(f"Attempting to copy to: {', '.join(container_file_paths)}")
+            success = container.put_archive(container_directory, tar_stream(files))
 
             if not success:
-                return f"Error: put_archive failed to copy the file to {container_directory}"
+                return f"Error: put_archive failed to copy the files to {container_directory}", None
 
-            container_file_path = f'{container_directory}/{file_name}'
-            return "success", container_file_path
+            # 6. Update the metadata catalog
+            for file_path, file_name in files:
+                update_dataset_catalog(container_id, dataset_name, file_path, file_name)
+
+            return "success", container_file_paths
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            return f"Error during file copy: {e}"
+            return f"Error during file copy: {e}", None
 
     @staticmethod
     def copy_analysis_file_to_container(container_id, file_path, dataset_name, analysis_name):
@@ -101,13 +141,19 @@ class DockerFileManager:
             if not analysis_file.exists():
                 return f"Error: The analysis file '{file_path}' does not exist.", None
 
-            # 2. Connect to the Docker container
-            client = docker.from_env()
-            container = client.containers.get(container_id)
-
-            # 3. Define directories in the container
+            # 2. Define directories in the container
             dataset_directory = f"/soup/{dataset_name}"
             analysis_directory = f"{dataset_directory}/Analyses"
+            container_file_path = f"{analysis_directory}/{analysis_name}.json"
+
+            # 3. Shared volume: plain copy, else connect to the Docker container
+            if get_shared_path(container_file_path) is not None:
+                copy_to_shared_volume(analysis_file, container_file_path)
+                MetadataCatalog.set_analysis(container_id, dataset_name, f'{analysis_name}.json',
+                                             json.loads(analysis_file.read_text(encoding='utf-8')))
+                return "success", container_file_path
+
+            container = DockerClient.get_container(container_id)
 
             # 4. Create directories in the container
             for directory in [dataset_directory, analysis_directory]:
@@ -115,19 +161,17 @@ class DockerFileManager:
                 if result.exit_code != 0:
                     return f"Error: Failed to create directory {directory} in container.", None
 
-            # 5. Prepare the tar archive
-            tarstream = io.BytesIO()
-            with tarfile.open(fileobj=tarstream, mode='w') as tar:
-                tar.add(analysis_file, arcname=f"./{analysis_name}.json")
-            tarstream.seek(0)
-
-            # 6. Copy the file into the container
-            container_file_path = f"{analysis_directory}/{analysis_name}.json"
-            success = container.put_archive(analysis_directory, tarstream)
+            # 5. Copy the file into the container (streamed tar archive)
+            files = [(analysis_file, f'{analysis_name}.json')]
+            success = container.put_archive(analysis_directory, tar_stream(files))
 
             if not success:
                 return f"Error: Failed to copy the file to {container_file_path}", None
 
+            # 6. Update the metadata catalog
+            MetadataCatalog.set_analysis(container_id, dataset_name, f'{analysis_name}.json',
+                                         json.loads(analysis_file.read_text(encoding='utf-8')))
+
             return "success", container_file_path
 
         except Exception as e:
@@ -135,6 +179,59 @@ class DockerFileManager:
             traceback.print_exc()
             return f"Error during analysis file copy: {e}", None
 
+    @staticmethod
+    def copy_file_from_container(container_id, container_file_path, file_path):
+        """
+        Copy specific file from the docker container to the engine. The archive is streamed
+        on the disk chunk by chunk (the file is never loaded in memory)
+        :param container_id: the container unique id
+        :param container_file_path: the file path on the container
+        :param file_path: the destination file path on the engine
+        :return: success or error message with content
+        """
+
+        try:
+            # Shared volume: plain streaming copy
+            shared_file_path = get_shared_path(container_file_path)
+
+            if shared_file_path is not None:
+                if not os.path.isfile(shared_file_path):
+                    return f"Error: The file {container_file_path} does not exist", None
+
+                shutil.copyfile(shared_file_path, file_path)
+                return "success", file_path
+
+            container = DockerClient.get_container(container_id)
+
+            # 1. Check the file
+            result = container.exec_run(['ls', container_file_path])
+            if result.exit_code != 0:
+                return f"Error: The file {container_file_path} does not exist", None
+
+            # 2. Stream the tar archive on the disk
+            stream, _ = container.get_archive(container_file_path)
+
+            with tempfile.TemporaryFile() as tarstream:
+                for chunk in stream:
+                    tarstream.write(chunk)
+                tarstream.seek(0)
+
+                # 3. Extract the file
+                with tarfile.open(fileobj=tarstream, mode='r') as tar:
+                    member = tar.next()
+                    source = tar.extractfile(member) if member is not None else None
+
+                    if source is None:
+                        return f"Error: Unable to extract {container_file_path}", None
+
+                    with open(file_path, 'wb') as destination:
+                        shutil.copyfileobj(source, destination)
+
+            return "success", file_path
+
+        except Exception as e:
+            return f"Error during file copy from container: {e}", None
+
     @staticmethod
     def read_json_file_from_container(container_id, dataset_name, analyses_name=None):
         """
@@ -152,8 +249,18 @@ class DockerFileManager:
             json_file_path = f'/soup/{dataset_name}/{dataset_name}_config.json'
 
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_id)
+            # Shared volume: read the file
+            shared_file_path = get_shared_path(json_file_path)
+
+            if shared_file_path is not None:
+                if not os.path.isfile(shared_file_path):
+                    print(f"File {json_file_path} does not exist in the shared volume")
+                    return None, None
+
+                with open(shared_file_path, 'r', encoding='utf-8') as json_file:
+                    return 'success', json.load(json_file)
+
+            container = DockerClient.get_container(container_id)
 
             # 1. Check the file
             result = container.exec_run(['ls', json_file_path])
@@ -177,6 +284,84 @@ class DockerFileManager:
             print(f"Error: {e}")
             return None, None
 
+    @staticmethod
+    def write_json_content_to_container(container_id, container_directory, file_name, content):
+        """
+        Write a json content on the docker container (the archive is built in memory, no engine file)
+        :param container_id: the container unique id
+        :param container_directory: the directory on the container (created if missing)
+        :param file_name: the file name
+        :param content: the json serializable content
+        :return: success or error message with content
+        """
+
+        try:
+            container_file_path = f"{container_directory}/{file_name}"
+
+            # Shared volume: write the file
+            shared_file_path = get_shared_path(container_file_path)
+
+            if shared_file_path is not None:
+                write_shared_file(shared_file_path, json.dumps(content).encode('utf-8'))
+                return "success", container_file_path
+
+            container = DockerClient.get_container(container_id)
+
+            # 1. Create the directory
+            result = container.exec_run(['mkdir', '-p', container_directory])
+            if result.exit_code != 0:
+                return f"Error: Failed to create directory {container_directory} in container.", None
+
+            # 2. Prepare the tar archive
+            data = json.dumps(content).encode('utf-8')
+
+            tarstream = io.BytesIO()
+            with tarfile.open(fileobj=tarstream, mode='w') as tar:
+                tar_info = tarfile.TarInfo(name=file_name)
+                tar_info.size = len(data)
+                tar.addfile(tar_info, io.BytesIO(data))
+            tarstream.seek(0)
+
+            # 3. Copy the file into the container
+            if not container.put_archive(container_directory, tarstream):
+                return f"Error: Failed to copy the file to {container_file_path}", None
+
+            return "success", container_file_path
+
+        except Exception as e:
+            return f"Error during json file write: {e}", None
+
+    @staticmethod
+    def read_container_json_file(container_id, container_file_path):
+        """
+        Read a json file from the docker container (a missing file is not an error)
+        :param container_id: the container unique id
+        :param container_file_path: the file path on the container
+        :return: success or error message with content (None if the file does not exist)
+        """
+
+        try:
+            # Shared volume: read the file
+            shared_file_path = get_shared_path(container_file_path)
+
+            if shared_file_path is not None:
+                if not os.path.isfile(shared_file_path):
+                    return 'success', None
+
+                with open(shared_file_path, 'r', encoding='utf-8') as json_file:
+                    return 'success', json.load(json_file)
+
+            container = DockerClient.get_container(container_id)
+
+            exec_result = container.exec_run(['cat', container_file_path])
+            if exec_result.exit_code != 0:
+                return 'success', None
+
+            return 'success', json.loads(exec_result.output.decode('utf-8'))
+
+        except Exception as e:
+            return f"Error during json file read: {e}", None
+
     @staticmethod
     def remove_container_content_by_path(container_id, container_csv_path):
         """
@@ -186,8 +371,20 @@ class DockerFileManager:
         :return: success or error message
         """
 
-        client = docker.from_env()
-        container = client.containers.get(container_id)
+        # Shared volume: remove the file or the folder
+        shared_path = get_shared_path(container_csv_path)
+
+        if shared_path is not None:
+            try:
+                remove_shared_path(shared_path)
+            except OSError as e:
+                print(f"Error: Unable to remove folder {container_csv_path} in the shared volume: {e}")
+                return 'error'
+
+            MetadataCatalog.remove_path(container_id, container_csv_path)
+            return 'success'
+
+        container = DockerClient.get_container(container_id)
 
         result = container.exec_run(['rm', '-rf', container_csv_path])
 
@@ -195,8 +392,43 @@ class DockerFileManager:
             print(f"Error: Unable to remove folder {container_csv_path} in container {container_id}")
             return 'error'
 
+        MetadataCatalog.remove_path(container_id, container_csv_path)
         return 'success'
 
+    @staticmethod
+    def read_soup_metadata(container_id):
+        """
+        Read the dataset folders and all the metadata files (dataset configs, svg, analyses) of the /soup folder
+        with a single exec on the container
+        :param container_id: the container unique id
+        :return: success or error message with the (path, content) list (the content is None for the folders)
+        """
+
+        try:
+            # Shared volume: read the files
+            shared_soup_path = get_shared_path('/soup')
+
+            if shared_soup_path is not None:
+                return 'success', read_shared_metadata(shared_soup_path)
+
+            container = DockerClient.get_container(container_id)
+
+            result = container.exec_run(['sh', '-c', SOUP_METADATA_SCRIPT])
+            if result.exit_code != 0:
+                return f"Error: Unable to read the /soup metadata in container {container_id}", None
+
+            tokens = result.output.split(b'\0')
+            entries = []
+
+            for index in range(0, len(tokens) - 2, 3):
+                kind, path, content = tokens[index:index + 3]
+                entries.append((path.decode('utf-8'), content.decode('utf-8') if kind == b'F' else None))
+
+            return 'success', entries
+
+        except Exception as e:
+            return f"Error during metadata read: {e}", None
+
     @staticmethod
     def get_dataset_file_path(container_id, dataset_name):
         """
@@ -216,8 +448,9 @@ class DockerFileManager:
         svg_name = f'{dataset_name}_config.svg'
 
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_id)
+            # Shared volume: the container has the same paths (no exec to find them)
+            container = None if get_shared_path(dataset_folder_path) is not None \
+                else DockerClient.get_container(container_id)
 
             # Main CSV file
             main_csv_path = DockerFileManager._find_file(container, dataset_folder_path, main_csv_name)
@@ -256,10 +489,18 @@ class DockerFileManager:
         """
 
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_id)
-
             container_svg_path = f'/soup/{dataset_name}/{dataset_name}_config.svg'
+
+            # Shared volume: read the file
+            shared_file_path = get_shared_path(container_svg_path)
+
+            if shared_file_path is not None:
+                if not os.path.isfile(shared_file_path):
+                    return 'success', None
+
+                return 'success', Path(shared_file_path).read_text()
+
+            container = DockerClient.get_container(container_id)
             result = container.exec_run(f"cat {container_svg_path}")
 
             svg_content = result.output.decode()
@@ -283,8 +524,13 @@ class DockerFileManager:
         """
 
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_id)
+            # Shared volume: list the folder
+            shared_path = get_shared_path(directory)
+
+            if shared_path is not None:
+                return 'success', sorted(os.listdir(shared_path)) if os.path.isdir(shared_path) else []
+
+            container = DockerClient.get_container(container_id)
 
             result = container.exec_run(f"ls {directory}")
             folder_list = result.output.decode().splitlines()
@@ -305,6 +551,11 @@ class DockerFileManager:
         :return: the content if exists
         """
 
+        # Shared volume (no container): check the file in the folder
+        if container is None:
+            file_path = f'{folder_path.rstrip("/")}/{file_name}'
+            return file_path if os.path.isfile(get_shared_path(file_path)) else None
+
         result = container.exec_run(['find', folder_path, '-name', file_name])
         if result.exit_code == 0:
             file_path = result.output.decode('utf-8').strip()
@@ -312,38 +563,273 @@ class DockerFileManager:
         return None
 
     @staticmethod
-    def export_soup_folder_to_backend(container_id, backup_name):
+    def get_dataset_archive_members(container_id, dataset_name):
         """
-        Export the entire /soup folder from the docker container
+        Stream the files of a dataset folder as tar members (names relative to /soup). The members
+        are read from the container archive chunk by chunk (the folder is never loaded in memory),
+        so each file object must be read before the next member
         :param container_id: the container unique id
-        :param backup_name: the name of the backup file
-        :return: success or error message
+        :param dataset_name: the dataset name
+        :return: generator of (tar info, file object or None for the folders)
         """
 
+        dataset_path = f'/soup/{dataset_name}'
+        shared_dataset_path = get_shared_path(dataset_path)
+
+        # Shared volume: walk the folder
+        if shared_dataset_path is not None:
+            yield from shared_archive_members(shared_dataset_path, dataset_name)
+            return
+
+        container = DockerClient.get_container(container_id)
+        chunks, _ = container.get_archive(dataset_path)
+
+        with tarfile.open(fileobj=io.BufferedReader(ChunkReader(chunks), tar_chunk_size), mode='r|') as tar:
+            for member in tar:
+                yield member, tar.extractfile(member) if member.isfile() else None
+
+    @staticmethod
+    def restore_soup_archive(container_id, source, dataset_names=None):
+        """
+        Restore the dataset folders of a tar archive (names relative to /soup) while it is read from the source.
+        Only the folders and the regular files of the datasets are restored (no links, no paths outside /soup)
+        :param container_id: the container unique id
+        :param source: the binary file object of the (uncompressed) tar archive
+        :param dataset_names: the datasets to restore (None for all the datasets of the archive)
+        :return: success or error message with the restored dataset names
+        """
+
+        restored = set()
+
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_id)
+            shared_soup_path = get_shared_path('/soup')
 
-            # 1. Define the source folder in the container and the backup path
-            container_directory = '/soup'
-            backup_directory = f'/tmp/{backup_name}.tar.gz'
+            with tarfile.open(fileobj=source, mode='r|') as tar:
+                members = (member for member in tar if is_restored_member(member, dataset_names))
 
-            # 2. Create a tar archive of the /soup directory in the container
-            tarstream = io.BytesIO()
-            result = container.get_archive(container_directory)
-            with tarfile.open(fileobj=tarstream, mode='w:gz') as tar:
-                # Get the tar data from the container's directory
-                for member in result[0]:
-                    tar.addfile(member, fileobj=result[1].read())
+                # Shared volume: extract the members
+                if shared_soup_path is not None:
+                    for member in members:
+                        tar.extract(member, shared_soup_path, filter='data')
+                        restored.add(member.name.split('/')[0])
+                else:
+                    # Docker: the members are sent while they are read (streamed tar archive)
+                    container = DockerClient.get_container(container_id)
 
-            tarstream.seek(0)
-            # Save the tarball to the backend system
-            with open(backup_directory, 'wb') as f:
-                shutil.copyfileobj(tarstream, f)
+                    def restore_chunks():
+                        for restored_member in members:
+                            restored.add(restored_member.name.split('/')[0])
+                            file = tar.extractfile(restored_member) if restored_member.isfile() else None
+                            yield from tar_member_chunks(restored_member, file)
+
+                        yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+                    if not container.put_archive('/soup', restore_chunks()):
+                        return "Error: put_archive failed to restore the backup", None
 
-            return 'success', backup_directory  # Return the path to the backup file created
+            # The catalog is loaded again with the restored datasets
+            MetadataCatalog.invalidate()
+            return 'success', sorted(restored)
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return f"Error during export: {e}"
+            MetadataCatalog.invalidate()
+            return f"Error during backup restore: {e}", None
+
+
+# Get the shared volume path of a container path (None if the shared volume is not mounted)
+def get_shared_path(container_path):
+    if not shared_volume_path or not os.path.isdir(shared_volume_path):
+        return None
+
+    relative_path = os.path.relpath(os.path.normpath(container_path), '/soup')
+
+    if relative_path == '..' or relative_path.startswith('../'):
+        return None
+
+    return os.path.normpath(os.path.join(shared_volume_path, relative_path))
+
+
+# Write a file on the shared volume (written on a temporary file and renamed, Memgraph never reads a partial file)
+def write_shared_file(shared_file_path, data):
+    os.makedirs(os.path.dirname(shared_file_path), exist_ok=True)
+    temporary_path = f'{shared_file_path}.tmp'
+
+    with open(temporary_path, 'wb') as shared_file:
+        shared_file.write(data)
+
+    os.replace(temporary_path, shared_file_path)
+
+
+# Copy a file on the shared volume (streamed, the file is never loaded in memory)
+def copy_to_shared_volume(source_path, container_file_path):
+    shared_file_path = get_shared_path(container_file_path)
+    os.makedirs(os.path.dirname(shared_file_path), exist_ok=True)
+    temporary_path = f'{shared_file_path}.tmp'
+
+    shutil.copyfile(source_path, temporary_path)
+    os.replace(temporary_path, shared_file_path)
+
+
+# Remove a file or a folder from the shared volume
+def remove_shared_path(shared_path):
+    if os.path.isdir(shared_path):
+        shutil.rmtree(shared_path)
+    elif os.path.exists(shared_path):
+        os.remove(shared_path)
+
+
+# Read the dataset folders and the metadata files of the shared volume (same entries of SOUP_METADATA_SCRIPT)
+def read_shared_metadata(shared_soup_path):
+    if not os.path.isdir(shared_soup_path):
+        return []
+
+    datasets = sorted(name for name in os.listdir(shared_soup_path)
+                      if os.path.isdir(os.path.join(shared_soup_path, name)))
+    entries = [(dataset_name, None) for dataset_name in datasets]
+
+    for dataset_name in datasets:
+        dataset_path = Path(shared_soup_path, dataset_name)
+        analyses_path = dataset_path / 'Analyses'
+
+        files = [dataset_path / f'{dataset_name}_config.json', dataset_path / f'{dataset_name}_config.svg']
+        files += sorted(analyses_path.glob('*.json')) if analyses_path.is_dir() else []
+
+        for file in files:
+            if file.is_file():
+                entries.append((file.relative_to(shared_soup_path).as_posix(), file.read_text(encoding='utf-8')))
+
+    return entries
+
+
+# Get the file name of a dataset file on the container
+def get_dataset_file_name(dataset_name, is_entity=False, is_json=False, is_svg=False, is_snapshot=False):
+    if is_entity:
+        return f"{dataset_name}_entity.csv"
+    if is_json:
+        return f"{dataset_name}_config.json"
+    if is_svg:
+        return f"{dataset_name}_config.svg"
+    if is_snapshot:
+        return f"{dataset_name}_snapshot.jsonl.gz"
+
+    return f'{dataset_name}.csv'
+
+
+# Stream a tar archive of the files: the header, the content chunks and the padding of each file
+def tar_stream(files):
+    for file_path, file_name in files:
+        file_stat = os.stat(file_path)
+
+        tar_info = tarfile.TarInfo(name=f"./{file_name}")
+        tar_info.size = file_stat.st_size
+        tar_info.mtime = int(file_stat.st_mtime)
+        tar_info.mode = 0o644
+
+        with open(file_path, 'rb') as file:
+            yield from tar_member_chunks(tar_info, file)
+
+    # The end of the archive (two empty blocks)
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
+# Stream a tar member: the header, the content chunks and the padding
+def tar_member_chunks(tar_info, file=None):
+    yield tar_info.tobuf(format=tarfile.PAX_FORMAT)
+
+    if file is None:
+        return
+
+    for chunk in iter(lambda: file.read(tar_chunk_size), b''):
+        yield chunk
+
+    padding = -tar_info.size % tarfile.BLOCKSIZE
+    if padding:
+        yield tarfile.NUL * padding
+
+
+# Get the tar members of a dataset folder on the shared volume (the files are closed after they are read)
+def shared_archive_members(shared_dataset_path, dataset_name):
+    for folder, folder_names, file_names in os.walk(shared_dataset_path):
+        folder_names.sort()
+        relative_folder = os.path.relpath(folder, shared_dataset_path)
+        folder_name = dataset_name if relative_folder == '.' else f'{dataset_name}/{relative_folder}'
+
+        yield shared_tar_info(folder, folder_name, tarfile.DIRTYPE), None
+
+        for file_name in sorted(file_names):
+            file_path = os.path.join(folder, file_name)
+
+            if not os.path.isfile(file_path) or os.path.islink(file_path):
+                continue
+
+            with open(file_path, 'rb') as file:
+                yield shared_tar_info(file_path, f'{folder_name}/{file_name}', tarfile.REGTYPE), file
+
+
+# Create the tar info of a shared volume path
+def shared_tar_info(path, name, member_type):
+    path_stat = os.stat(path)
+
+    tar_info = tarfile.TarInfo(name=name)
+    tar_info.type = member_type
+    tar_info.mode = path_stat.st_mode & 0o777
+    tar_info.mtime = int(path_stat.st_mtime)
+    tar_info.size = path_stat.st_size if member_type == tarfile.REGTYPE else 0
+    return tar_info
+
+
+# Check a restored tar member (only folders and regular files inside a dataset folder)
+def is_restored_member(member, dataset_names=None):
+    name = member.name
+
+    while name.startswith('./'):
+        name = name[2:]
+
+    parts = name.rstrip('/').split('/')
+
+    if name.startswith('/') or '..' in parts or not parts[0]:
+        return False
+
+    if dataset_names is not None and parts[0] not in dataset_names:
+        return False
+
+    member.name = name
+    return member.isfile() or member.isdir()
+
+
+# Read a chunks generator as a binary stream (the docker archives)
+class ChunkReader(io.RawIOBase):
+
+    # Init model
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._chunk = b''
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._offset >= len(self._chunk):
+            self._chunk = next(self._chunks, None)
+            self._offset = 0
+
+            if self._chunk is None:
+                self._chunk = b''
+                return 0
+
+        size = min(len(buffer), len(self._chunk) - self._offset)
+        buffer[:size] = self._chunk[self._offset:self._offset + size]
+        self._offset += size
+        return size
+
+
+# Update the metadata catalog with a dataset file
+def update_dataset_catalog(container_id, dataset_name, file_path, file_name):
+    if file_name == get_dataset_file_name(dataset_name, is_json=True):
+        MetadataCatalog.set_dataset_file(container_id, dataset_name, 'config',
+                                         json.loads(file_path.read_text(encoding='utf-8')))
+    elif file_name == get_dataset_file_name(dataset_name, is_svg=True):
+        MetadataCatalog.set_dataset_file(container_id, dataset_name, 'svg', file_path.read_text())
+    else:
+        MetadataCatalog.set_dataset_file(container_id, dataset_name)
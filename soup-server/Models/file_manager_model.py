@@ -30,6 +30,12 @@ class FileManager:
     # The svg folder name for the svg files
     svg_folder_name = 'FileData/temp_svg'
 
+    # The folder name for the graph snapshot files
+    snapshot_folder_name = 'FileData/temp_snapshot'
+
+    # The graph snapshot file extension
+    snapshot_file_type = 'jsonl.gz'
+
     @staticmethod
     def copy_csv_file(file, file_name, entity_folder):
         """
@@ -91,6 +97,8 @@ class FileManager:
                     folder_name = FileManager.csv_entity_folder_name
             elif file_type == "json":
                 folder_name = FileManager.json_folder_name
+            elif file_type == FileManager.snapshot_file_type:
+                folder_name = FileManager.snapshot_folder_name
             else:
                 return "Error: Unsupported file type"
 
@@ -138,6 +146,22 @@ class FileManager:
         except Exception as e:
             return f"Error while copying the file: {e}", None
 
+    @staticmethod
+    def get_snapshot_file_path(file_name):
+        """
+        Get the path of the graph snapshot file on the engine (the folder is created if missing)
+        :param file_name: the file name
+        :return: the file path
+        """
+
+        project_dir = Path(__file__).parent.parent
+        temp_dir = project_dir / FileManager.snapshot_folder_name
+
+        if not temp_dir.exists():
+            temp_dir.mkdir(parents=True)
+
+        return temp_dir / f'{file_name}.{FileManager.snapshot_file_type}'
+
     @staticmethod
     def copy_svg_file(file_name, svg_content):
         """
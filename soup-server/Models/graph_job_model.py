@@ -0,0 +1,76 @@
+"""
+------------------------------------------------------------------------
+File : graph_job_model.py
+Description: Graph build job model class
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import uuid
+import threading
+
+from datetime import datetime
+
+# The graph build stages (in the order used to compute the progress)
+GRAPH_BUILD_STAGES = ['event', 'entity', 'index', 'corr', 'causal', 'df', 'stats']
+
+
+# Raised inside a running job when the cancellation was requested
+class GraphJobCancelled(Exception):
+    pass
+
+
+# Graph build job model class
+class GraphJob:
+
+    # Init Object
+    def __init__(self, kind, dataset_name):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.dataset_name = dataset_name
+        self.status = 'queued'
+        self.stage = None
+        self.completed_stages = []
+        self.process_info = None
+        self.result = None
+        self.error = None
+        self.created_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+        self.start_time = None
+        self.finish_time = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.cleanup = None
+
+    # Check if the job is finished
+    def is_finished(self):
+        return self.status in ['completed', 'failed', 'cancelled']
+
+    # Compute the progress (0 - 100)
+    def get_progress(self):
+        if self.status == 'completed':
+            return 100
+
+        return int(len(self.completed_stages) * 100 / len(GRAPH_BUILD_STAGES))
+
+    # To dict
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "dataset_name": self.dataset_name,
+            "status": self.status,
+            "stage": self.stage,
+            "completed_stages": list(self.completed_stages),
+            "progress": self.get_progress(),
+            "process_info": self.process_info,
+            "result": self.result,
+            "error": self.error,
+            "created_time": self.created_time,
+            "start_time": self.start_time,
+            "finish_time": self.finish_time
+        }
@@ -11,20 +11,38 @@ License : MIT
 """
 
 # Import
+import time
+import atexit
+import threading
+
+from itertools import islice
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from neo4j import GraphDatabase
 
 
 # Memgraph Connector model class
 class MemgraphConnector:
+    # Process-wide pools (one driver for each uri)
+    _pools = {}
+    _pools_lock = threading.Lock()
+
     # Init model
-    def __init__(self, uri, auth):
+    def __init__(self, uri, auth, max_connection_pool_size=50, connection_acquisition_timeout=30.0,
+                 liveness_check_timeout=30.0, max_connection_lifetime=3600.0):
         self._uri = uri
         self._auth = auth
-        self._driver = None
+        self._max_connection_pool_size = max_connection_pool_size
+        self._connection_acquisition_timeout = connection_acquisition_timeout
+        self._liveness_check_timeout = liveness_check_timeout
+        self._max_connection_lifetime = max_connection_lifetime
 
     # Connect function
     def connect(self):
-        self._driver = GraphDatabase.driver(self._uri, auth=self._auth)
+        """
+        Attach the connector to the process-wide pooled driver (created on first use)
+        """
+        self._acquire_pool()
 
     # Run specific query with parameters in Memgraph
     def run_query_memgraph(self, query: object, parameters: dict = None) -> object:
@@ -34,15 +52,236 @@ class MemgraphConnector:
         :param parameters: the parameters
         :return: data result
         """
-        if self._driver is None:
-            raise Exception("Error while connecting to the database.")
-
-        with self._driver.session() as session:
+        with self._session() as session:
             # Execute the query
             result = session.run(query, parameters, database="memgraph", metrics=True)
             return [record.data() for record in result]
 
+    # Stream specific query with parameters in Memgraph
+    def stream_query(self, query: object, parameters: dict = None, batch_size: int = None,
+                     fetch_size: int = 1000):
+        """
+        Stream memgraph query records straight from the open session. The records are pulled
+        from Memgraph fetch_size at a time, only when the consumer asks for them (backpressure).
+        The session is closed when the stream is exhausted or the consumer stops early
+        :param query: the query
+        :param parameters: the parameters
+        :param batch_size: if set, yield lists of batch_size records instead of single records
+        :param fetch_size: the number of records pulled from Memgraph for each round trip
+        :return: generator of records (or of records batches)
+        """
+        with self._session(fetch_size=fetch_size) as session:
+            result = session.run(query, parameters)
+
+            if not batch_size:
+                for record in result:
+                    yield record.data()
+                return
+
+            batch = []
+            for record in result:
+                batch.append(record.data())
+
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+
+    # Run a parameterized write query in batches
+    def run_batched_write(self, query: str, rows, batch_size: int = 10000, parameters: dict = None,
+                          parallel_sessions: int = 1) -> dict:
+        """
+        Run an UNWIND write query in batches. Each batch is sent as the $batch list parameter
+        (e.g. "UNWIND $batch AS row CREATE ...") inside its own explicit write transaction
+        :param query: the query (must read the rows from $batch)
+        :param rows: the rows (any iterable of dict, also a generator)
+        :param batch_size: the number of rows for each transaction
+        :param parameters: other parameters shared by every batch
+        :param parallel_sessions: the number of sessions used to send the batches concurrently
+        :return: the write statistics (rows, batches, seconds, rows per second)
+        """
+        parameters = dict(parameters or {})
+        start_time = time.perf_counter()
+        total_rows = 0
+        total_batches = 0
+
+        def write_batch(session, batch):
+            session.execute_write(lambda tx: tx.run(query, {**parameters, "batch": batch}).consume())
+            return len(batch)
+
+        def batches():
+            iterator = iter(rows)
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    return
+                yield batch
+
+        if parallel_sessions <= 1:
+            with self._session() as session:
+                for current_batch in batches():
+                    total_rows += write_batch(session, current_batch)
+                    total_batches += 1
+        else:
+            # One session for each worker thread (sessions are not thread safe)
+            local = threading.local()
+            sessions = []
+            sessions_lock = threading.Lock()
+
+            def worker(batch):
+                if not hasattr(local, 'session'):
+                    context = self._session()
+                    local.session = context.__enter__()
+                    with sessions_lock:
+                        sessions.append(context)
+                return write_batch(local.session, batch)
+
+            try:
+                with ThreadPoolExecutor(max_workers=parallel_sessions) as executor:
+                    pending = set()
+                    for current_batch in batches():
+                        # Bound the in-flight batches to keep the memory under control
+                        if len(pending) >= parallel_sessions * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                total_rows += future.result()
+                                total_batches += 1
+                        pending.add(executor.submit(worker, current_batch))
+
+                    for future in pending:
+                        total_rows += future.result()
+                        total_batches += 1
+            finally:
+                for context in sessions:
+                    context.__exit__(None, None, None)
+
+        seconds = time.perf_counter() - start_time
+
+        return {
+            "rows": total_rows,
+            "batches": total_batches,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(total_rows / seconds, 2) if seconds > 0 else float(total_rows)
+        }
+
     # Close connect function
     def close(self):
-        if self._driver is not None:
-            self._driver.close()
+        """
+        Release the connector. The pooled driver is shared by the concurrent requests,
+        so it stays alive (use shutdown to close it)
+        """
+        return None
+
+    # Pool statistics
+    def get_pool_statistics(self):
+        """
+        Get the statistics of the connection pool used by this connector
+        :return: the pool configuration and usage counters
+        """
+        with MemgraphConnector._pools_lock:
+            pool = MemgraphConnector._pools.get(self._uri)
+
+            statistics = {
+                "uri": self._uri,
+                "driver_alive": pool is not None,
+                "max_connection_pool_size": self._max_connection_pool_size,
+                "connection_acquisition_timeout": self._connection_acquisition_timeout,
+                "liveness_check_timeout": self._liveness_check_timeout,
+                "max_connection_lifetime": self._max_connection_lifetime
+            }
+
+            if pool is not None:
+                statistics.update(pool['stats'])
+                statistics['idle_seconds'] = round(time.monotonic() - pool['last_used'], 3)
+
+            return statistics
+
+    # Shutdown the pool
+    def shutdown(self):
+        """
+        Close the process-wide driver (and all its pooled connections)
+        """
+        with MemgraphConnector._pools_lock:
+            pool = MemgraphConnector._pools.pop(self._uri, None)
+
+        if pool is not None:
+            pool['driver'].close()
+
+    @staticmethod
+    def shutdown_all():
+        """
+        Close every process-wide driver
+        """
+        with MemgraphConnector._pools_lock:
+            pools = list(MemgraphConnector._pools.values())
+            MemgraphConnector._pools.clear()
+
+        for pool in pools:
+            pool['driver'].close()
+
+    @contextmanager
+    def _session(self, **kwargs):
+        """
+        Open a session on the pooled driver and track the pool usage
+        :param kwargs: the session configuration
+        :return: the session
+        """
+        pool = self._acquire_pool(reserve=True)
+
+        try:
+            with pool['driver'].session(**kwargs) as session:
+                yield session
+        except Exception:
+            with MemgraphConnector._pools_lock:
+                pool['stats']['session_errors'] += 1
+            raise
+        finally:
+            with MemgraphConnector._pools_lock:
+                pool['stats']['active_sessions'] -= 1
+                pool['last_used'] = time.monotonic()
+
+    def _acquire_pool(self, reserve=False):
+        """
+        Get the process-wide pool for the uri (the driver is created when missing). The stale connections
+        are handled by the driver: they are closed after the max connection lifetime and the connections
+        idle longer than the liveness check timeout are checked before they are used again
+        :param reserve: if a session slot must be reserved
+        :return: the pool
+        """
+        with MemgraphConnector._pools_lock:
+            pool = MemgraphConnector._pools.get(self._uri)
+
+            if pool is None:
+                driver = GraphDatabase.driver(
+                    self._uri,
+                    auth=self._auth,
+                    max_connection_pool_size=self._max_connection_pool_size,
+                    connection_acquisition_timeout=self._connection_acquisition_timeout,
+                    liveness_check_timeout=self._liveness_check_timeout,
+                    max_connection_lifetime=self._max_connection_lifetime
+                )
+
+                stats = {
+                    "drivers_created": 1,
+                    "sessions_opened": 0,
+                    "session_errors": 0,
+                    "active_sessions": 0,
+                    "peak_active_sessions": 0
+                }
+
+                pool = {"driver": driver, "stats": stats, "last_used": time.monotonic()}
+                MemgraphConnector._pools[self._uri] = pool
+
+            if reserve:
+                stats = pool['stats']
+                stats['active_sessions'] += 1
+                stats['sessions_opened'] += 1
+                stats['peak_active_sessions'] = max(stats['peak_active_sessions'], stats['active_sessions'])
+
+        return pool
+
+
+# Close the pooled drivers when the Engine stops
+atexit.register(MemgraphConnector.shutdown_all)
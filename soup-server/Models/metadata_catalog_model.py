@@ -0,0 +1,128 @@
+"""
+------------------------------------------------------------------------
+File : metadata_catalog_model.py
+Description: Metadata catalog model class (datasets, analyses and svg index)
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import copy
+import time
+import threading
+
+# Seconds the catalog is used before a new full read of the /soup folder (changes made outside the Engine)
+catalog_ttl = float(os.getenv("SOUP_CATALOG_TTL", 300))
+
+
+# Metadata catalog model class: dataset name -> {'config': dict, 'svg': str, 'analyses': {file name: dict}}
+class MetadataCatalog:
+    _container_id = None
+    _datasets = {}
+    _expires_at = 0.0
+    _lock = threading.Lock()
+
+    # Check the catalog of the container
+    @staticmethod
+    def is_loaded(container_id):
+        with MetadataCatalog._lock:
+            return MetadataCatalog._container_id == container_id and MetadataCatalog._expires_at > time.monotonic()
+
+    # Load the catalog of the container
+    @staticmethod
+    def load(container_id, datasets):
+        with MetadataCatalog._lock:
+            MetadataCatalog._container_id = container_id
+            MetadataCatalog._datasets = datasets
+            MetadataCatalog._expires_at = time.monotonic() + catalog_ttl
+
+    # Invalidate the catalog (the next read loads it again)
+    @staticmethod
+    def invalidate():
+        with MetadataCatalog._lock:
+            MetadataCatalog._container_id = None
+            MetadataCatalog._datasets = {}
+
+    # Get the dataset names (the dataset folders)
+    @staticmethod
+    def get_dataset_names():
+        with MetadataCatalog._lock:
+            return list(MetadataCatalog._datasets)
+
+    # Get a dataset entry (a copy, the callers can change it)
+    @staticmethod
+    def get_dataset(dataset_name):
+        with MetadataCatalog._lock:
+            return copy.deepcopy(MetadataCatalog._datasets.get(dataset_name))
+
+    # Get all the dataset entries (copies)
+    @staticmethod
+    def get_datasets():
+        with MetadataCatalog._lock:
+            return copy.deepcopy(list(MetadataCatalog._datasets.values()))
+
+    # Save a dataset file (config or svg, None for the dataset folder only)
+    @staticmethod
+    def set_dataset_file(container_id, dataset_name, key=None, content=None):
+        with MetadataCatalog._lock:
+            if MetadataCatalog._container_id != container_id:
+                return
+
+            entry = MetadataCatalog._datasets.setdefault(dataset_name, new_dataset_entry())
+
+            if key is not None:
+                entry[key] = content
+
+    # Save an analysis
+    @staticmethod
+    def set_analysis(container_id, dataset_name, file_name, content):
+        with MetadataCatalog._lock:
+            if MetadataCatalog._container_id != container_id:
+                return
+
+            entry = MetadataCatalog._datasets.setdefault(dataset_name, new_dataset_entry())
+            entry['analyses'][file_name] = content
+
+    # Remove the entries of a removed container path
+    @staticmethod
+    def remove_path(container_id, container_path):
+        """
+        Remove the catalog entries of a path removed from the container
+        (/soup/<dataset>, /soup/<dataset>/Analyses or /soup/<dataset>/Analyses/<analysis>)
+        :param container_id: the container unique id
+        :param container_path: the removed path
+        """
+        parts = [part for part in container_path.split('/') if part]
+
+        if len(parts) < 2 or parts[0] != 'soup':
+            return
+
+        with MetadataCatalog._lock:
+            if MetadataCatalog._container_id != container_id:
+                return
+
+            entry = MetadataCatalog._datasets.get(parts[1])
+
+            if entry is None:
+                return
+
+            if len(parts) == 2:
+                del MetadataCatalog._datasets[parts[1]]
+            elif parts[2] == 'Analyses' and len(parts) == 3:
+                entry['analyses'].clear()
+            elif parts[2] == 'Analyses' and len(parts) == 4:
+                entry['analyses'].pop(parts[3], None)
+            elif parts[2] == f'{parts[1]}_config.json':
+                entry['config'] = None
+            elif parts[2] == f'{parts[1]}_config.svg':
+                entry['svg'] = None
+
+
+# Create an empty dataset entry
+def new_dataset_entry():
+    return {'config': None, 'svg': None, 'analyses': {}}
@@ -11,11 +11,9 @@ License : MIT
 """
 
 # Import
-import math
-
 from typing import Iterable
 from flask import jsonify
-from Shared.support_config import memgraph_datetime_to_string
+from Shared.support_config import get_next_cursor
 from Services.support_service import SupportService
 from Models.api_response_model import ApiResponse
 from Models.logger_model import Logger
@@ -30,14 +28,22 @@ class OperationClassGraphService:
 
     # Get  Class nodes
     @staticmethod
-    def get_class_nodes_s(database_connector):
+    def get_class_nodes_s(database_connector, after=None, page_size=None):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_nodes_class_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_nodes_class_page_query(after, page_size)
+            else:
+                query, params = get_nodes_class_query(), None
+
+            result = database_connector.run_query_memgraph(query, params)
+
+            if page_size:
+                response.set_next_cursor(get_next_cursor(result[-1]['cursor'] if result else None,
+                                                         len(result), page_size))
 
             if not isinstance(result, Iterable):
                 response.http_status_code = 204
@@ -92,14 +98,30 @@ class OperationClassGraphService:
 
     # Get :OBS relationships
     @staticmethod
-    def get_obs_relationships_s(database_connector):
+    def get_obs_relationships_s(database_connector, after=None, page_size=None, stream=False):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_obs_relation_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_obs_relation_page_query(after, page_size)
+            else:
+                query, params = get_obs_relation_query(), None
+
+            # NDJSON: the relationships are sent while they come off the connector
+            if stream:
+                records = database_connector.stream_query(query, params)
+                return SupportService.ndjson_response(
+                    records, lambda record, relation_id: SupportService.extract_relationship_record(record, 'obs',
+                                                                                                    relation_id),
+                    page_size), 200
+
+            result = database_connector.run_query_memgraph(query, params)
+
+            if page_size:
+                response.set_next_cursor(get_next_cursor(result[-1]['cursor'] if result else None,
+                                                         len(result), page_size))
 
             if not isinstance(result, Iterable):
                 response.http_status_code = 404
@@ -107,40 +129,16 @@ class OperationClassGraphService:
                 response.message = "Not found"
                 return jsonify(response.to_dict()), 404
 
+            # Each node is sanitized once for the response
+            memo = {}
+
             correlation_data = []
             correlation_count = 0
 
             for record in result:
-                relation = record['obs']
-                event = relation[0]
-                relation_type = relation[1]
-                related_event = relation[2]
-
-                for key, value in event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        event[key] = None
-
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        event[key] = timestamp
-
-                for key, value in related_event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        related_event[key] = None
-
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        related_event[key] = timestamp
-
                 correlation_count = correlation_count + 1
-                relation_id = correlation_count
-
-                correlation_data.append({
-                    'event': event,
-                    'relation_type': relation_type,
-                    'related_event': related_event,
-                    'relation_id': relation_id
-                })
+                correlation_data.append(
+                    SupportService.extract_relationship_record(record, 'obs', correlation_count, memo))
 
             graph_data = {
                 'obs_data': correlation_data,
@@ -186,14 +184,30 @@ class OperationClassGraphService:
 
     # Get :DFC relationships
     @staticmethod
-    def get_dfc_relationships_s(database_connector):
+    def get_dfc_relationships_s(database_connector, after=None, page_size=None, stream=False):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_dfc_relation_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_dfc_relation_page_query(after, page_size)
+            else:
+                query, params = get_dfc_relation_query(), None
+
+            # NDJSON: the relationships are sent while they come off the connector
+            if stream:
+                records = database_connector.stream_query(query, params)
+                return SupportService.ndjson_response(
+                    records, lambda record, relation_id: SupportService.extract_relationship_record(record, 'dfc',
+                                                                                                    relation_id),
+                    page_size), 200
+
+            result = database_connector.run_query_memgraph(query, params)
+
+            if page_size:
+                response.set_next_cursor(get_next_cursor(result[-1]['cursor'] if result else None,
+                                                         len(result), page_size))
 
             if not isinstance(result, Iterable):
                 response.http_status_code = 204
@@ -203,38 +217,16 @@ class OperationClassGraphService:
                 logger.info("No content")
                 return jsonify(response.to_dict()), 204
 
+            # Each node is sanitized once for the response
+            memo = {}
+
             df_data = []
             df_count = 0
 
             for record in result:
-                relation = record['dfc']
-                event = relation[0]
-                relation_type = relation[1]
-                related_event = relation[2]
-
-                for key, value in event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        event[key] = None
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        event[key] = timestamp
-
-                for key, value in related_event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        related_event[key] = None
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        related_event[key] = timestamp
-
                 df_count = df_count + 1
-                relation_id = df_count
-
-                df_data.append({
-                    'event': event,
-                    'relation_type': relation_type,
-                    'related_event': related_event,
-                    'relation_id': relation_id
-                })
+                df_data.append(
+                    SupportService.extract_relationship_record(record, 'dfc', df_count, memo))
 
             graph_data = {
                 'dfc_data': df_data,
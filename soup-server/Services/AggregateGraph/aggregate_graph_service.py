@@ -92,13 +92,13 @@ class ClassGraphService:
             process_info.init_class_node_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
             for element in res:
                 entity = element['prop']
-                cypher_query = change_nan(entity)
-                database_connector.run_query_memgraph(cypher_query)
+                cypher_query, params = change_nan(entity)
+                database_connector.run_query_memgraph(cypher_query, params)
 
             # 3. Create the :OBS relationships
             process_info.init_obs_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-            cypher_query = create_class_multi_query(filtered_columns)
-            database_connector.run_query_memgraph(cypher_query)
+            cypher_query, params = create_class_multi_query(filtered_columns)
+            database_connector.run_query_memgraph(cypher_query, params)
 
             cypher_query = set_class_weight()
             database_connector.run_query_memgraph(cypher_query)
@@ -107,8 +107,8 @@ class ClassGraphService:
 
             # Create the :DF_C relationships
             process_info.init_dfc_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-            df_query = class_df_aggregation(rel_type='DF', class_rel_type='DF_C')
-            database_connector.run_query_memgraph(df_query)
+            df_query, params = class_df_aggregation(rel_type='DF', class_rel_type='DF_C')
+            database_connector.run_query_memgraph(df_query, params)
             process_info.finish_dfc_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
             process_info.finish_class_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
@@ -0,0 +1,122 @@
+"""
+------------------------------------------------------------------------
+File : df_relation_service.py
+Description: Service for the :DF relationships creation
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import time
+import numpy as np
+import pandas as pd
+
+from Shared.support_config import df_engine, df_batch_size
+from Models.logger_model import Logger
+from Utils.graph_query_lib import create_df_relation_query, get_df_event_tuples_query, create_df_relations_batch_query
+
+# Engine logger setup
+logger = Logger()
+
+# The available :DF builders
+DF_ENGINES = ['database', 'engine']
+
+
+# The Service for the :DF relationships
+class DfRelationService:
+
+    # Create the :DF relationships of an entity type
+    @staticmethod
+    def create_df_relations_s(database_connector, key, engine=None):
+        """
+        Create the :DF relationships of an entity type with the configured builder
+        :param database_connector: the database connector
+        :param key: the entity type
+        :param engine: the builder ("database" or "engine"), default from SOUP_DF_ENGINE
+        :return: the number of created relationships (None for the database builder)
+        """
+        engine = engine or df_engine
+
+        if engine not in DF_ENGINES:
+            raise ValueError(f"Invalid DF engine: {engine}")
+
+        start_time = time.perf_counter()
+
+        if engine == 'engine':
+            created = DfRelationService.create_df_relations_engine_s(database_connector, key)
+        else:
+            query, params = create_df_relation_query(key)
+            database_connector.run_query_memgraph(query, params)
+            created = None
+
+        logger.info(f'Created :DF relationships for {key} ({engine}) in {time.perf_counter() - start_time:.3f}s')
+        return created
+
+    # Create the :DF relationships in the Engine
+    @staticmethod
+    def create_df_relations_engine_s(database_connector, key):
+        """
+        Read the (event, entity, timestamp) tuples once, sort and pair them with NumPy
+        and bulk-merge the :DF relationships with batched writes (a built key is not duplicated)
+        :param database_connector: the database connector
+        :param key: the entity type
+        :return: the number of created relationships
+        """
+        query, params = get_df_event_tuples_query(key)
+
+        event_ids = []
+        entity_ids = []
+        timestamps = []
+
+        for record in database_connector.stream_query(query, params):
+            event_ids.append(record['event_id'])
+            entity_ids.append(record['entity_id'])
+            timestamps.append(record['timestamp'])
+
+        sources, targets, pair_entities = pair_df_events(event_ids, entity_ids, timestamps)
+
+        if len(sources) == 0:
+            return 0
+
+        rows = ({'source': int(source), 'target': int(target), 'entity_id': entity_id}
+                for source, target, entity_id in zip(sources, targets, pair_entities))
+
+        statistics = database_connector.run_batched_write(create_df_relations_batch_query(), rows,
+                                                          batch_size=df_batch_size, parameters={'type': key})
+        return statistics['rows']
+
+
+# Sort and pair the events of each entity
+def pair_df_events(event_ids, entity_ids, timestamps):
+    """
+    Pair the consecutive events of each entity, ordered by timestamp and id
+    (as the ORDER BY e.Timestamp, ID(e) of the Cypher builder, the null timestamps go last)
+    :param event_ids: the event ids
+    :param entity_ids: the entity ids (values)
+    :param timestamps: the timestamps (the null values are allowed)
+    :return: the source event ids, the target event ids and the entity ids of the pairs
+    """
+
+    if len(event_ids) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+
+    event_ids = np.asarray(event_ids, dtype=np.int64)
+    entity_codes, entity_values = pd.factorize(pd.Series(entity_ids, dtype=object))
+    timestamps = pd.Series(timestamps, dtype='float64').fillna(np.inf).to_numpy()
+
+    # Sort by entity, then timestamp, then event id (the last key is the primary one)
+    order = np.lexsort((event_ids, timestamps, entity_codes))
+    sorted_ids = event_ids[order]
+    sorted_codes = entity_codes[order]
+
+    same_entity = sorted_codes[1:] == sorted_codes[:-1]
+
+    sources = sorted_ids[:-1][same_entity]
+    targets = sorted_ids[1:][same_entity]
+    pair_entities = np.asarray(entity_values, dtype=object)[sorted_codes[1:][same_entity]]
+
+    return sources, targets, pair_entities
@@ -11,14 +11,15 @@ License : MIT
 """
 
 # Import
-import io
 import pandas as pd
 
 from flask import jsonify
+from Shared.support_config import csv_chunk_size
 from Services.docker_service import DockerService
 from Services.generic_graph_service import GenericGraphService
+from Services.job_service import JobService
 from Models.file_manager_model import FileManager
-from Models.docker_file_manager_model import DockerFileManager
+from Models.docker_file_manager_model import DockerFileManager, get_dataset_file_name
 from Models.api_response_model import ApiResponse
 from Models.logger_model import Logger
 
@@ -31,16 +32,13 @@ class GraphService:
 
     # Create new dataset
     @staticmethod
-    def create_new_dataset_s(file, copy_file, dataset_name, dataset_description, all_columns, standard_column,
-                             filtered_column, values_column, trigger_target_rows, database_connector):
+    def create_new_dataset_s(file, dataset_name, dataset_description, all_columns, standard_column,
+                             filtered_column, values_column, trigger_target_rows, database_connector,
+                             run_async=False, socketio=None):
 
         response = ApiResponse()
 
         try:
-
-            file_data = copy_file.read().decode('utf-8')
-            df = pd.read_csv(io.StringIO(file_data))
-
             # 0. Retrieve the container id by the name
             container_id = DockerService.get_container_id_s('soup-database')
 
@@ -53,7 +51,7 @@ class GraphService:
                 return jsonify(response.to_dict()), 400
 
             # 1. Process the csv file on Docker Container
-            result = process_new_dataset_files(container_id, file, df, dataset_name, dataset_description, all_columns,
+            result = process_new_dataset_files(container_id, file, dataset_name, dataset_description, all_columns,
                                                standard_column, filtered_column, values_column, trigger_target_rows)
 
             if result != 'success':
@@ -64,11 +62,28 @@ class GraphService:
                 logger.error(f'Failed to process new dataset files: {str(result)}')
                 return jsonify(response.to_dict()), 500
 
+            folder_path = f'/soup/{dataset_name}'
+
+            # 2. Build the graph as a background job (the progress is sent with SocketIO)
+            if run_async:
+                job = JobService.submit_job_s(
+                    'graph_build', dataset_name,
+                    lambda progress_callback: GenericGraphService.create_complete_graphs_s(
+                        container_id, database_connector, dataset_name, progress_callback),
+                    socketio,
+                    lambda: clean_failed_build(container_id, database_connector, folder_path))
+
+                response.http_status_code = 202
+                response.message = 'Graph build job submitted'
+                response.response_data = job.to_dict()
+
+                logger.info(f'Submitted the graph build job {job.job_id}')
+                return jsonify(response.to_dict()), 202
+
             build_result = GenericGraphService.create_complete_graphs_s(container_id, database_connector, dataset_name)
 
             if build_result != 'success':
-                folder_path = f'/soup/{dataset_name}'
-                DockerFileManager.remove_container_content_by_path(container_id, folder_path)
+                clean_failed_build(container_id, database_connector, folder_path)
                 response.http_status_code = 400
                 response.message = 'Error while create the graph'
                 response.response_data = build_result
@@ -96,61 +111,38 @@ class GraphService:
             database_connector.close()
 
 
+# Clean a failed or cancelled build (the partial graph in Memgraph and the dataset folder)
+def clean_failed_build(container_id, database_connector, folder_path):
+    try:
+        GenericGraphService.delete_partial_graph_s(database_connector)
+    except Exception as e:
+        logger.error(f'Unable to remove the partial graph: {str(e)}')
+
+    DockerFileManager.remove_container_content_by_path(container_id, folder_path)
+
+
 # Process the file new Dataset file
-def process_new_dataset_files(container_id, file, df, dataset_name, dataset_description, all_columns, standard_columns,
+def process_new_dataset_files(container_id, file, dataset_name, dataset_description, all_columns, standard_columns,
                               filtered_columns, values_columns, trigger_target_rows):
     try:
-        # 1. Original csv file processes
+        # 1. Original csv file processes (the upload is streamed on the disk)
         result, new_file_path = FileManager.copy_csv_file(file, dataset_name, False)
 
         if result != "success" or new_file_path is None:
             return 'Error while copy the file on the Engine'
 
-        result, new_docker_file_path = DockerFileManager.copy_file_to_container(container_id, dataset_name,
-                                                                                new_file_path, False,
-                                                                                False)
-        if result != 'success' or new_docker_file_path is None:
-            logger.error('Error while copy the docker file on the Engine')
-            return 'Error while copy the original csv file on the Docker Container'
-
-        result = FileManager.delete_file(dataset_name, "csv", False)
-
-        if result != 'success':
-            logger.error('Error while delete the file on the Engine')
-            return result
-
-        # 2. Entity nodes csv file processes
-        entities = filtered_columns
-        unique_values_data = []
-        for col in entities:
-            if col not in standard_columns:
-                unique_values = df[col].unique()
-                for value in unique_values:
-                    if not str(value) == "nan":
-                        unique_values_data.append({'type': col, 'value': value})
-        unique_values_df = pd.DataFrame(unique_values_data)
+        # 2. Entity nodes extracted from the saved file (only the entity columns, chunk by chunk)
+        entity_columns = [col for col in filtered_columns if col not in standard_columns]
+        unique_values_df = extract_entity_values(new_file_path, entity_columns)
 
+        # 3. Entity nodes csv file processes
         result, new_entity_file_path = FileManager.copy_csv_file(unique_values_df, dataset_name, True)
 
         if result != 'success' or new_entity_file_path is None:
             logger.error(f'Error while copy the entity node csv on the Engine: {str(result)}')
             return 'Error while copy the entity node csv on the Engine'
 
-        result, new_entity_docker_file_path = DockerFileManager.copy_file_to_container(container_id, dataset_name,
-                                                                                       new_entity_file_path, True,
-                                                                                       False)
-
-        if result != 'success' or new_entity_docker_file_path is None:
-            logger.error(f'Error while copy the entity node docker file on the Engine: {str(result)}')
-            return result
-
-        result = FileManager.delete_file(dataset_name, "csv", True)
-
-        if result != 'success':
-            logger.error(f'Error while delete the file on the Engine: {str(result)}')
-            return result
-
-        # 3. Configuration json file processes
+        # 4. Configuration json file processes
         json_result = FileManager.create_json_file(dataset_name, dataset_description, all_columns, standard_columns,
                                                    filtered_columns, values_columns, trigger_target_rows)
 
@@ -164,19 +156,24 @@ def process_new_dataset_files(container_id, file, df, dataset_name, dataset_desc
             logger.error(f'Error while copy the json file on the Engine directory: {str(result)}')
             return 'Error while copy the json file on the Engine directory'
 
-        result, new_json_config_docker_file_path = DockerFileManager.copy_file_to_container(container_id, dataset_name,
-                                                                                            new_json_config_path,
-                                                                                            False, True)
+        # 5. Copy the original csv, the entity nodes csv and the configuration with a single archive
+        result, _ = DockerFileManager.copy_files_to_container(container_id, dataset_name, [
+            (new_file_path, get_dataset_file_name(dataset_name)),
+            (new_entity_file_path, get_dataset_file_name(dataset_name, is_entity=True)),
+            (new_json_config_path, get_dataset_file_name(dataset_name, is_json=True))
+        ])
 
-        if result != 'success' or new_json_config_docker_file_path is None:
-            logger.error(f'Error while copy the json file on the docker container: {str(result)}')
+        if result != 'success':
+            logger.error(f'Error while copy the dataset files on the docker container: {str(result)}')
             return result
 
-        result = FileManager.delete_file(dataset_name, "json", False)
+        # 6. Remove the files from the Engine
+        for file_type, is_entity in [("csv", False), ("csv", True), ("json", False)]:
+            result = FileManager.delete_file(dataset_name, file_type, is_entity)
 
-        if result != 'success':
-            logger.error(f'Error while delete the file on the Engine: {str(result)}')
-            return result
+            if result != 'success':
+                logger.error(f'Error while delete the file on the Engine: {str(result)}')
+                return result
 
         logger.info('Success process dataset files')
         return 'success'
@@ -184,3 +181,49 @@ def process_new_dataset_files(container_id, file, df, dataset_name, dataset_desc
     except Exception as e:
         logger.error(f'Error while process the dataset files: {str(e)}')
         return f'${e}'
+
+
+# Extract the unique entity values from the csv file
+def extract_entity_values(csv_path, entity_columns, chunk_size=None):
+    """
+    Extract the unique values of the entity columns reading the csv file chunk by chunk,
+    so the memory is bounded by the chunk size (and by the unique values), not by the file size
+    :param csv_path: the csv file path
+    :param entity_columns: the entity columns
+    :param chunk_size: the number of rows for each chunk
+    :return: the dataframe with the type and value columns
+    """
+
+    if not entity_columns:
+        return pd.DataFrame(columns=['type', 'value'])
+
+    # The (type, value) pairs in order of appearance (each chunk only adds its new pairs)
+    unique_values = {}
+    reader = pd.read_csv(csv_path, usecols=entity_columns, dtype=str, chunksize=chunk_size or csv_chunk_size)
+
+    for chunk in reader:
+        chunk_values_df = entity_values_from_frame(chunk, entity_columns)
+        unique_values.update(dict.fromkeys(zip(chunk_values_df['type'], chunk_values_df['value'])))
+
+    return pd.DataFrame(list(unique_values), columns=['type', 'value'])
+
+
+# Extract the unique entity values from a dataframe (vectorized)
+def entity_values_from_frame(df, entity_columns):
+    """
+    Extract the unique (type, value) pairs of the entity columns in a single pandas pass.
+    The multi-value entities are split on ',' like create_corr_relation_query does in Cypher
+    :param df: the dataframe
+    :param entity_columns: the entity columns
+    :return: the dataframe with the type and value columns
+    """
+
+    melted = df.melt(value_vars=entity_columns, var_name='type', value_name='value')
+    melted = melted.dropna(subset=['value'])
+
+    # Split the multi-value entities (one row for each value)
+    melted['value'] = melted['value'].astype(str).str.split(',')
+    melted = melted.explode('value')
+    melted = melted[melted['value'] != '']
+
+    return melted.drop_duplicates(ignore_index=True)
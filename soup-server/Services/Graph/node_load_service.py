@@ -0,0 +1,139 @@
+"""
+------------------------------------------------------------------------
+File : node_load_service.py
+Description: Service for the :Event and :Entity nodes load
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import time
+import tempfile
+import pandas as pd
+
+from contextlib import contextmanager
+from Shared.support_config import node_loader, node_batch_size, csv_chunk_size
+from Models.docker_file_manager_model import DockerFileManager, get_shared_path
+from Models.logger_model import Logger
+from Utils.graph_query_lib import load_event_node_query, load_entity_node_query, create_event_nodes_batch_query, \
+    create_entity_nodes_batch_query
+
+# Engine logger setup
+logger = Logger()
+
+# The available nodes loaders
+NODE_LOADERS = ['database', 'engine']
+
+
+# The Service for the nodes load
+class NodeLoadService:
+
+    # Create the event nodes
+    @staticmethod
+    def create_event_nodes_s(container_id, database_connector, container_csv_path, event_id_col, timestamp_col,
+                             activity_col, property_keys, loader=None):
+        """
+        Create the :Event nodes of the dataset csv with the configured loader
+        :param container_id: the container unique id
+        :param database_connector: the database connector
+        :param container_csv_path: the container csv file path
+        :param event_id_col: the event id column
+        :param timestamp_col: the timestamp column
+        :param activity_col: the activity column
+        :param property_keys: other properties keys
+        :param loader: the loader ("database" or "engine"), default from SOUP_NODE_LOADER
+        :return: the number of created nodes (None for the database loader)
+        """
+        loader = get_node_loader(loader)
+        start_time = time.perf_counter()
+
+        if loader == 'engine':
+            columns = [event_id_col, timestamp_col, activity_col] + list(property_keys)
+            query = create_event_nodes_batch_query(event_id_col, timestamp_col, activity_col, property_keys)
+
+            with engine_csv_path(container_id, container_csv_path) as csv_path:
+                statistics = database_connector.run_batched_write(query, read_csv_rows(csv_path, columns),
+                                                                  batch_size=node_batch_size)
+            created = statistics['rows']
+        else:
+            query, params = load_event_node_query(container_csv_path, event_id_col, timestamp_col, activity_col,
+                                                  property_keys)
+            database_connector.run_query_memgraph(query, params)
+            created = None
+
+        logger.info(f'Created :Event nodes ({loader}) in {time.perf_counter() - start_time:.3f}s')
+        return created
+
+    # Create the entity nodes
+    @staticmethod
+    def create_entity_nodes_s(container_id, database_connector, container_csv_path, loader=None):
+        """
+        Create the :Entity nodes of the entity csv (type and value columns) with the configured loader
+        :param container_id: the container unique id
+        :param database_connector: the database connector
+        :param container_csv_path: the container entity csv file path
+        :param loader: the loader ("database" or "engine"), default from SOUP_NODE_LOADER
+        :return: the number of written rows (None for the database loader)
+        """
+        loader = get_node_loader(loader)
+        start_time = time.perf_counter()
+
+        if loader == 'engine':
+            with engine_csv_path(container_id, container_csv_path) as csv_path:
+                statistics = database_connector.run_batched_write(create_entity_nodes_batch_query(),
+                                                                  read_csv_rows(csv_path, ['type', 'value']),
+                                                                  batch_size=node_batch_size)
+            created = statistics['rows']
+        else:
+            database_connector.run_query_memgraph(load_entity_node_query(container_csv_path))
+            created = None
+
+        logger.info(f'Created :Entity nodes ({loader}) in {time.perf_counter() - start_time:.3f}s')
+        return created
+
+
+# Get the nodes loader (the configured one if None)
+def get_node_loader(loader):
+    loader = loader or node_loader
+
+    if loader not in NODE_LOADERS:
+        raise ValueError(f"Invalid node loader: {loader}")
+
+    return loader
+
+
+# Get the csv path readable by the Engine (the shared volume file, else a temporary copy from the container)
+@contextmanager
+def engine_csv_path(container_id, container_csv_path):
+    shared_path = get_shared_path(container_csv_path)
+
+    if shared_path is not None and os.path.isfile(shared_path):
+        yield shared_path
+        return
+
+    file_descriptor, temporary_path = tempfile.mkstemp(suffix='.csv')
+    os.close(file_descriptor)
+
+    try:
+        result, _ = DockerFileManager.copy_file_from_container(container_id, container_csv_path, temporary_path)
+
+        if result != 'success':
+            raise RuntimeError(result)
+
+        yield temporary_path
+    finally:
+        os.remove(temporary_path)
+
+
+# Read the csv rows chunk by chunk (the values are the csv strings, as LOAD CSV reads them)
+def read_csv_rows(csv_path, columns):
+    reader = pd.read_csv(csv_path, usecols=lambda column: column in columns, dtype=str, na_filter=False,
+                         chunksize=csv_chunk_size)
+
+    for chunk in reader:
+        yield from chunk.to_dict('records')
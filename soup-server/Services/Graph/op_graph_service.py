@@ -11,13 +11,12 @@ License : MIT
 """
 
 # Import
-import math
-
 from flask import jsonify
 from collections.abc import Iterable
-from Shared.support_config import memgraph_datetime_to_string
+from Shared.support_config import get_next_cursor
 from Services.docker_service import DockerService
 from Services.support_service import SupportService
+from Models.analysis_cache_model import AnalysisCache
 from Models.api_response_model import ApiResponse
 from Models.docker_file_manager_model import DockerFileManager
 from Models.file_manager_model import FileManager
@@ -34,14 +33,22 @@ class OperationGraphService:
 
     # Get event nodes
     @staticmethod
-    def get_event_nodes_s(database_connector):
+    def get_event_nodes_s(database_connector, after=None, page_size=None):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_nodes_event_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_nodes_event_page_query(after, page_size)
+            else:
+                query, params = get_nodes_event_query(), None
+
+            result = database_connector.run_query_memgraph(query, params)
+
+            if page_size:
+                response.set_next_cursor(get_next_cursor(result[-1]['cursor'] if result else None,
+                                                         len(result), page_size))
 
             if not isinstance(result, Iterable):
                 response.http_status_code = 404
@@ -96,18 +103,25 @@ class OperationGraphService:
 
     # Get entity nodes
     @staticmethod
-    def get_entity_nodes_s(database_connector, distinct):
+    def get_entity_nodes_s(database_connector, distinct, after=None, page_size=None):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_nodes_entity_query()
+            query, params = get_nodes_entity_query(), None
 
             if distinct == 'true':
-                query = get_nodes_entity_query_distinct()
+                # One node for each entity type (never paginated)
+                query, page_size = get_nodes_entity_query_distinct(), None
+            elif page_size:
+                query, params = get_nodes_entity_page_query(after, page_size)
 
-            result = database_connector.run_query_memgraph(query)
+            result = database_connector.run_query_memgraph(query, params)
+
+            if page_size:
+                response.set_next_cursor(get_next_cursor(result[-1]['cursor'] if result else None,
+                                                         len(result), page_size))
 
             if not isinstance(result, Iterable):
                 response.http_status_code = 404
@@ -117,21 +131,7 @@ class OperationGraphService:
                 logger.error('Entity nodes not found')
                 return jsonify(response.to_dict()), 404
 
-            graph_data = []
-
-            for record in result:
-                entity_node = record['node']
-
-                for key, value in entity_node.items():
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        entity_node[key] = timestamp
-
-                for key, value in entity_node.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        entity_node[key] = None
-
-                graph_data.append(entity_node)
+            graph_data = SupportService.extract_class_graph_data(result)
 
             if len(graph_data) == 0:
                 response.http_status_code = 202
@@ -176,63 +176,48 @@ class OperationGraphService:
 
     # Get :CORR relationships
     @staticmethod
-    def get_corr_relationships_s(database_connector):
+    def get_corr_relationships_s(database_connector, after=None, page_size=None, stream=False):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_corr_relation_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_corr_relation_page_query(after, page_size)
+            else:
+                query, params = get_corr_relation_query(), None
 
-            if not isinstance(result, Iterable):
-                response.http_status_code = 404
-                response.response_data = None
-                response.message = "Not found"
+            result = database_connector.stream_query(query, params)
 
-                logger.error('Correlation relationships not found')
-                return jsonify(response.to_dict()), 404
+            # NDJSON: the relationships are sent while they come off the connector
+            if stream:
+                return SupportService.ndjson_response(
+                    result, lambda record, relation_id: SupportService.extract_relationship_record(record, 'corr',
+                                                                                                   relation_id),
+                    page_size), 200
+
+            # Each node is sanitized once for the response
+            memo = {}
 
             correlation_data = []
             correlation_count = 0
+            last_cursor = None
 
             for record in result:
-                relation = record['corr']
-                event = relation[0]
-                relation_type = relation[1]
-                related_event = relation[2]
-
-                for key, value in event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        event[key] = None
-
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        event[key] = timestamp
-
-                for key, value in related_event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        related_event[key] = None
-
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        related_event[key] = timestamp
+                last_cursor = record.get('cursor')
 
                 correlation_count = correlation_count + 1
-                relation_id = correlation_count
-
-                correlation_data.append({
-                    'event': event,
-                    'relation_type': relation_type,
-                    'related_event': related_event,
-                    'relation_id': relation_id
-                })
+                correlation_data.append(
+                    SupportService.extract_relationship_record(record, 'corr', correlation_count, memo))
 
             graph_data = {
                 'corr_data': correlation_data,
                 'corr_count': correlation_count,
             }
 
+            if page_size:
+                response.set_next_cursor(get_next_cursor(last_cursor, correlation_count, page_size))
+
             if len(graph_data) == 0:
                 response.http_status_code = 202
                 response.message = 'No content'
@@ -276,61 +261,48 @@ class OperationGraphService:
 
     # Get :DF relationships
     @staticmethod
-    def get_df_relationships_s(database_connector):
+    def get_df_relationships_s(database_connector, after=None, page_size=None, stream=False):
         response = ApiResponse()
 
         try:
             database_connector.connect()
 
-            query = get_df_relation_query()
-            result = database_connector.run_query_memgraph(query)
+            if page_size:
+                query, params = get_df_relation_page_query(after, page_size)
+            else:
+                query, params = get_df_relation_query(), None
 
-            if not isinstance(result, Iterable):
-                response.http_status_code = 404
-                response.response_data = None
-                response.message = "Not found"
+            result = database_connector.stream_query(query, params)
 
-                logger.error('DF relationships not found')
-                return jsonify(response.to_dict()), 404
+            # NDJSON: the relationships are sent while they come off the connector
+            if stream:
+                return SupportService.ndjson_response(
+                    result, lambda record, relation_id: SupportService.extract_relationship_record(record, 'df',
+                                                                                                   relation_id),
+                    page_size), 200
+
+            # Each node is sanitized once for the response
+            memo = {}
 
             df_data = []
             df_count = 0
+            last_cursor = None
 
             for record in result:
-                relation = record['df']
-                event = relation[0]
-                relation_type = relation[1]
-                related_event = relation[2]
-
-                for key, value in event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        event[key] = None
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        event[key] = timestamp
-
-                for key, value in related_event.items():
-                    if isinstance(value, (int, float)) and math.isnan(value):
-                        related_event[key] = None
-                    if 'Timestamp' in key:
-                        timestamp = memgraph_datetime_to_string(value)
-                        related_event[key] = timestamp
+                last_cursor = record.get('cursor')
 
                 df_count = df_count + 1
-                relation_id = df_count
-
-                df_data.append({
-                    'event': event,
-                    'relation_type': relation_type,
-                    'related_event': related_event,
-                    'relation_id': relation_id
-                })
+                df_data.append(
+                    SupportService.extract_relationship_record(record, 'df', df_count, memo))
 
             graph_data = {
                 'df_data': df_data,
                 'df_count': df_count,
             }
 
+            if page_size:
+                response.set_next_cursor(get_next_cursor(last_cursor, df_count, page_size))
+
             if len(graph_data) == 0:
                 response.http_status_code = 202
                 response.message = 'No content'
@@ -597,6 +569,9 @@ class OperationGraphService:
         try:
             database_connector.connect()
 
+            # The analysis view is removed with the graph
+            AnalysisCache.set_active(None)
+
             # Delete entity nodes
             query = delete_entity_graph_query()
             database_connector.run_query_memgraph(query)
@@ -604,15 +579,16 @@ class OperationGraphService:
             verification_query = get_count_nodes_entity_query()
             result_entity = database_connector.run_query_memgraph(verification_query)
 
-            # Drop entity index
-            database_connector.run_query_memgraph(drop_entity_index())
-
             # Delete event nodes
             query = delete_event_graph_query()
             database_connector.run_query_memgraph(query)
 
-            query = drop_event_index()
-            database_connector.run_query_memgraph(query)
+            # Drop the graph indexes
+            for query in drop_graph_index_queries():
+                try:
+                    database_connector.run_query_memgraph(query)
+                except Exception as e:
+                    logger.warning(f'Unable to drop the index ({query}): {str(e)}')
 
             verification_query = get_count_nodes_event_query()
             result_event = database_connector.run_query_memgraph(verification_query)
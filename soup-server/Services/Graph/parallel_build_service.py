@@ -0,0 +1,95 @@
+"""
+------------------------------------------------------------------------
+File : parallel_build_service.py
+Description: Service for the parallel per-entity-type graph construction
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from neo4j.exceptions import TransientError
+from Shared.support_config import build_workers, build_max_retries
+from Models.logger_model import Logger
+
+# Engine logger setup
+logger = Logger()
+
+
+# The Service for the parallel graph construction
+class ParallelBuildService:
+
+    # Run a task for each key
+    @staticmethod
+    def run_per_key_s(keys, task, key_times, retries=None):
+        """
+        Run the task of each key concurrently with a bounded pool. Every task opens its own
+        session, the Memgraph serialization conflicts (TransientError) are retried with backoff
+        :param keys: the keys (entity types)
+        :param task: the function that receives the key
+        :param key_times: the dictionary updated with the seconds spent on each key
+        :param retries: the max retries for each key (default from SOUP_BUILD_MAX_RETRIES)
+        """
+        keys = list(dict.fromkeys(keys))
+        retries = build_max_retries if retries is None else retries
+
+        if not keys:
+            return
+
+        workers = max(1, min(build_workers, len(keys)))
+
+        # Sequential (as before) with one worker
+        if workers == 1:
+            for key in keys:
+                key_times[key] = run_with_retry(key, task, retries)
+            return
+
+        errors = []
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='soup-graph-build') as executor:
+            futures = {executor.submit(run_with_retry, key, task, retries): key for key in keys}
+
+            for future in as_completed(futures):
+                key = futures[future]
+
+                try:
+                    key_times[key] = future.result()
+                except Exception as e:
+                    logger.error(f'Error while building the relationships of {key}: {str(e)}')
+                    errors.append(e)
+
+        if errors:
+            raise errors[0]
+
+
+# Run the task of a key, retrying the serialization conflicts
+def run_with_retry(key, task, retries):
+    """
+    Run the task of a key and retry it when Memgraph reports a conflicting transaction
+    :param key: the key
+    :param task: the task
+    :param retries: the max retries
+    :return: the seconds spent on the key
+    """
+    start_time = time.perf_counter()
+    attempt = 0
+
+    while True:
+        try:
+            task(key)
+            return round(time.perf_counter() - start_time, 3)
+        except TransientError as e:
+            if attempt >= retries:
+                raise
+
+            attempt += 1
+            delay = min(0.1 * (2 ** attempt), 5.0)
+
+            logger.warning(f'Conflict while building {key}, retry {attempt}/{retries} in {delay}s: {str(e)}')
+            time.sleep(delay)
@@ -0,0 +1,150 @@
+"""
+------------------------------------------------------------------------
+File : analysis_cache_service.py
+Description: Service for the analysis results cache
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import json
+import hashlib
+
+from Services.snapshot_service import SnapshotService
+from Models.analysis_cache_model import AnalysisCache
+from Models.docker_file_manager_model import DockerFileManager
+from Models.logger_model import Logger
+
+# Engine logger setup
+logger = Logger()
+
+# The analysis keys that define the filters (the other keys, e.g. the name, do not change the result)
+ANALYSIS_FILTER_KEYS = ['timestamp', 'performance', 'includeActivities', 'excludeActivities', 'frequence', 'variant']
+
+
+# The Service for the analysis results cache
+class AnalysisCacheService:
+
+    # Get the cache key
+    @staticmethod
+    def get_cache_key_s(dataset_config, analysis_data):
+        """
+        Get the content-addressed key of an analysis result: the hash of the configuration fields that
+        define the graph (columns and values, not the process information and the dates rewritten by
+        every build) followed by the hash of the filters
+        :param dataset_config: the dataset configuration
+        :param analysis_data: the analysis (the filters lists)
+        :return: the key
+        """
+        filters = {key: analysis_data.get(key) or [] for key in ANALYSIS_FILTER_KEYS}
+        analysis_hash = hashlib.sha256(json.dumps(filters, sort_keys=True, default=str).encode('utf-8'))
+
+        return f'{get_config_key_prefix(dataset_config)}{analysis_hash.hexdigest()[:32]}'
+
+    # Get a cached analysis result
+    @staticmethod
+    def get_cached_analysis_s(container_id, dataset_name, cache_key):
+        """
+        Get the analysis result from the memory cache, then from the dataset folder
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :param cache_key: the cache key
+        :return: the cached result (graph data and breakdown) or None
+        """
+        entry = AnalysisCache.get(dataset_name, cache_key)
+
+        if entry is not None:
+            return entry
+
+        result, entry = DockerFileManager.read_container_json_file(container_id,
+                                                                   get_cache_file_path(dataset_name, cache_key))
+
+        if result != 'success':
+            logger.warning(f'Unable to read the analysis cache: {str(result)}')
+            return None
+
+        if entry is not None:
+            AnalysisCache.put(dataset_name, cache_key, entry)
+
+        return entry
+
+    # Save an analysis result
+    @staticmethod
+    def save_analysis_s(container_id, dataset_name, cache_key, graph_data, breakdown):
+        """
+        Save the analysis result in the memory cache and in the dataset folder
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :param cache_key: the cache key
+        :param graph_data: the filtered graph data
+        :param breakdown: the filter plan breakdown
+        """
+        entry = {'graph_data': graph_data, 'breakdown': breakdown}
+        AnalysisCache.put(dataset_name, cache_key, entry)
+
+        result, _ = DockerFileManager.write_json_content_to_container(container_id, get_cache_folder(dataset_name),
+                                                                      f'{cache_key}.json', entry)
+
+        if result != 'success':
+            logger.warning(f'Unable to save the analysis cache: {str(result)}')
+
+    # Invalidate the cached results of a previous configuration
+    @staticmethod
+    def invalidate_stale_s(container_id, dataset_name, dataset_config):
+        """
+        Remove the cached analysis results of a dataset built with different graph configuration fields
+        (memory and dataset folder). The results of the current configuration are kept
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :param dataset_config: the current dataset configuration
+        """
+        prefix = get_config_key_prefix(dataset_config)
+        AnalysisCache.invalidate_stale(dataset_name, prefix)
+
+        result = DockerFileManager.get_folder_files(container_id, get_cache_folder(dataset_name))
+
+        if result is None or result[0] != 'success':
+            logger.warning('Unable to read the analysis cache folder')
+            return
+
+        file_names = result[1]
+
+        for file_name in file_names:
+            if file_name.endswith('.json') and not file_name.startswith(prefix):
+                DockerFileManager.remove_container_content_by_path(container_id,
+                                                                   f'{get_cache_folder(dataset_name)}/{file_name}')
+
+    # Invalidate the cached results of a dataset
+    @staticmethod
+    def invalidate_dataset_s(container_id, dataset_name):
+        """
+        Remove the cached analysis results of a dataset (memory and dataset folder)
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        """
+        AnalysisCache.invalidate(dataset_name)
+
+        if container_id:
+            try:
+                DockerFileManager.remove_container_content_by_path(container_id, get_cache_folder(dataset_name))
+            except Exception as e:
+                logger.warning(f'Unable to remove the analysis cache: {str(e)}')
+
+
+# Get the cache key prefix (the hash of the graph configuration fields)
+def get_config_key_prefix(dataset_config):
+    return SnapshotService.get_config_hash(dataset_config)[:32]
+
+
+# Get the cache folder on the container
+def get_cache_folder(dataset_name):
+    return f'/soup/{dataset_name}/AnalysesCache'
+
+
+# Get the cache file path on the container
+def get_cache_file_path(dataset_name, cache_key):
+    return f'{get_cache_folder(dataset_name)}/{cache_key}.json'
@@ -0,0 +1,280 @@
+"""
+------------------------------------------------------------------------
+File : backup_service.py
+Description: Service for the streaming backup and restore of the datasets
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import io
+import os
+import re
+import gzip
+import tarfile
+
+from flask import Response, jsonify, stream_with_context
+from Shared.support_config import backup_folder
+from Shared.response_compression import get_compressor, zstandard
+from Services.docker_service import DockerService
+from Services.metadata_catalog_service import MetadataCatalogService
+from Services.analysis_cache_service import AnalysisCacheService
+from Models.api_response_model import ApiResponse
+from Models.docker_file_manager_model import DockerFileManager, tar_member_chunks
+from Models.logger_model import Logger
+
+# Engine logger setup
+logger = Logger()
+
+# The backup compressions (mimetype and file extension)
+BACKUP_COMPRESSIONS = {
+    'gzip': ('application/gzip', 'tar.gz'),
+    'zstd': ('application/zstd', 'tar.zst')
+}
+
+# The backup file names saved by the Engine
+BACKUP_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+
+# The Service for the backup and restore
+class BackupService:
+
+    # Download a backup
+    @staticmethod
+    def export_backup_s(dataset_names=None, compression='gzip'):
+        """
+        Stream the backup of the datasets folders (tar archive compressed with gzip or zstd) while it is created
+        :param dataset_names: the datasets (None for all the datasets)
+        :param compression: the compression (gzip or zstd)
+        :return: the streaming download
+        """
+        response = ApiResponse()
+
+        try:
+            result = check_backup_request(compression)
+
+            if result is not None:
+                return result
+
+            container_id, dataset_names, error = get_backup_datasets(dataset_names)
+
+            if error is not None:
+                return error
+
+            mimetype, extension = BACKUP_COMPRESSIONS[compression]
+            headers = {'Content-Disposition': f'attachment; filename=soup-backup.{extension}'}
+
+            logger.info(f'Backup download of {len(dataset_names)} datasets started')
+            return Response(stream_with_context(backup_chunks(container_id, dataset_names, compression)),
+                            mimetype=mimetype, headers=headers), 200
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+    # Save a backup on the Engine
+    @staticmethod
+    def save_backup_s(backup_name, dataset_names=None, compression='gzip'):
+        """
+        Save the backup of the datasets folders in the backup folder, written chunk by chunk
+        :param backup_name: the backup file name (without extension)
+        :param dataset_names: the datasets (None for all the datasets)
+        :param compression: the compression (gzip or zstd)
+        :return: ApiResponse model (the backup file path)
+        """
+        response = ApiResponse()
+
+        try:
+            result = check_backup_request(compression)
+
+            if result is not None:
+                return result
+
+            if not backup_name or not BACKUP_NAME_PATTERN.match(backup_name):
+                response.http_status_code = 400
+                response.response_data = None
+                response.message = f'Invalid backup name: {backup_name}'
+
+                logger.error(f'Invalid backup name: {backup_name}')
+                return jsonify(response.to_dict()), 400
+
+            container_id, dataset_names, error = get_backup_datasets(dataset_names)
+
+            if error is not None:
+                return error
+
+            backup_path = os.path.join(backup_folder, f'{backup_name}.{BACKUP_COMPRESSIONS[compression][1]}')
+            temporary_path = f'{backup_path}.tmp'
+
+            try:
+                with open(temporary_path, 'wb') as backup_file:
+                    for chunk in backup_chunks(container_id, dataset_names, compression):
+                        backup_file.write(chunk)
+
+                os.replace(temporary_path, backup_path)
+            finally:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+            response.http_status_code = 201
+            response.response_data = {'backup_path': backup_path, 'datasets': dataset_names}
+            response.message = 'Backup saved successfully'
+
+            logger.info(f'Backup saved in {backup_path}')
+            return jsonify(response.to_dict()), 201
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+    # Restore a backup
+    @staticmethod
+    def restore_backup_s(source, dataset_names=None):
+        """
+        Restore the datasets folders from the uploaded backup while it is received
+        (tar archive, gzip or zstd compression detected from the content)
+        :param source: the binary stream of the backup
+        :param dataset_names: the datasets to restore (None for all the datasets of the backup)
+        :return: ApiResponse model (the restored datasets)
+        """
+        response = ApiResponse()
+
+        try:
+            container_id = DockerService.get_container_id_s('soup-database')
+
+            if container_id is None or container_id == '':
+                response.http_status_code = 400
+                response.message = 'SOUP Database is offline or does not exist'
+                response.response_data = None
+
+                logger.error('SOUP Database is offline or does not exist')
+                return jsonify(response.to_dict()), 400
+
+            result, restored = DockerFileManager.restore_soup_archive(container_id, open_backup_source(source),
+                                                                      dataset_names)
+
+            if result != 'success':
+                response.http_status_code = 400
+                response.message = f'Unable to restore the backup: {str(result)}'
+                response.response_data = None
+
+                logger.error(f'Unable to restore the backup: {str(result)}')
+                return jsonify(response.to_dict()), 400
+
+            # The cached results of the restored datasets refer to the previous configurations
+            for dataset_name in restored:
+                AnalysisCacheService.invalidate_dataset_s(None, dataset_name)
+
+            response.http_status_code = 200
+            response.message = 'Backup restored successfully'
+            response.response_data = restored
+
+            logger.info(f'Backup restored: {", ".join(restored)}')
+            return jsonify(response.to_dict()), 200
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+
+# Check the backup compression (None if the request is valid, else the error response)
+def check_backup_request(compression):
+    response = ApiResponse()
+
+    if compression not in BACKUP_COMPRESSIONS or (compression == 'zstd' and zstandard is None):
+        response.http_status_code = 400
+        response.response_data = None
+        response.message = f'Unsupported backup compression: {compression}'
+
+        logger.error(f'Unsupported backup compression: {compression}')
+        return jsonify(response.to_dict()), 400
+
+    return None
+
+
+# Get the container and the backup datasets: (container id, dataset names, error response or None)
+def get_backup_datasets(dataset_names):
+    response = ApiResponse()
+    container_id = DockerService.get_container_id_s('soup-database')
+
+    if container_id is None or container_id == '':
+        response.http_status_code = 400
+        response.message = 'SOUP Database is offline or does not exist'
+        response.response_data = None
+
+        logger.error('SOUP Database is offline or does not exist')
+        return None, None, (jsonify(response.to_dict()), 400)
+
+    result, all_dataset_names = MetadataCatalogService.get_dataset_names_s(container_id)
+
+    if result != 'success':
+        response.http_status_code = 400
+        response.message = 'Internal Server Error. Error while retrieving the Datasets'
+        response.response_data = result
+
+        logger.error('Internal Server Error. Error while retrieving the Datasets')
+        return None, None, (jsonify(response.to_dict()), 400)
+
+    if not dataset_names:
+        return container_id, all_dataset_names, None
+
+    missing = [dataset_name for dataset_name in dataset_names if dataset_name not in all_dataset_names]
+
+    if missing:
+        response.http_status_code = 404
+        response.message = f'Datasets not found: {", ".join(missing)}'
+        response.response_data = missing
+
+        logger.error(f'Datasets not found: {", ".join(missing)}')
+        return None, None, (jsonify(response.to_dict()), 404)
+
+    return container_id, dataset_names, None
+
+
+# Stream the compressed backup (tar archive of the dataset folders, the files are read chunk by chunk)
+def backup_chunks(container_id, dataset_names, compression):
+    compress, _, finish = get_compressor(compression)
+
+    for dataset_name in dataset_names:
+        for tar_info, file in DockerFileManager.get_dataset_archive_members(container_id, dataset_name):
+            for chunk in tar_member_chunks(tar_info, file):
+                compressed_chunk = compress(chunk)
+
+                if compressed_chunk:
+                    yield compressed_chunk
+
+    # The end of the archive (two empty blocks)
+    yield compress(tarfile.NUL * (2 * tarfile.BLOCKSIZE)) + finish()
+
+
+# Open the backup source (the compression is detected from the first bytes)
+def open_backup_source(source):
+    source = io.BufferedReader(source) if not hasattr(source, 'peek') else source
+    magic = source.peek(4)[:4]
+
+    if magic[:2] == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=source, mode='rb')
+
+    if magic == b'\x28\xb5\x2f\xfd':
+        if zstandard is None:
+            raise ValueError('The backup is compressed with zstd, which is not installed')
+
+        return zstandard.ZstdDecompressor().stream_reader(source)
+
+    return source
@@ -11,11 +11,11 @@ License : MIT
 """
 
 # Import
-import json
-
 from flask import jsonify
 from datetime import datetime
 from Services.docker_service import DockerService
+from Services.analysis_cache_service import AnalysisCacheService
+from Services.metadata_catalog_service import MetadataCatalogService
 from Models.api_response_model import ApiResponse
 from Models.docker_file_manager_model import DockerFileManager
 from Models.file_manager_model import FileManager
@@ -45,26 +45,17 @@ class DatasetService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            result, exec_config_file = DockerFileManager.read_json_file_from_container(container_id, dataset_name)
+            # The configuration with the svg content (metadata catalog)
+            result, exec_config_file = MetadataCatalogService.get_dataset_config_s(container_id, dataset_name, True)
 
-            if result != 'success':
+            if result != 'success' or exec_config_file is None:
                 response.http_status_code = 202
                 response.message = 'No content'
-                response.response_data = exec_config_file
+                response.response_data = None
 
                 logger.info('No content')
                 return jsonify(response.to_dict()), 202
 
-            if not isinstance(exec_config_file, dict):
-                exec_config_file = json.loads(exec_config_file)
-
-            result, svg_content = DockerFileManager.get_svg_content_from_container(container_id, dataset_name)
-
-            if result == 'success' and svg_content is not None:
-                exec_config_file['svg_content'] = svg_content
-            else:
-                exec_config_file['svg_content'] = None
-
             response.http_status_code = 200
             response.message = 'Dataset retrieved successfully'
             response.response_data = exec_config_file
@@ -97,8 +88,8 @@ class DatasetService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            # 1. Get all datasets folder name
-            result, container_folders = DockerFileManager.get_folder_files(container_id, '/soup')
+            # 1. Get all the datasets configurations with the svg content (metadata catalog, no exec for each dataset)
+            result, datasets_data = MetadataCatalogService.get_dataset_configs_s(container_id)
 
             if result != 'success':
                 response.http_status_code = 400
@@ -108,28 +99,7 @@ class DatasetService:
                 logger.error('Internal Server Error. Error while retrieving the Datasets')
                 return jsonify(response.to_dict()), 400
 
-            datasets_data = []
-
-            # 2. For each dataset, get the specific information
-            for dataset_name in container_folders:
-                # Retrieve configuration file
-                result, exec_config_file = DockerFileManager.read_json_file_from_container(container_id, dataset_name)
-
-                if result == 'success':
-                    # Check if it is already a dictionary
-                    if not isinstance(exec_config_file, dict):
-                        exec_config_file = json.loads(exec_config_file)
-
-                    # 2.1 Get the SVG file content if exists
-                    result, svg_content = DockerFileManager.get_svg_content_from_container(container_id, dataset_name)
-                    if result == 'success' and svg_content is not None:
-                        exec_config_file['svg_content'] = svg_content
-                    else:
-                        exec_config_file['svg_content'] = None
-
-                    datasets_data.append(exec_config_file)
-
-            # 3. Check the data
+            # 2. Check the data
             if len(datasets_data) == 0:
                 response.http_status_code = 202
                 response.message = 'No datasets'
@@ -170,9 +140,9 @@ class DatasetService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            result, exec_config_file = DockerFileManager.read_json_file_from_container(container_id, dataset_name)
+            result, exec_config_file = MetadataCatalogService.get_dataset_config_s(container_id, dataset_name)
 
-            if result != 'success':
+            if result != 'success' or exec_config_file is None:
                 response.http_status_code = 400
                 response.message = 'Unable to update Dataset'
                 response.response_data = result
@@ -180,10 +150,6 @@ class DatasetService:
                 logger.error('Unable to update Dataset')
                 return jsonify(response.to_dict()), 400
 
-            # Check if it is already a dictionary
-            if not isinstance(exec_config_file, dict):
-                exec_config_file = json.loads(exec_config_file)
-
             exec_config_file['dataset_description'] = dataset_description
             exec_config_file['date_modified'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
@@ -244,7 +210,9 @@ class DatasetService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            # 1. Delete the folder
+            # 1. Delete the folder (with the cached analysis results)
+            AnalysisCacheService.invalidate_dataset_s(None, dataset_name)
+
             folder_path = f'/soup/{dataset_name}'
             result = DockerFileManager.remove_container_content_by_path(container_id, folder_path)
 
@@ -298,9 +266,17 @@ class DatasetService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            result, container_folders = DockerFileManager.get_folder_files(container_id, '/soup')
+            result, dataset_names = MetadataCatalogService.get_dataset_names_s(container_id)
 
-            if dataset_name in container_folders:
+            if result != 'success':
+                response.http_status_code = 400
+                response.message = 'Internal Server Error. Error while retrieving the Datasets'
+                response.response_data = result
+
+                logger.error('Internal Server Error. Error while retrieving the Datasets')
+                return jsonify(response.to_dict()), 400
+
+            if dataset_name in dataset_names:
                 response.http_status_code = 200
                 response.message = 'Dataset already exist'
                 response.response_data = None
@@ -11,11 +11,11 @@ License : MIT
 """
 
 # Import
-import docker
 import subprocess
 
 from flask import jsonify
 from Models.api_response_model import ApiResponse
+from Models.docker_client_model import DockerClient
 from Models.logger_model import Logger
 
 # Engine logger setup
@@ -32,8 +32,7 @@ class DockerService:
         """
 
         try:
-            client = docker.from_env()
-            container = client.containers.get(container_name)
+            container = DockerClient.get_container(container_name)
             container_id = container.id
             return container_id
         except subprocess.CalledProcessError as e:
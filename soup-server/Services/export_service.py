@@ -0,0 +1,274 @@
+"""
+------------------------------------------------------------------------
+File : export_service.py
+Description: Service for the columnar export of the graph data (Arrow IPC stream and Parquet)
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import io
+import datetime
+import tempfile
+
+from itertools import chain
+from flask import Response, jsonify, stream_with_context
+from neo4j.time import DateTime
+from Shared.support_config import export_batch_size
+from Models.api_response_model import ApiResponse
+from Models.logger_model import Logger
+from Utils.export_query_lib import get_export_kind, get_export_keys_query, get_export_query
+
+# The columnar export needs pyarrow (optional, the other endpoints work without it)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Engine logger setup
+logger = Logger()
+
+# The export formats (mimetype and file extension)
+EXPORT_FORMATS = {
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+# The Arrow types of the property value types
+ARROW_TYPES = {
+    'bool': pa.bool_(),
+    'int': pa.int64(),
+    'float': pa.float64(),
+    'timestamp': pa.timestamp('us'),
+    'string': pa.string()
+} if pa is not None else {}
+
+# Size of the chunks read from the Parquet file
+PARQUET_CHUNK_SIZE = 1024 * 1024
+
+
+# The Service for the columnar export
+class ExportService:
+
+    # Export graph data
+    @staticmethod
+    def export_graph_data_s(database_connector, kind, export_format):
+        """
+        Export the event nodes, entity nodes or relationships as Arrow IPC stream or Parquet file.
+        The records are read from the streaming connector in batches: each batch is a record batch
+        (Arrow) or a row group (Parquet). The columns are the ids and the properties (one column
+        for each property key, the temporal properties are timestamp columns)
+        :param database_connector: the database connector
+        :param kind: the export kind (event-nodes, entity-nodes, corr, df, obs, dfc)
+        :param export_format: the export format (arrow or parquet)
+        :return: the streaming response
+        """
+        response = ApiResponse()
+
+        try:
+            if pa is None:
+                response.http_status_code = 501
+                response.response_data = None
+                response.message = 'The columnar export needs pyarrow, which is not installed'
+
+                logger.error('The columnar export needs pyarrow, which is not installed')
+                return jsonify(response.to_dict()), 501
+
+            if export_format not in EXPORT_FORMATS:
+                response.http_status_code = 400
+                response.response_data = None
+                response.message = f'Invalid export format: {export_format}'
+
+                logger.error(f'Invalid export format: {export_format}')
+                return jsonify(response.to_dict()), 400
+
+            try:
+                relationships = get_export_kind(kind)[3] is not None
+            except ValueError as e:
+                response.http_status_code = 400
+                response.response_data = None
+                response.message = str(e)
+
+                logger.error(str(e))
+                return jsonify(response.to_dict()), 400
+
+            database_connector.connect()
+
+            # The columns (all the property keys), the types are taken from a full pass on the records
+            keys_result = database_connector.run_query_memgraph(get_export_keys_query(kind))
+            keys = sorted(record['key'] for record in keys_result)
+            type_records = chain.from_iterable(database_connector.stream_query(get_export_query(kind),
+                                                                               batch_size=export_batch_size))
+
+            columns = get_export_columns(keys, get_property_types(type_records, keys), relationships)
+            schema = pa.schema([(name, column_type) for name, _, column_type in columns])
+            batches = database_connector.stream_query(get_export_query(kind), batch_size=export_batch_size)
+
+            mimetype, extension = EXPORT_FORMATS[export_format]
+            headers = {'Content-Disposition': f'attachment; filename={kind}.{extension}'}
+
+            if export_format == 'arrow':
+                return Response(stream_with_context(arrow_stream(batches, columns, schema)),
+                                mimetype=mimetype, headers=headers), 200
+
+            # The Parquet metadata is written at the end of the file, so the file is written before the response
+            parquet_file = write_parquet_file(batches, columns, schema)
+
+            logger.info(f'Export of {kind} as {export_format} completed')
+            return Response(stream_with_context(read_file_chunks(parquet_file)),
+                            mimetype=mimetype, headers=headers), 200
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+        finally:
+            database_connector.close()
+
+
+# Get the export columns: (column name, record reader, Arrow type)
+def get_export_columns(keys, property_types, relationships):
+    id_columns = ['id', 'source_id', 'target_id'] if relationships else ['id']
+    columns = [(name, id_reader(name), pa.int64()) for name in id_columns]
+
+    for key in keys:
+        # A property with the name of an id column is exported with a prefix
+        name = f'property_{key}' if key in id_columns else key
+        columns.append((name, property_reader(key), property_types.get(key) or pa.string()))
+
+    return columns
+
+
+# Get the Arrow types of the properties from all the records (the types are widened, e.g. int and float to float)
+def get_property_types(records, keys):
+    value_types = dict.fromkeys(keys)
+
+    for record in records:
+        for key, value in record['properties'].items():
+            if value is not None and key in value_types:
+                value_types[key] = widen_value_type(value_types[key], get_value_type(value))
+
+    return {key: ARROW_TYPES[value_type or 'string'] for key, value_type in value_types.items()}
+
+
+# Get the type of a property value
+def get_value_type(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, (DateTime, datetime.datetime)):
+        return 'timestamp'
+
+    return 'string'
+
+
+# Widen the column type to hold a new value type (the mixed types are strings)
+def widen_value_type(column_type, value_type):
+    if column_type is None or column_type == value_type:
+        return value_type
+    if {column_type, value_type} == {'int', 'float'}:
+        return 'float'
+
+    return 'string'
+
+
+# Convert a value to the column type (a value that does not fit the column is an error, it is never dropped)
+def to_column_value(value, column_type):
+    if value is None:
+        return None
+    if column_type == pa.string():
+        return value if isinstance(value, str) else str(value)
+
+    value_type = get_value_type(value)
+
+    if column_type == pa.timestamp('us') and value_type == 'timestamp':
+        return value.to_native() if isinstance(value, DateTime) else value
+    if column_type == pa.bool_() and value_type == 'bool':
+        return value
+    if column_type == pa.int64() and value_type == 'int':
+        return value
+    if column_type == pa.float64() and value_type in ('int', 'float'):
+        return float(value)
+
+    raise ValueError(f'The value {value!r} does not fit the {column_type} column')
+
+
+# Read an id column of the record
+def id_reader(name):
+    return lambda record: record[name]
+
+
+# Read a property column of the record
+def property_reader(key):
+    return lambda record: record['properties'].get(key)
+
+
+# Convert a batch of records to an Arrow record batch
+def to_record_batch(records, columns, schema):
+    arrays = [pa.array([to_column_value(read(record), column_type) for record in records], type=column_type)
+              for _, read, column_type in columns]
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# Stream the batches as Arrow IPC stream
+def arrow_stream(batches, columns, schema):
+    sink = io.BytesIO()
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        # The schema message, then one message for each batch
+        for batch in chain([None], batches):
+            if batch:
+                writer.write_batch(to_record_batch(batch, columns, schema))
+
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+
+    # The end of stream marker
+    yield sink.getvalue()
+
+
+# Write the batches in a temporary Parquet file (one row group for each batch)
+def write_parquet_file(batches, columns, schema):
+    parquet_file = tempfile.TemporaryFile()
+
+    try:
+        with pq.ParquetWriter(parquet_file, schema) as writer:
+            for batch in batches:
+                if batch:
+                    writer.write_batch(to_record_batch(batch, columns, schema))
+
+        parquet_file.seek(0)
+        return parquet_file
+
+    except Exception:
+        parquet_file.close()
+        raise
+
+
+# Read the file in chunks (the file is closed at the end)
+def read_file_chunks(file):
+    try:
+        while True:
+            chunk = file.read(PARQUET_CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            yield chunk
+    finally:
+        file.close()
@@ -0,0 +1,143 @@
+"""
+------------------------------------------------------------------------
+File : filter_planner_service.py
+Description: Service for the compilation and execution of the analysis filters
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import json
+import time
+
+from Models.logger_model import Logger
+from Utils.filter_query_lib import *
+from Utils.graph_query_lib import get_activities_name_query
+
+# Engine logger setup
+logger = Logger()
+
+
+# The Service for the filter plan
+class FilterPlannerService:
+
+    # Compile the analysis in a filter plan
+    @staticmethod
+    def compile_plan_s(analysis_data, get_all_activities):
+        """
+        Compile the analysis filters in the minimal list of statements. The timestamp bounds run first
+        (they shrink the working set of the next filters), the include and exclude activity filters are merged
+        in a single pass and the duplicated filters are executed once
+        :param analysis_data: the analysis (the filters lists)
+        :param get_all_activities: the function that returns the visible activities (called only for include filters)
+        :return: the plan (list of steps with the filter name, the filters and the statements)
+        """
+        plan = []
+
+        # 1. Timestamp bounds
+        for current_filter in unique_filters(analysis_data.get('timestamp', [])):
+            plan.append(plan_step('timestamp', [current_filter],
+                                  timestamp_filter_delete_query(current_filter['startDate'],
+                                                                current_filter['endDate'])))
+
+        # 2. Performance
+        for current_filter in unique_filters(analysis_data.get('performance', [])):
+            plan.append(plan_step('performance', [current_filter],
+                                  filter_entity_performance(current_filter['entity'], current_filter['operator'],
+                                                            current_filter['seconds'])))
+
+        # 3. Include and exclude activities (a single pass)
+        include_filters = unique_filters(analysis_data.get('includeActivities', []))
+        exclude_filters = unique_filters(analysis_data.get('excludeActivities', []))
+
+        if include_filters or exclude_filters:
+            excluded_activities = []
+
+            if include_filters:
+                # Only the activities selected by every include filter are kept
+                included_activities = set.intersection(*[set(current_filter['activities'])
+                                                         for current_filter in include_filters])
+                excluded_activities += [activity for activity in get_all_activities()
+                                        if activity not in included_activities]
+
+            for current_filter in exclude_filters:
+                excluded_activities += current_filter['activities']
+
+            excluded_activities = list(dict.fromkeys(excluded_activities))
+
+            if excluded_activities:
+                plan.append(plan_step('activities', include_filters + exclude_filters,
+                                      exclude_activities_filter_query(excluded_activities)))
+
+        # 4. Frequency
+        for current_filter in unique_filters(analysis_data.get('frequence', [])):
+            plan.append(plan_step('frequency', [current_filter],
+                                  filter_activity_frequency(current_filter['entity'], current_filter['operator'],
+                                                            current_filter['frequency'])))
+
+        # 5. Variant
+        for current_filter in unique_filters(analysis_data.get('variant', [])):
+            plan.append(plan_step('variant', [current_filter],
+                                  filter_entity_variant(current_filter['entity'], current_filter['operator'],
+                                                        current_filter['variant'])))
+
+        return plan
+
+    # Execute the filter plan
+    @staticmethod
+    def execute_plan_s(database_connector, plan):
+        """
+        Execute the statements of the plan in order
+        :param database_connector: the database connector
+        :param plan: the filter plan
+        :return: the breakdown (filter name, hidden events and seconds of each step)
+        """
+        breakdown = []
+
+        for step in plan:
+            start_time = time.perf_counter()
+
+            try:
+                result = database_connector.run_query_memgraph(step['query'], step['params'])
+            except Exception as e:
+                raise RuntimeError(f"{step['filter']} filter: {e}") from e
+
+            breakdown.append({
+                'filter': step['filter'],
+                'filters': step['filters'],
+                'rows': result[0]['rows'] if result else 0,
+                'seconds': round(time.perf_counter() - start_time, 3)
+            })
+
+        logger.info('Filter plan: ' + ', '.join([f"{step['filter']} {step['rows']} rows in {step['seconds']}s"
+                                                 for step in breakdown]))
+        return breakdown
+
+    # Get the visible activities
+    @staticmethod
+    def get_all_activities_s(database_connector):
+        """
+        Get the activities of the visible events
+        :param database_connector: the database connector
+        :return: the activities names
+        """
+        result = database_connector.run_query_memgraph(get_activities_name_query())
+        return result[0]['activityNames'] if result else []
+
+
+# Create a plan step
+def plan_step(filter_name, filters, statement):
+    query, params = statement
+    return {'filter': filter_name, 'filters': filters, 'query': query, 'params': params}
+
+
+# Remove the duplicated filters (same content)
+def unique_filters(filters):
+    unique = {}
+    for current_filter in filters:
+        unique.setdefault(json.dumps(current_filter, sort_keys=True, default=str), current_filter)
+    return list(unique.values())
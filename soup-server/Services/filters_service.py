@@ -11,21 +11,22 @@ License : MIT
 """
 
 # Import
-import json
-
 from collections.abc import *
 from datetime import timedelta
 from flask import jsonify
 from Services.docker_service import DockerService
 from Services.support_service import SupportService
-from Services.generic_graph_service import GenericGraphService
+from Services.filter_planner_service import FilterPlannerService
+from Services.analysis_cache_service import AnalysisCacheService
+from Services.metadata_catalog_service import MetadataCatalogService
+from Models.analysis_cache_model import AnalysisCache
 from Models.docker_file_manager_model import DockerFileManager
 from Models.file_manager_model import FileManager
 from Models.api_response_model import ApiResponse
 from Models.logger_model import Logger
 from Utils.filter_query_lib import *
 from Utils.aggregate_graph_query_lib import delete_class_graph_query
-from Utils.graph_query_lib import get_limit_standard_graph_query, delete_event_graph_query, delete_entity_graph_query, get_activities_name_query
+from Utils.graph_query_lib import get_limit_standard_graph_query
 
 # Engine logger setup
 logger = Logger()
@@ -76,7 +77,7 @@ class FiltersService:
 
     # Process specific analysis
     @staticmethod
-    def process_analyses_s(database_connector, dataset_name, analyses_name):
+    def process_analyses_s(database_connector, dataset_name, analyses_name, breakdown=False):
         response = ApiResponse()
 
         try:
@@ -92,12 +93,13 @@ class FiltersService:
                 return jsonify(response.to_dict()), 500
 
             # 1. Process the analysis
-            result, data = process_analysis(container_id, database_connector, dataset_name, analyses_name)
+            result, data = process_analysis(container_id, database_connector, dataset_name, analyses_name,
+                                            breakdown)
 
             # 2. Check the response content
             if result.startswith('error'):
                 # Execute the rollback
-                execute_rollback_data(container_id, database_connector, dataset_name)
+                execute_rollback_data(database_connector)
 
                 response.http_status_code = 404
                 response.message = f'Error processing analysis. Probably an error occurred: {result}'
@@ -108,7 +110,7 @@ class FiltersService:
 
             if result == 'nothing changed':
                 # Execute the rollback
-                execute_rollback_data(container_id, database_connector, dataset_name)
+                execute_rollback_data(database_connector)
 
                 response.http_status_code = 204
                 response.message = 'Nothing changed'
@@ -119,7 +121,7 @@ class FiltersService:
 
             if result == 'no content':
                 # Execute the rollback
-                execute_rollback_data(container_id, database_connector, dataset_name)
+                execute_rollback_data(database_connector)
 
                 response.http_status_code = 204
                 response.message = 'No content available for the analysis'
@@ -137,7 +139,7 @@ class FiltersService:
                 return jsonify(response.to_dict()), 201
 
             # Execute the rollback
-            execute_rollback_data(container_id, database_connector, dataset_name)
+            execute_rollback_data(database_connector)
             response.http_status_code = 500
             response.message = 'Unexpected error'
             response.response_data = None
@@ -170,9 +172,8 @@ class FiltersService:
                 logger.error('SOUP Database is offline or does not exist')
                 return jsonify(response.to_dict()), 400
 
-            # 1. Get all analyses
-            result, analyses_folders = DockerFileManager.get_folder_files(container_id,
-                                                                          f'/soup/{dataset_name}/Analyses')
+            # 1. Get all analyses (metadata catalog)
+            result, analyses = MetadataCatalogService.get_analyses_s(container_id, dataset_name)
 
             if result != 'success':
                 response.http_status_code = 400
@@ -182,21 +183,9 @@ class FiltersService:
                 logger.info(f'Error while get folder files: {str(result)}')
                 return jsonify(response.to_dict()), 400
 
-            analyses_data = []
-
-            # 2. For each analysis, get the specific information
-            for analyses_name in analyses_folders:
-                result, exec_config_file = DockerFileManager.read_json_file_from_container(container_id,
-                                                                                           dataset_name,
-                                                                                           analyses_name)
-
-                if result == 'success':
-                    # Check if it is already a dictionary
-                    if not isinstance(exec_config_file, dict):
-                        exec_config_file = json.loads(exec_config_file)
-                    analyses_data.append(exec_config_file)
+            analyses_data = list(analyses.values())
 
-            # 3. Check the data
+            # 2. Check the data
             if len(analyses_data) == 0:
                 response.http_status_code = 202
                 response.message = 'No content'
@@ -239,10 +228,9 @@ class FiltersService:
 
             full_analysis_name = f'{analysis_name}.json'
 
-            result, analyses_folder = DockerFileManager.get_folder_files(container_id,
-                                                                         f'/soup/{dataset_name}/Analyses')
+            result, analyses = MetadataCatalogService.get_analyses_s(container_id, dataset_name)
 
-            if full_analysis_name not in analyses_folder:
+            if result != 'success' or full_analysis_name not in analyses:
                 response.http_status_code = 202
                 response.message = 'No content'
                 response.response_data = None
@@ -378,8 +366,8 @@ class FiltersService:
             database_connector.connect()
 
             # Execute the query
-            query = get_entity_trace_duration(entity_type)
-            result = database_connector.run_query_memgraph(query)
+            query, params = get_entity_trace_duration(entity_type)
+            result = database_connector.run_query_memgraph(query, params)
 
             if not isinstance(result, Iterable) or not result:
                 response.http_status_code = 202
@@ -442,8 +430,8 @@ class FiltersService:
             database_connector.connect()
 
             # Execute the query
-            query = get_activity_frequency_query(entity_type)
-            result = database_connector.run_query_memgraph(query)
+            query, params = get_activity_frequency_query(entity_type)
+            result = database_connector.run_query_memgraph(query, params)
 
             if not isinstance(result, Iterable) or not result:
                 response.http_status_code = 202
@@ -494,8 +482,8 @@ class FiltersService:
             database_connector.connect()
 
             # Execute the query
-            query = get_variant_query(entity_type)
-            result = database_connector.run_query_memgraph(query)
+            query, params = get_variant_query(entity_type)
+            result = database_connector.run_query_memgraph(query, params)
 
             if not isinstance(result, Iterable) or not result:
                 response.http_status_code = 202
@@ -628,33 +616,41 @@ def process_new_analysis_file(container_id, filters_data):
 
 
 # Process the analysis (filters)
-def process_analysis(container_id, database_connector, dataset_name, analysis_name):
+def process_analysis(container_id, database_connector, dataset_name, analysis_name, breakdown=False):
     try:
         # 1. Check the name and read configuration
         if not analysis_name.endswith(".json"):
             analysis_name = f'{analysis_name}.json'
 
-        result, exec_config_file = DockerFileManager.read_json_file_from_container(container_id, dataset_name,
-                                                                                   analysis_name)
+        result, analyses = MetadataCatalogService.get_analyses_s(container_id, dataset_name)
 
-        if result != 'success':
+        if result != 'success' or analysis_name not in analyses:
             logger.error(f'Error while reading json file on the Engine: {str(result)}')
-            return result
+            return f'error {result}', []
+
+        # 2. The analysis (filters)
+        analysis_data = analyses[analysis_name]
 
-        # 2. Check the instance
-        if not isinstance(exec_config_file, dict):
-            exec_config_file = json.loads(exec_config_file)
-        analysis_data = exec_config_file
+        # 2.1 Get the cached result (the key is the dataset configuration hash and the filters hash)
+        result, dataset_config = MetadataCatalogService.get_dataset_config_s(container_id, dataset_name)
+        cache_key = AnalysisCacheService.get_cache_key_s(dataset_config, analysis_data) \
+            if result == 'success' and dataset_config is not None else None
+        cached = AnalysisCacheService.get_cached_analysis_s(container_id, dataset_name, cache_key) \
+            if cache_key else None
 
-        # 3. Extract the filter
-        timestamp_filters = analysis_data['timestamp']
-        performance_filters = analysis_data['performance']
-        include_filters = analysis_data['includeActivities']
-        exclude_filters = analysis_data['excludeActivities']
-        frequence_filters = analysis_data['frequence']
-        variant_filters = analysis_data['variant']
+        # The analysis is already the view in Memgraph, so the result is served without any query
+        if cached is not None and AnalysisCache.is_active(cache_key):
+            logger.info(f'Analysis {analysis_name} served from the cache')
+            return 'success', analysis_response_data(cached['graph_data'], cached['breakdown'], breakdown)
 
-        # 4. Save the current data from Memgraph
+        # 3. Drop the view of the previous analysis (the filters are applied on the base EKG)
+        drop_filter_view(database_connector)
+
+        # 4. Compile the filters (timestamp bounds first, activity filters merged, duplicates removed)
+        plan = FilterPlannerService.compile_plan_s(
+            analysis_data, lambda: FilterPlannerService.get_all_activities_s(database_connector))
+
+        # 4.1 Save the current data from Memgraph
         node_counter, relationships_counter = get_node_and_relationship_count(database_connector)
 
         # 5. Connect to the Database and Run queries
@@ -664,97 +660,19 @@ def process_analysis(container_id, database_connector, dataset_name, analysis_na
         query = delete_class_graph_query()
         database_connector.run_query_memgraph(query)
 
-        # 5.1 Timestamp filter queries
-        for current_timestamp_filter in timestamp_filters:
-            start_date = current_timestamp_filter['startDate']
-            end_date = current_timestamp_filter['endDate']
-            query = timestamp_filter_delete_query(start_date, end_date)
-
-            try:
-                # Execute the query
-                database_connector.run_query_memgraph(query)
-
-            except Exception as e:
-                logger.error(f'Timestamp Internal Server Error: {str(e)}')
-                return f'error {e}', []
-
-        # 5.2 Performance filter queries
-        for current_performance_filter in performance_filters:
-            entity = current_performance_filter['entity']
-            operator = current_performance_filter['operator']
-            seconds = current_performance_filter['seconds']
-            query = filter_entity_performance(entity, operator, seconds)
-
-            try:
-                # Execute the query
-                database_connector.run_query_memgraph(query)
-            except Exception as e:
-                logger.error(f'Performance Internal Server Error: {str(e)}')
-                return f'error {e}', []
-
-        # 5.3 Include activities filter queries
-        for current_include_filter in include_filters:
-            activities_q = get_activities_name_query()
-            
-            activities = current_include_filter['activities']
-
-            try:
-                entities = database_connector.run_query_memgraph(activities_q)
-                all_activities = entities[0]['activityNames']
-                excluded_activities = [x for x in all_activities if x not in activities]
-                
-                # Execute the query, i.e., exclude all the activities that are not selected as 'include'
-                for e_act in excluded_activities:
-                    query = exclude_activity_filter_query(e_act)
-                    print(query)
-                    database_connector.run_query_memgraph(query)
-
-            except Exception as e:
-                logger.error(f'Include Activities Internal Server Error: {str(e)}')
-                return f'error {e}', []
-
-        # 5.4 Exclude activities filter queries
-        for current_exclude_filter in exclude_filters:
-            activities = current_exclude_filter['activities']
-            for activity in activities:
-                query = exclude_activity_filter_query(activity)
-
-                try:
-                    # Execute the query
-                    database_connector.run_query_memgraph(query)
-
-                except Exception as e:
-                    logger.error(f'Exclude Activities Internal Server Error: {str(e)}')
-                    return f'error {e}', []
-
-        # 5.5 Frequency filter queries
-        for current_frequency_filter in frequence_filters:
-            entity = current_frequency_filter['entity']
-            operator = current_frequency_filter['operator']
-            frequency = current_frequency_filter['frequency']
-            query = filter_activity_frequency(entity, operator, frequency)
-            print(query)
-
-            try:
-                # Execute the query
-                database_connector.run_query_memgraph(query)
-            except Exception as e:
-                logger.error(f'Frequency Internal Server Error: {str(e)}')
-                return f'error {e}', []
-
-        # 5.6 Variant filter queries
-        for current_variant_filter in variant_filters:
-            entity = current_variant_filter['entity']
-            operator = current_variant_filter['operator']
-            variant = current_variant_filter['variant']
-            query = filter_entity_variant(entity, operator, variant)
-
-            try:
-                # Execute the query
-                database_connector.run_query_memgraph(query)
-            except Exception as e:
-                logger.error(f'Variant Internal Server Error: {str(e)}')
-                return f'error {e}', []
+        # 5.1 Execute the filter plan
+        try:
+            plan_breakdown = FilterPlannerService.execute_plan_s(database_connector, plan)
+        except Exception as e:
+            logger.error(f'Filter Internal Server Error: {str(e)}')
+            return f'error {e}', []
+
+        # 5.2 The view is applied, the cached graph data does not need to be fetched again
+        if cached is not None:
+            AnalysisCache.set_active(cache_key)
+
+            logger.info(f'Analysis {analysis_name} applied, graph data served from the cache')
+            return 'success', analysis_response_data(cached['graph_data'], cached['breakdown'], breakdown)
 
         # 6. Check the counter difference
         node_counter_updated, relationships_counter_updated = get_node_and_relationship_count(database_connector)
@@ -764,9 +682,9 @@ def process_analysis(container_id, database_connector, dataset_name, analysis_na
 
         # 6. Get the updated and filtered EKG from the db
         limit = 200
-        query_result = get_limit_standard_graph_query(limit)
+        query_result, params = get_limit_standard_graph_query(limit)
 
-        result = database_connector.run_query_memgraph(query_result)
+        result = database_connector.run_query_memgraph(query_result, params)
 
         if len(result) == 0:
             return 'no content', []
@@ -781,41 +699,53 @@ def process_analysis(container_id, database_connector, dataset_name, analysis_na
         if not graph_data:
             return 'no content', []
 
-        return 'success', graph_data
+        # 7. Save the result in the cache
+        if cache_key:
+            AnalysisCacheService.save_analysis_s(container_id, dataset_name, cache_key, graph_data, plan_breakdown)
+            AnalysisCache.set_active(cache_key)
+
+        return 'success', analysis_response_data(graph_data, plan_breakdown, breakdown)
 
     except Exception as e:
         logger.error(f'Internal Server Error: {str(e)}')
         return f'error: {e}', []
 
 
+# Create the analysis response data
+def analysis_response_data(graph_data, plan_breakdown, breakdown):
+    # The per-filter breakdown (hidden events and time) is returned only when requested
+    if breakdown:
+        return {'graph_data': graph_data, 'breakdown': plan_breakdown}
+
+    return graph_data
+
+
 # Execute the rollback
-def execute_rollback_data(container_id, database_connector, dataset_name):
-    # 1. Clean the memgraph data
-    event_node_delete_query = delete_event_graph_query()
-    database_connector.run_query_memgraph(event_node_delete_query)
+def execute_rollback_data(database_connector):
+    # The filters only hide the data (view), so the rollback drops the view instead of reloading the dataset
+    drop_filter_view(database_connector)
 
-    entity_node_delete_query = delete_entity_graph_query()
-    database_connector.run_query_memgraph(entity_node_delete_query)
 
-    # 2. Reload the data
-    GenericGraphService.create_complete_graphs_s(container_id, database_connector, dataset_name)
+# Drop the filter view (show the complete EKG again)
+def drop_filter_view(database_connector):
+    AnalysisCache.set_active(None)
+    database_connector.connect()
 
+    for query in drop_filter_view_queries():
+        database_connector.run_query_memgraph(query)
 
-# Get the current data (node count and relationships count) inside Memgraph database
+
+# Get the current data (node count and relationships count) visible in the Memgraph database
 def get_node_and_relationship_count(database_connector):
     database_connector.connect()
 
-    node_count_query = "MATCH (n) RETURN count(n) AS node_count"
-    relationship_count_query = "MATCH ()-[r]->() RETURN count(r) AS relationship_count"
-
     try:
         # 1. Execute the query
-        node_count_result = database_connector.run_query_memgraph(node_count_query)
-        relationship_count_result = database_connector.run_query_memgraph(relationship_count_query)
+        count_result = database_connector.run_query_memgraph(get_view_count_query())
 
         # 2. Extract and return the data
-        node_count = node_count_result[0]['node_count'] if node_count_result else 0
-        relationship_count = relationship_count_result[0]['relationship_count'] if relationship_count_result else 0
+        node_count = count_result[0]['node_count'] if count_result else 0
+        relationship_count = count_result[0]['relationship_count'] if count_result else 0
 
         return node_count, relationship_count
     except Exception as e:
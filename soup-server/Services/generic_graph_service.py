@@ -17,7 +17,14 @@ from datetime import datetime
 from flask import jsonify
 from collections.abc import *
 from Services.Graph.op_graph_service import OperationGraphService
+from Services.Graph.df_relation_service import DfRelationService
+from Services.Graph.node_load_service import NodeLoadService
+from Services.Graph.parallel_build_service import ParallelBuildService
+from Services.snapshot_service import SnapshotService
+from Services.analysis_cache_service import AnalysisCacheService
+from Shared.support_config import get_next_cursor
 from Services.support_service import SupportService
+from Models.analysis_cache_model import AnalysisCache
 from Models.api_response_model import ApiResponse
 from Models.dataset_process_info_model import DatasetProcessInformation
 from Models.docker_file_manager_model import DockerFileManager
@@ -37,13 +44,21 @@ class GenericGraphService:
 
     # Create complete graph
     @staticmethod
-    def create_complete_graphs_s(container_id, database_connector, dataset_name):
+    def create_complete_graphs_s(container_id, database_connector, dataset_name, progress_callback=None):
         process_info = DatasetProcessInformation()
 
+        def notify_stage(stage):
+            # Stage-level progress (used by the background jobs)
+            if progress_callback is not None:
+                progress_callback(stage, process_info)
+
         try:
             # The current time
             process_info.init_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
+            # 0. The graph is built again, so no analysis is applied as filter view
+            AnalysisCache.set_active(None)
+
             # 1. Get the dataset files (from the Docker container)
             main_csv_path, entity_csv_path, config_json_path, svg_path = DockerFileManager.get_dataset_file_path(
                 container_id,
@@ -73,70 +88,102 @@ class GenericGraphService:
             trigger_target_rows = exec_config_file["trigger_target_rows"]
             date_created = exec_config_file['date_created']
             date_modified = exec_config_file['date_modified']
+            config_hash = SnapshotService.get_config_hash(exec_config_file)
+
+            # 2.1 The cached analysis results of a previous configuration (columns and values) are removed
+            AnalysisCacheService.invalidate_stale_s(container_id, dataset_name, exec_config_file)
 
             try:
                 database_connector.connect()
 
-                # 3. Execute the event nodes query and save the time
-                cypher_properties = []
-                for key in values_columns:
-                    if key not in standard_columns:
-                        if key not in ['event_id', 'timestamp', 'activity_name']:
-                            cypher_properties.append(f"{key}: coalesce(row.{key}, '')")
-
-                process_info.init_event_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-                query = load_event_node_query(main_csv_path, standard_columns[0], standard_columns[1],
-                                              standard_columns[2],
-                                              cypher_properties)
-                database_connector.run_query_memgraph(query)
-                process_info.finish_event_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-
-                # 4. Execute the entity nodes query
-                process_info.init_entity_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-                query = load_entity_node_query(entity_csv_path)
-                database_connector.run_query_memgraph(query)
-                process_info.finish_entity_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-
-                # 5. Create entities index to optimize :CORR creation
-                database_connector.run_query_memgraph(create_entity_index())
-                # + Create event index to optimize search and manipulation
-                database_connector.run_query_memgraph(create_event_index())
-
-                # 6. Create :CORR relationships
-                process_info.init_corr_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-
-                for key in filtered_columns:
-                    if key not in ['event_id', 'timestamp', 'activity_name']:
+                # 3. Restore the base EKG from the snapshot (the inference queries are skipped)
+                restored = SnapshotService.restore_graph_s(container_id, database_connector, dataset_name,
+                                                           config_hash, process_info)
+
+                if restored:
+                    for stage in ['index', 'event', 'entity', 'corr', 'causal', 'df']:
+                        notify_stage(stage)
+                else:
+                    # 3.1 Create the indexes (before the load, the entity MERGE uses the (Type, Value) index)
+                    process_info.init_index_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    for query in create_graph_index_queries():
+                        try:
+                            database_connector.run_query_memgraph(query)
+                        except Exception as e:
+                            # The lookups fall back to label scans, the missing index is saved in the process info
+                            process_info.missing_indexes.append(query.strip())
+                            logger.error(f'Unable to create the index ({query}): {str(e)}')
+                    process_info.finish_index_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    notify_stage('index')
+
+                    # 4. Execute the event nodes query and save the time
+                    property_keys = []
+                    for key in values_columns:
                         if key not in standard_columns:
-                            relation_query_corr = create_corr_relation_query(key)
-                            database_connector.run_query_memgraph(relation_query_corr)
+                            if key not in ['event_id', 'timestamp', 'activity_name']:
+                                property_keys.append(key)
+
+                    process_info.init_event_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    NodeLoadService.create_event_nodes_s(container_id, database_connector, main_csv_path,
+                                                         standard_columns[0], standard_columns[1],
+                                                         standard_columns[2], property_keys)
+                    process_info.finish_event_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    notify_stage('event')
+
+                    # 5. Execute the entity nodes query
+                    process_info.init_entity_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    NodeLoadService.create_entity_nodes_s(container_id, database_connector, entity_csv_path)
+                    process_info.finish_entity_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    notify_stage('entity')
+
+                    # 6. Create :CORR relationships (one concurrent task for each entity type)
+                    process_info.init_corr_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+                    def create_corr_relations(key):
+                        relation_query_corr, params = create_corr_relation_query(key)
+                        database_connector.run_query_memgraph(relation_query_corr, params)
+
+                    corr_keys = [key for key in filtered_columns
+                                 if key not in ['event_id', 'timestamp', 'activity_name'] and key not in standard_columns]
+                    ParallelBuildService.run_per_key_s(corr_keys, create_corr_relations, process_info.corr_key_times)
 
-                process_info.finish_corr_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    process_info.finish_corr_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    notify_stage('corr')
 
-                process_info.init_df_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    process_info.init_df_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+                    # 7. Trigger and Target check (their :DF relationships are created by the causal queries)
+                    causal_keys = set()
 
-                # 7. Trigger and Target check
-                if len(trigger_target_rows) > 0:
                     for pair in trigger_target_rows:
                         trigger = pair['trigger']
                         target = pair['target']
 
                         queries = reveal_causal_rels(trigger, target)
-                        for query in queries:
-                            database_connector.run_query_memgraph(query)
+                        for query, params in queries:
+                            database_connector.run_query_memgraph(query, params)
 
-                        for key in filtered_columns:
-                            if key not in ['event_id', 'timestamp', 'activity_name', trigger, target]:
-                                relation_query_df = create_df_relation_query(key)
-                                database_connector.run_query_memgraph(relation_query_df)
-                else:
-                    # 7.2. Create :DF relationships
-                    for key in filtered_columns:
-                        if key not in ['event_id', 'timestamp', 'activity_name']:
-                            relation_query_df = create_df_relation_query(key)
-                            database_connector.run_query_memgraph(relation_query_df)
+                        causal_keys.update([trigger, target])
+
+                    # 7.1 The other entity types of all the pairs are built once
+                    df_keys = [key for key in filtered_columns
+                               if key not in ['event_id', 'timestamp', 'activity_name']
+                               and key not in standard_columns and key not in causal_keys]
+
+                    notify_stage('causal')
+
+                    # 7.2. Create :DF relationships (one concurrent task for each entity type)
+                    ParallelBuildService.run_per_key_s(
+                        df_keys, lambda key: DfRelationService.create_df_relations_s(database_connector, key),
+                        process_info.df_key_times)
+
+                    process_info.finish_df_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+                    notify_stage('df')
+
+                    # 8. Save the snapshot of the base EKG (used by the next builds of the dataset)
+                    SnapshotService.save_snapshot_s(container_id, database_connector, dataset_name, config_hash,
+                                                    process_info)
 
-                process_info.finish_df_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
                 process_info.finish_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
             except Exception as e:
@@ -184,6 +231,7 @@ class GenericGraphService:
                 logger.error(f'Error while delete the file on the Engine directory: {str(result)}')
                 return result
 
+            notify_stage('stats')
             return 'success'
 
         except Exception as e:
@@ -192,43 +240,44 @@ class GenericGraphService:
 
     # Get complete graph (standard or class)
     @staticmethod
-    def get_graph_s(database_connector, standard_graph, limit):
+    def get_graph_s(database_connector, standard_graph, limit, after=None, page_size=None, stream=False,
+                    graph_format='triples'):
         response = ApiResponse()
 
         try:
-            if standard_graph == "1":
+            if page_size:
+                # Keyset pagination on the relationship id
+                if standard_graph == "1":
+                    query_result, params = get_page_standard_graph_query(after, page_size)
+                else:
+                    query_result, params = get_page_class_graph_query(after, page_size)
+            elif standard_graph == "1":
                 if not limit:
-                    query_result = get_complete_standard_graph_query()
+                    query_result, params = get_complete_standard_graph_query(), None
                 else:
-                    query_result = get_limit_standard_graph_query(limit)
+                    query_result, params = get_limit_standard_graph_query(limit)
             else:
                 if not limit:
-                    query_result = get_complete_class_graph_query()
+                    query_result, params = get_complete_class_graph_query(), None
                 else:
-                    query_result = get_limit_class_graph_query(limit)
+                    query_result, params = get_limit_class_graph_query(limit)
 
-            # Open connection and run query
+            # Open connection and stream the query records
             database_connector.connect()
-            result = database_connector.run_query_memgraph(query_result)
-
-            if len(result) == 0:
-                response.http_status_code = 204
-                response.response_data = None
-                response.message = "No content"
+            records = database_connector.stream_query(query_result, params)
 
-                logger.info('No content')
-                return jsonify(response.to_dict()), 204
+            # NDJSON: one line for each (source, edge, target) record, sent while the records are arriving
+            if stream:
+                return SupportService.ndjson_response(
+                    records, lambda record, _: SupportService.extract_graph_record(record), page_size), 200
 
-            if not isinstance(result, Iterable):
-                response.http_status_code = 404
-                response.response_data = None
-                response.message = "Not found"
+            # Extract data information while the records are arriving
+            result = SupportService.extract_graph_data(records)
 
-                logger.error('Not found')
-                return jsonify(response.to_dict()), 404
-
-            # Extract data information
-            result = SupportService.extract_graph_data(result)
+            if page_size:
+                graph_data = result['graph_data']
+                last_cursor = graph_data[-1]['edge']['id'] if graph_data else None
+                response.set_next_cursor(get_next_cursor(last_cursor, len(graph_data), page_size))
 
             graph_data = result['graph_data']
             nodes_count = result['unique_nodes_count']
@@ -242,6 +291,12 @@ class GenericGraphService:
                 logger.info('No content')
                 return jsonify(response.to_dict()), 204
 
+            # Normalized and columnar formats: each node is sent once
+            if graph_format != 'triples':
+                result = {**SupportService.format_graph_data(graph_data, graph_format),
+                          'unique_nodes_count': nodes_count,
+                          'unique_edges_count': edges_count}
+
             response.http_status_code = 200
             response.response_data = result
             response.message = "Retrieve Graph"
@@ -292,6 +347,26 @@ class GenericGraphService:
         finally:
             database_connector.close()
 
+    # Delete a partially built graph
+    @staticmethod
+    def delete_partial_graph_s(database_connector):
+        """
+        Remove the Event and Entity nodes (with their CORR and DF relationships) left by a failed
+        or cancelled build, so the next build or analysis does not run on a half-built EKG
+        :param database_connector: the database connector
+        """
+        # The analysis view is removed with the graph
+        AnalysisCache.set_active(None)
+
+        try:
+            database_connector.connect()
+
+            database_connector.run_query_memgraph(delete_event_graph_query())
+            database_connector.run_query_memgraph(delete_entity_graph_query())
+
+        finally:
+            database_connector.close()
+
     # Delete all graphs inside the database
     @staticmethod
     def delete_memgraph_graph_s(database_connector):
@@ -300,6 +375,9 @@ class GenericGraphService:
         try:
             database_connector.connect()
 
+            # The analysis view is removed with the graph
+            AnalysisCache.set_active(None)
+
             # 1. Remove the event nodes
             event_node_delete_query = delete_event_graph_query()
             database_connector.run_query_memgraph(event_node_delete_query)
@@ -0,0 +1,277 @@
+"""
+------------------------------------------------------------------------
+File : job_service.py
+Description: Service for the background graph build jobs
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import threading
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify
+from Models.api_response_model import ApiResponse
+from Models.graph_job_model import GraphJob, GraphJobCancelled
+from Models.logger_model import Logger
+
+# Engine logger setup
+logger = Logger()
+
+# The SocketIO event used for the job progress
+JOB_PROGRESS_EVENT = 'graph_job_progress'
+
+# Max number of finished jobs kept in memory
+max_finished_jobs = int(os.getenv("SOUP_MAX_FINISHED_JOBS", 100))
+
+# One worker: the builds share the same Memgraph instance, so they must run one at a time
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='soup-graph-job')
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+# The Service for the background jobs
+class JobService:
+
+    # Submit new job
+    @staticmethod
+    def submit_job_s(kind, dataset_name, target, socketio=None, on_failure=None):
+        """
+        Submit a new background job
+        :param kind: the job kind
+        :param dataset_name: the dataset name
+        :param target: the function to run, it receives the progress callback and returns 'success' or the error
+        :param socketio: the SocketIO instance used to send the progress events
+        :param on_failure: the function called when the job fails or is cancelled
+        :return: the job
+        """
+        job = GraphJob(kind, dataset_name)
+        job.cleanup = on_failure
+
+        with _jobs_lock:
+            _clean_finished_jobs()
+            _jobs[job.job_id] = job
+
+        job.future = _executor.submit(_run_job, job, target, socketio)
+
+        logger.info(f'Submitted job {job.job_id} ({kind}) for dataset {dataset_name}')
+        _emit_progress(socketio, job)
+        return job
+
+    # Get all jobs
+    @staticmethod
+    def get_jobs_s():
+        response = ApiResponse()
+
+        try:
+            with _jobs_lock:
+                jobs = [job.to_dict() for job in _jobs.values()]
+
+            response.http_status_code = 200
+            response.response_data = jobs
+            response.message = 'Retrieve jobs'
+
+            logger.info('Retrieve jobs')
+            return jsonify(response.to_dict()), 200
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+    # Get the job status (and the result when finished)
+    @staticmethod
+    def get_job_s(job_id):
+        response = ApiResponse()
+
+        try:
+            with _jobs_lock:
+                job = _jobs.get(job_id)
+                job_data = job.to_dict() if job is not None else None
+
+            if job_data is None:
+                response.http_status_code = 404
+                response.response_data = None
+                response.message = 'Job not found'
+
+                logger.error(f'Job {job_id} not found')
+                return jsonify(response.to_dict()), 404
+
+            response.http_status_code = 200
+            response.response_data = job_data
+            response.message = 'Retrieve job'
+
+            logger.info(f'Retrieve job {job_id}')
+            return jsonify(response.to_dict()), 200
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+    # Cancel the job
+    @staticmethod
+    def cancel_job_s(job_id, socketio=None):
+        response = ApiResponse()
+
+        try:
+            never_started = False
+
+            with _jobs_lock:
+                job = _jobs.get(job_id)
+
+                if job is not None and not job.is_finished():
+                    job.cancel_event.set()
+
+                    # A queued job never starts
+                    if job.status == 'queued' and job.future is not None and job.future.cancel():
+                        never_started = True
+                        job.status = 'cancelled'
+                        job.finish_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+                job_data = job.to_dict() if job is not None else None
+
+            if never_started:
+                _clean_job(job)
+
+            if job_data is None:
+                response.http_status_code = 404
+                response.response_data = None
+                response.message = 'Job not found'
+
+                logger.error(f'Job {job_id} not found')
+                return jsonify(response.to_dict()), 404
+
+            if job_data['status'] in ['completed', 'failed']:
+                response.http_status_code = 409
+                response.response_data = job_data
+                response.message = 'Job already finished'
+
+                logger.error(f'Job {job_id} already finished')
+                return jsonify(response.to_dict()), 409
+
+            _emit_progress(socketio, job)
+
+            # A running job stops at the end of the current stage
+            response.http_status_code = 202
+            response.response_data = job_data
+            response.message = 'Job cancellation requested'
+
+            logger.info(f'Job {job_id} cancellation requested')
+            return jsonify(response.to_dict()), 202
+
+        except Exception as e:
+            response.http_status_code = 500
+            response.response_data = None
+            response.message = f'Internal Server Error : {str(e)}'
+
+            logger.error(f'Internal Server Error : {str(e)}')
+            return jsonify(response.to_dict()), 500
+
+
+# Run the job (on the worker thread)
+def _run_job(job, target, socketio):
+    with _jobs_lock:
+        cancelled_before_start = job.cancel_event.is_set()
+
+        if cancelled_before_start:
+            job.status = 'cancelled'
+            job.finish_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+    if cancelled_before_start:
+        _clean_job(job)
+        _emit_progress(socketio, job)
+        return
+
+    with _jobs_lock:
+        job.status = 'running'
+        job.start_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+    _emit_progress(socketio, job)
+
+    def progress_callback(stage, process_info):
+        with _jobs_lock:
+            job.stage = stage
+            if stage not in job.completed_stages:
+                job.completed_stages.append(stage)
+            job.process_info = process_info.to_dict()
+
+        _emit_progress(socketio, job)
+
+        # Cooperative cancellation between the stages
+        if job.cancel_event.is_set():
+            raise GraphJobCancelled(f'Job {job.job_id} cancelled')
+
+    try:
+        result = target(progress_callback)
+    except Exception as e:
+        result = f'Error: {e}'
+
+    # A job cancelled after the last stage is already complete
+    if result == 'success':
+        status = 'completed'
+    elif job.cancel_event.is_set():
+        status = 'cancelled'
+    else:
+        status = 'failed'
+
+    if status != 'completed':
+        _clean_job(job)
+
+    with _jobs_lock:
+        job.status = status
+        job.result = result if status == 'completed' else None
+        job.error = None if status == 'completed' else result
+        job.finish_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+    if status == 'completed':
+        logger.info(f'Job {job.job_id} completed')
+    else:
+        logger.error(f'Job {job.job_id} {status}: {str(result)}')
+
+    _emit_progress(socketio, job)
+
+
+# Clean the data of a failed or cancelled job
+def _clean_job(job):
+    if job.cleanup is None:
+        return
+
+    try:
+        job.cleanup()
+    except Exception as e:
+        logger.error(f'Error while clean the job {job.job_id}: {str(e)}')
+
+
+# Send the job progress with SocketIO
+def _emit_progress(socketio, job):
+    if socketio is None:
+        return
+
+    try:
+        with _jobs_lock:
+            job_data = job.to_dict()
+
+        socketio.emit(JOB_PROGRESS_EVENT, job_data)
+    except Exception as e:
+        logger.warning(f'Unable to send the job progress: {str(e)}')
+
+
+# Remove the oldest finished jobs (the caller holds the lock)
+def _clean_finished_jobs():
+    finished = [job_id for job_id, job in _jobs.items() if job.is_finished()]
+
+    for job_id in finished[:max(0, len(finished) - max_finished_jobs)]:
+        del _jobs[job_id]
@@ -0,0 +1,147 @@
+"""
+------------------------------------------------------------------------
+File : metadata_catalog_service.py
+Description: Service for the datasets and analyses metadata catalog
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import json
+
+from Models.docker_file_manager_model import DockerFileManager
+from Models.metadata_catalog_model import MetadataCatalog, new_dataset_entry
+from Models.logger_model import Logger
+
+# Engine logger setup
+logger = Logger()
+
+
+# The Service for the metadata catalog
+class MetadataCatalogService:
+
+    # Load the catalog
+    @staticmethod
+    def load_catalog_s(container_id):
+        """
+        Load the catalog from the container (one exec for all the datasets), unless it is already loaded.
+        The DockerFileManager writes and removals keep it up to date
+        :param container_id: the container unique id
+        :return: success or error message
+        """
+        if MetadataCatalog.is_loaded(container_id):
+            return 'success'
+
+        result, entries = DockerFileManager.read_soup_metadata(container_id)
+
+        if result != 'success':
+            logger.error(f'Unable to load the metadata catalog: {str(result)}')
+            return result
+
+        MetadataCatalog.load(container_id, index_metadata_entries(entries))
+        return 'success'
+
+    # Get the dataset names
+    @staticmethod
+    def get_dataset_names_s(container_id):
+        """
+        Get the dataset names (the /soup folders)
+        :param container_id: the container unique id
+        :return: success or error message with the names
+        """
+        result = MetadataCatalogService.load_catalog_s(container_id)
+
+        if result != 'success':
+            return result, None
+
+        return 'success', MetadataCatalog.get_dataset_names()
+
+    # Get a dataset configuration
+    @staticmethod
+    def get_dataset_config_s(container_id, dataset_name, with_svg=False):
+        """
+        Get the dataset configuration
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :param with_svg: add the svg content (svg_content key)
+        :return: success or error message with the configuration (None if the dataset has no configuration)
+        """
+        result = MetadataCatalogService.load_catalog_s(container_id)
+
+        if result != 'success':
+            return result, None
+
+        entry = MetadataCatalog.get_dataset(dataset_name)
+
+        if entry is None or entry['config'] is None:
+            return 'success', None
+
+        return 'success', dataset_config(entry, with_svg)
+
+    # Get all the dataset configurations
+    @staticmethod
+    def get_dataset_configs_s(container_id):
+        """
+        Get the configurations (with the svg content) of all the datasets
+        :param container_id: the container unique id
+        :return: success or error message with the configurations
+        """
+        result = MetadataCatalogService.load_catalog_s(container_id)
+
+        if result != 'success':
+            return result, None
+
+        return 'success', [dataset_config(entry, True) for entry in MetadataCatalog.get_datasets()
+                           if entry['config'] is not None]
+
+    # Get the dataset analyses
+    @staticmethod
+    def get_analyses_s(container_id, dataset_name):
+        """
+        Get the analyses of a dataset
+        :param container_id: the container unique id
+        :param dataset_name: the dataset name
+        :return: success or error message with the analyses (file name to analysis)
+        """
+        result = MetadataCatalogService.load_catalog_s(container_id)
+
+        if result != 'success':
+            return result, None
+
+        entry = MetadataCatalog.get_dataset(dataset_name)
+        return 'success', entry['analyses'] if entry is not None else {}
+
+
+# Index the metadata entries read from the container (paths relative to /soup)
+def index_metadata_entries(entries):
+    datasets = {}
+
+    for path, content in entries:
+        parts = path.split('/')
+        entry = datasets.setdefault(parts[0], new_dataset_entry())
+
+        try:
+            if len(parts) == 2 and parts[1] == f'{parts[0]}_config.json':
+                entry['config'] = json.loads(content)
+            elif len(parts) == 2 and parts[1] == f'{parts[0]}_config.svg':
+                entry['svg'] = content
+            elif len(parts) == 3 and parts[1] == 'Analyses':
+                entry['analyses'][parts[2]] = json.loads(content)
+        except ValueError as e:
+            logger.warning(f'Invalid metadata file {path}: {str(e)}')
+
+    return datasets
+
+
+# Get the dataset configuration (with the svg content if requested)
+def dataset_config(entry, with_svg):
+    config = entry['config']
+
+    if with_svg:
+        config['svg_content'] = entry['svg']
+
+    return config
@@ -0,0 +1,298 @@
+"""
+------------------------------------------------------------------------
+File : snapshot_service.py
+Description: Service for the snapshot and restore of the base EKG
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import gzip
+import json
+import hashlib
+
+from datetime import datetime
+from neo4j.time import DateTime, Date, Time, Duration
+from Shared.support_config import snapshot_enabled, snapshot_batch_size
+from Models.docker_file_manager_model import DockerFileManager
+from Models.file_manager_model import FileManager
+from Models.logger_model import Logger
+from Utils.graph_query_lib import create_graph_index_queries, delete_event_graph_query, delete_entity_graph_query
+from Utils.snapshot_query_lib import *
+
+# Engine logger setup
+logger = Logger()
+
+# The snapshot format version (a different version is never restored)
+SNAPSHOT_VERSION = 1
+
+# The configuration keys that define the graph (a change makes the snapshot stale)
+GRAPH_CONFIG_KEYS = ['all_columns', 'standard_columns', 'filtered_columns', 'values_columns', 'trigger_target_rows']
+
+
+# The Service for the EKG snapshot
+class SnapshotService:
+
+    # Get the configuration hash
+    @staticmethod
+    def get_config_hash(config):
+        """
+        Get the hash of the dataset configuration that defines the graph
+        :param config: the dataset configuration
+        :return: the hash
+        """
+        graph_config = {key: config.get(key) for key in GRAPH_CONFIG_KEYS}
+        return hashlib.sha256(json.dumps(graph_config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    # Save the snapshot of the base EKG
+    @staticmethod
+    def save_snapshot_s(container_id, database_connector, dataset_name, config_hash, process_info=None):
+        """
+        Save the base EKG (Event and Entity nodes, CORR and DF relationships) in the dataset folder
+        as a gzip JSON lines file. The first line is the header, then the nodes and the relationships
+        :param container_id: the container unique id
+        :param database_connector: the database connector
+        :param dataset_name: the dataset name
+        :param config_hash: the dataset configuration hash
+        :param process_info: the process information (updated with the snapshot times)
+        :return: success or error message
+        """
+        if not snapshot_enabled:
+            return 'disabled'
+
+        snapshot_path = FileManager.get_snapshot_file_path(dataset_name)
+
+        try:
+            if process_info is not None:
+                process_info.init_snapshot_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+            nodes = 0
+            relationships = 0
+
+            with gzip.open(snapshot_path, 'wt', encoding='utf-8', compresslevel=5) as snapshot_file:
+                header = {"kind": "header", "version": SNAPSHOT_VERSION, "dataset_name": dataset_name,
+                          "config_hash": config_hash,
+                          "created": datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}
+                snapshot_file.write(json.dumps(header) + '\n')
+
+                # 1. The nodes of each label
+                for label in SNAPSHOT_LABELS:
+                    for record in database_connector.stream_query(get_snapshot_nodes_query(label)):
+                        properties, temporal = encode_properties(record['properties'])
+                        row = {"kind": "node", "label": label, "sid": record['sid'], "properties": properties}
+                        if temporal:
+                            row["temporal"] = temporal
+                        snapshot_file.write(json.dumps(row, default=str) + '\n')
+                        nodes += 1
+
+                # 2. The relationships between the labels
+                for source_label in SNAPSHOT_LABELS:
+                    for target_label in SNAPSHOT_LABELS:
+                        query = get_snapshot_relationships_query(source_label, target_label)
+
+                        for record in database_connector.stream_query(query):
+                            properties, _ = encode_properties(record['properties'])
+                            row = {"kind": "relationship", "source_label": source_label,
+                                   "target_label": target_label, "type": record['type'],
+                                   "source": record['source'], "target": record['target'],
+                                   "properties": properties}
+                            snapshot_file.write(json.dumps(row, default=str) + '\n')
+                            relationships += 1
+
+            # 3. Copy the snapshot in the dataset folder
+            result, _ = DockerFileManager.copy_file_to_container(container_id, dataset_name, snapshot_path,
+                                                                 is_snapshot=True)
+
+            if result != 'success':
+                logger.error(f'Error while copy the snapshot on the container: {str(result)}')
+                return result
+
+            if process_info is not None:
+                process_info.finish_snapshot_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+            logger.info(f'Saved the snapshot of {dataset_name}: {nodes} nodes, {relationships} relationships')
+            return 'success'
+
+        except Exception as e:
+            logger.error(f'Error while saving the snapshot: {str(e)}')
+            return f'Error: {e}'
+
+        finally:
+            if snapshot_path.exists():
+                snapshot_path.unlink()
+
+    # Restore the base EKG from the snapshot
+    @staticmethod
+    def restore_graph_s(container_id, database_connector, dataset_name, config_hash, process_info=None):
+        """
+        Restore the base EKG from the dataset snapshot with batched writes (no inference queries).
+        A missing or stale snapshot is not restored, a failed restore is cleaned
+        :param container_id: the container unique id
+        :param database_connector: the database connector
+        :param dataset_name: the dataset name
+        :param config_hash: the dataset configuration hash
+        :param process_info: the process information (updated with the restore times)
+        :return: True if the graph was restored
+        """
+        if not snapshot_enabled:
+            return False
+
+        snapshot_path = FileManager.get_snapshot_file_path(dataset_name)
+        container_snapshot_path = f'/soup/{dataset_name}/{dataset_name}_snapshot.jsonl.gz'
+        init_restore_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+        try:
+            result, _ = DockerFileManager.copy_file_from_container(container_id, container_snapshot_path,
+                                                                   snapshot_path)
+
+            if result != 'success':
+                logger.info(f'No snapshot for {dataset_name}, the graph will be built from the csv files')
+                return False
+
+            with gzip.open(snapshot_path, 'rt', encoding='utf-8') as snapshot_file:
+                header = json.loads(snapshot_file.readline() or '{}')
+
+                if header.get('version') != SNAPSHOT_VERSION or header.get('config_hash') != config_hash:
+                    logger.info(f'The snapshot of {dataset_name} is stale, the graph will be built from the csv files')
+                    return False
+
+                try:
+                    missing_indexes = restore_snapshot_rows(database_connector, snapshot_file)
+                except Exception as e:
+                    logger.error(f'Error while restoring the snapshot, clean the partial graph: {str(e)}')
+                    database_connector.run_query_memgraph(delete_event_graph_query())
+                    database_connector.run_query_memgraph(delete_entity_graph_query())
+                    return False
+
+            if process_info is not None:
+                process_info.restored_from_snapshot = True
+                process_info.missing_indexes = missing_indexes
+                process_info.init_restore_time = init_restore_time
+                process_info.finish_restore_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+            logger.info(f'Restored the graph of {dataset_name} from the snapshot')
+            return True
+
+        except Exception as e:
+            logger.error(f'Error while reading the snapshot: {str(e)}')
+            return False
+
+        finally:
+            if snapshot_path.exists():
+                snapshot_path.unlink()
+
+
+# Restore the snapshot rows (nodes first, then relationships)
+def restore_snapshot_rows(database_connector, snapshot_file):
+    """
+    Restore the nodes and the relationships of the snapshot file with batched writes
+    :param database_connector: the database connector
+    :param snapshot_file: the snapshot file (positioned after the header)
+    :return: the graph indexes that could not be created
+    """
+    missing_indexes = []
+
+    # 1. The graph indexes and the temporary snapshot id indexes
+    for query in create_graph_index_queries() + [create_snapshot_sid_index(label) for label in SNAPSHOT_LABELS]:
+        try:
+            database_connector.run_query_memgraph(query)
+        except Exception as e:
+            # The missing graph indexes are saved in the process info (the lookups fall back to label scans)
+            if query in create_graph_index_queries():
+                missing_indexes.append(query.strip())
+
+            logger.error(f'Unable to create the index ({query}): {str(e)}')
+
+    node_batches = {}
+    relationship_batches = {}
+    nodes_flushed = False
+
+    def flush(batches, key, build_query):
+        batch = batches.pop(key, None)
+        if batch:
+            database_connector.run_batched_write(build_query(key), batch, batch_size=snapshot_batch_size)
+
+    def node_query(key):
+        label, temporal_keys = key
+        return restore_nodes_batch_query(label, dict(temporal_keys))
+
+    def relationship_query(key):
+        return restore_relationships_batch_query(*key)
+
+    # 2. Stream the rows (grouped by label and by relationship type)
+    for line in snapshot_file:
+        row = json.loads(line)
+
+        if row['kind'] == 'node':
+            temporal = row.get('temporal', {})
+            key = (row['label'], tuple(sorted((name, value[0]) for name, value in temporal.items())))
+            node_batches.setdefault(key, []).append({
+                "sid": row['sid'],
+                "properties": row['properties'],
+                "temporal": {name: value[1] for name, value in temporal.items()}
+            })
+
+            if len(node_batches[key]) >= snapshot_batch_size:
+                flush(node_batches, key, node_query)
+
+        elif row['kind'] == 'relationship':
+            # The relationships need every node
+            if not nodes_flushed:
+                for key in list(node_batches.keys()):
+                    flush(node_batches, key, node_query)
+                nodes_flushed = True
+
+            key = (row['source_label'], row['target_label'], row['type'])
+            relationship_batches.setdefault(key, []).append({
+                "source": row['source'], "target": row['target'], "properties": row['properties']
+            })
+
+            if len(relationship_batches[key]) >= snapshot_batch_size:
+                flush(relationship_batches, key, relationship_query)
+
+    for key in list(node_batches.keys()):
+        flush(node_batches, key, node_query)
+
+    for key in list(relationship_batches.keys()):
+        flush(relationship_batches, key, relationship_query)
+
+    # 3. Remove the temporary snapshot ids
+    for label in SNAPSHOT_LABELS:
+        database_connector.run_query_memgraph(remove_snapshot_sid_query(label))
+
+        try:
+            database_connector.run_query_memgraph(drop_snapshot_sid_index(label))
+        except Exception as e:
+            logger.warning(f'Unable to drop the snapshot id index: {str(e)}')
+
+    return missing_indexes
+
+
+# Encode the node or relationship properties for JSON
+def encode_properties(properties):
+    """
+    Split the properties in JSON values and temporal values
+    :param properties: the properties
+    :return: the JSON properties and the temporal properties ({key: [cypher function, iso value]})
+    """
+    values = {}
+    temporal = {}
+
+    for key, value in properties.items():
+        if isinstance(value, DateTime):
+            function = 'localDateTime' if value.tzinfo is None else 'dateTime'
+            temporal[key] = [function, value.to_native().isoformat()]
+        elif isinstance(value, Date):
+            temporal[key] = ['date', value.to_native().isoformat()]
+        elif isinstance(value, Time):
+            temporal[key] = ['localTime', value.to_native().isoformat()]
+        elif isinstance(value, Duration):
+            temporal[key] = ['duration', value.iso_format()]
+        else:
+            values[key] = value
+
+    return values, temporal
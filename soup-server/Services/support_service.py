@@ -11,10 +11,12 @@ License : MIT
 """
 
 # Import
-import math
+import json
 
+from functools import lru_cache
+from flask import Response, stream_with_context
 from neo4j.time import DateTime
-from Shared.support_config import memgraph_datetime_to_string
+from Shared.support_config import memgraph_datetime_to_string, get_next_cursor
 from Models.logger_model import Logger
 
 # Engine logger setup
@@ -30,41 +32,17 @@ class SupportService:
         unique_nodes = set()
         unique_edges = set()
 
+        # Each node is sanitized once for the response (it is shared by all its edges)
+        memo = {}
+
         for record in data:
-            # Node source
-            source = record['source']
-            source['id'] = record['source_id']
-
-            # Relationship
-            edge = record['edge']
-            edge['id'] = record['edge_id']
-
-            # Node target
-            target = record['target']
-            target['id'] = record['target_id']
-
-            # Correct the info
-            for key, value in source.items():
-                if isinstance(value, (int, float)) and math.isnan(value):
-                    source[key] = None
-                elif isinstance(value, DateTime):
-                    source[key] = memgraph_datetime_to_string(value)
-
-            for key, value in target.items():
-                if isinstance(value, (int, float)) and math.isnan(value):
-                    target[key] = None
-                elif isinstance(value, DateTime):
-                    target[key] = memgraph_datetime_to_string(value)
-
-            unique_nodes.add(str(source['id']))
-            unique_nodes.add(str(target['id']))
-            unique_edges.add(str(edge['id']))
-
-            graph_data.append({
-                'node_source': source,
-                'edge': edge,
-                'node_target': target
-            })
+            graph_record = SupportService.extract_graph_record(record, memo)
+
+            unique_nodes.add(str(graph_record['node_source']['id']))
+            unique_nodes.add(str(graph_record['node_target']['id']))
+            unique_edges.add(str(graph_record['edge']['id']))
+
+            graph_data.append(graph_record)
 
         return {
             'graph_data': graph_data,
@@ -72,22 +50,163 @@ class SupportService:
             'unique_edges_count': len(unique_edges)
         }
 
+    @staticmethod
+    def extract_graph_record(record, memo=None):
+        # Node source
+        source = SupportService.sanitize_node(record['source'], record['source_id'], memo)
+        source['id'] = record['source_id']
+
+        # Relationship
+        edge = record['edge']
+        edge['id'] = record['edge_id']
+
+        # Node target
+        target = SupportService.sanitize_node(record['target'], record['target_id'], memo)
+        target['id'] = record['target_id']
+
+        return {
+            'node_source': source,
+            'edge': edge,
+            'node_target': target
+        }
+
+    @staticmethod
+    def format_graph_data(graph_data, graph_format):
+        """
+        Deduplicate the nodes of the graph data: each node is sent once in the nodes map (node id to properties).
+        The normalized edges are [source id, target id, edge id, properties], the columnar edges are parallel arrays
+        :param graph_data: the graph data (the source, edge, target triples)
+        :param graph_format: the format (triples, normalized or columnar)
+        :return: the formatted graph data (the triples are returned unchanged)
+        """
+        if graph_format not in ['normalized', 'columnar']:
+            return graph_data
+
+        nodes = {}
+        edges = [] if graph_format == 'normalized' else {'source': [], 'target': [], 'id': [], 'properties': []}
+
+        for graph_record in graph_data:
+            source, edge, target = graph_record['node_source'], graph_record['edge'], graph_record['node_target']
+
+            if source['id'] not in nodes:
+                nodes[source['id']] = without_id(source)
+
+            if target['id'] not in nodes:
+                nodes[target['id']] = without_id(target)
+
+            if graph_format == 'normalized':
+                edges.append([source['id'], target['id'], edge['id'], without_id(edge)])
+            else:
+                edges['source'].append(source['id'])
+                edges['target'].append(target['id'])
+                edges['id'].append(edge['id'])
+                edges['properties'].append(without_id(edge))
+
+        return {
+            'format': graph_format,
+            'nodes': nodes,
+            'edges': edges
+        }
+
     @staticmethod
     def extract_class_graph_data(data):
-        graph_data = []
+        return [sanitize_properties(record['node']) for record in data]
+
+    @staticmethod
+    def extract_relationship_record(record, key, relation_id, memo=None):
+        # The relationship is received as (source properties, type, target properties)
+        relation = record[key]
+
+        return {
+            'event': SupportService.sanitize_node(relation[0], record.get('source_id'), memo),
+            'relation_type': relation[1],
+            'related_event': SupportService.sanitize_node(relation[2], record.get('target_id'), memo),
+            'relation_id': relation_id
+        }
+
+    @staticmethod
+    def sanitize_node(properties, node_id=None, memo=None):
+        """
+        Sanitize the node properties for JSON (NaN to None, temporal values to string).
+        With the memo, the node already sanitized for the response is reused
+        :param properties: the node properties
+        :param node_id: the node id (the memo key)
+        :param memo: the per-response memo (node id to sanitized properties)
+        :return: the sanitized properties
+        """
+        if memo is None or node_id is None:
+            return sanitize_properties(properties)
+
+        sanitized = memo.get(node_id)
+
+        if sanitized is None:
+            sanitized = memo[node_id] = sanitize_properties(properties)
+
+        return sanitized
+
+    @staticmethod
+    def ndjson_response(records, extract_record, page_size=None):
+        """
+        Stream the records as NDJSON (one JSON object for each line) while they come off the connector.
+        The last line is the trailer with the records count (and the next cursor for the paginated requests)
+        :param records: the records generator
+        :param extract_record: the function that receives the record and its position and returns the line object
+        :param page_size: the page size (None if the request is not paginated)
+        :return: the streaming response
+        """
+
+        def generate():
+            count = 0
+            last_cursor = None
+
+            try:
+                for record in records:
+                    count += 1
+                    last_cursor = record.get('cursor')
+                    yield json.dumps(extract_record(record, count), default=str) + '\n'
+
+                trailer = {'end': True, 'count': count}
+
+                if page_size:
+                    trailer['next_cursor'] = get_next_cursor(last_cursor, count, page_size)
+
+                yield json.dumps(trailer) + '\n'
+
+            except Exception as e:
+                # The status is already sent, so the error is the last line
+                logger.error(f'Internal Server Error while streaming: {str(e)}')
+                yield json.dumps({'end': True, 'count': count, 'error': str(e)}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# Copy the properties without the id (it is already the node key or in the edge entry)
+def without_id(properties):
+    return {key: value for key, value in properties.items() if key != 'id'}
+
+
+# Get the keys converted with memgraph_datetime_to_string (computed once for each properties schema)
+@lru_cache(maxsize=1024)
+def get_timestamp_keys(keys):
+    return frozenset(key for key in keys if 'Timestamp' in key)
 
-        for record in data:
-            event_node = record['node']
 
-            for key, value in event_node.items():
-                if 'Timestamp' in key:
-                    timestamp = memgraph_datetime_to_string(value)
-                    event_node[key] = timestamp
+# Sanitize the properties in place
+def sanitize_properties(properties):
+    """
+    Replace the NaN values with None and the temporal values with their string in a single pass
+    :param properties: the properties
+    :return: the properties
+    """
+    timestamp_keys = get_timestamp_keys(tuple(properties))
 
-            for key, value in event_node.items():
-                if isinstance(value, (int, float)) and math.isnan(value):
-                    event_node[key] = None
+    for key, value in properties.items():
+        value_type = type(value)
 
-            graph_data.append(event_node)
+        if value_type is float:
+            if value != value:
+                properties[key] = None
+        elif value_type is DateTime or (key in timestamp_keys and value is not None and value_type is not str):
+            properties[key] = memgraph_datetime_to_string(value)
 
-        return graph_data
+    return properties
@@ -0,0 +1,157 @@
+"""
+------------------------------------------------------------------------
+File : response_compression.py
+Description: HTTP response compression (gzip, brotli and zstd)
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import zlib
+
+from flask import request
+from Shared.support_config import compression_enabled, compression_min_size, compression_gzip_level, \
+    compression_brotli_quality, compression_zstd_level
+from Models.logger_model import Logger
+
+# Brotli and zstd are optional (gzip is always available)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Engine logger setup
+logger = Logger()
+
+# The compressed mimetypes (the binary formats, e.g. Parquet, are already compressed)
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'application/vnd.apache.arrow.stream',
+                          'text/plain', 'text/html', 'text/csv'}
+
+
+# Register the response compression
+def init_response_compression(app):
+    """
+    Compress the responses with the best encoding accepted by the client (zstd, brotli, gzip).
+    The buffered responses are compressed when bigger than the min size and have the
+    X-Uncompressed-Size and X-Compressed-Size headers, the streamed responses are compressed chunk by chunk
+    :param app: the Flask app
+    """
+    if compression_enabled:
+        app.after_request(compress_response)
+
+
+# Compress the response (after request)
+def compress_response(response):
+    encoding = get_response_encoding(response)
+
+    if encoding is None:
+        return response
+
+    # The content depends on the Accept-Encoding header (caches)
+    response.vary.add('Accept-Encoding')
+
+    if response.is_streamed:
+        # The size is not known before the end of the stream, so the stream is always compressed
+        response.response = compress_stream(response.response, encoding)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    data = response.get_data()
+
+    if len(data) < compression_min_size:
+        return response
+
+    compressed_data = compress_data(data, encoding)
+
+    response.set_data(compressed_data)
+    response.headers['Content-Encoding'] = encoding
+    response.headers['X-Uncompressed-Size'] = str(len(data))
+    response.headers['X-Compressed-Size'] = str(len(compressed_data))
+    return response
+
+
+# Get the encoding of the response (None if the response is not compressed)
+def get_response_encoding(response):
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code == 204:
+        return None
+
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+
+    return request.accept_encodings.best_match(get_available_encodings())
+
+
+# Get the available encodings (server preference order)
+def get_available_encodings():
+    encodings = []
+
+    if zstandard is not None:
+        encodings.append('zstd')
+
+    if brotli is not None:
+        encodings.append('br')
+
+    encodings.append('gzip')
+    return encodings
+
+
+# Get a new compressor: (compress function, sync flush function, finish function)
+def get_compressor(encoding):
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=compression_zstd_level).compressobj()
+        return (compressor.compress, lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                compressor.flush)
+
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=compression_brotli_quality)
+        return compressor.process, compressor.flush, compressor.finish
+
+    # gzip (wbits 31 writes the gzip header and trailer)
+    compressor = zlib.compressobj(compression_gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+# Compress the data
+def compress_data(data, encoding):
+    compress, _, finish = get_compressor(encoding)
+    return compress(data) + finish()
+
+
+# Compress the stream chunk by chunk (each chunk is flushed, so the client can decode it before the end)
+def compress_stream(chunks, encoding):
+    compress, sync_flush, finish = get_compressor(encoding)
+    uncompressed_size = 0
+    compressed_size = 0
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+
+            uncompressed_size += len(chunk)
+            compressed_chunk = compress(chunk) + sync_flush()
+
+            if compressed_chunk:
+                compressed_size += len(compressed_chunk)
+                yield compressed_chunk
+
+        compressed_chunk = finish()
+        compressed_size += len(compressed_chunk)
+        yield compressed_chunk
+
+        logger.debug(f'Streamed response compressed ({encoding}): {uncompressed_size} -> {compressed_size} bytes')
+
+    finally:
+        # Close the wrapped stream (e.g. the Memgraph session of the streamed records)
+        if hasattr(chunks, 'close'):
+            chunks.close()
@@ -19,10 +19,56 @@ from Models.memgraph_connector_model import MemgraphConnector
 # Context variables
 debug = False
 
+# Memgraph connection pool configuration
+memgraph_pool_size = int(os.getenv("MEMGRAPH_POOL_SIZE", 50))
+memgraph_acquisition_timeout = float(os.getenv("MEMGRAPH_ACQUISITION_TIMEOUT", 30))
+memgraph_liveness_check_timeout = float(os.getenv("MEMGRAPH_LIVENESS_CHECK_TIMEOUT", 30))
+memgraph_max_connection_lifetime = float(os.getenv("MEMGRAPH_MAX_CONNECTION_LIFETIME", 3600))
+
+# Number of csv rows read for each chunk (entity extraction)
+csv_chunk_size = int(os.getenv("SOUP_CSV_CHUNK_SIZE", 100000))
+
+# The Event and Entity nodes loader ("database" runs LOAD CSV in Memgraph, "engine" reads the csv
+# in the Engine and sends the rows with batched UNWIND writes)
+node_loader = os.getenv("SOUP_NODE_LOADER", "database")
+node_batch_size = int(os.getenv("SOUP_NODE_BATCH_SIZE", 10000))
+
+# The :DF relationships builder ("database" runs the Cypher query, "engine" sorts and pairs the events in the Engine)
+df_engine = os.getenv("SOUP_DF_ENGINE", "database")
+df_batch_size = int(os.getenv("SOUP_DF_BATCH_SIZE", 10000))
+
+# Concurrent workers (sessions) used to build the :CORR and :DF relationships of each entity type
+build_workers = int(os.getenv("SOUP_BUILD_WORKERS", min(8, os.cpu_count() or 1)))
+build_max_retries = int(os.getenv("SOUP_BUILD_MAX_RETRIES", 5))
+
+# Snapshot of the base EKG (saved after a full build and restored by the next builds of the dataset)
+snapshot_enabled = os.getenv("SOUP_SNAPSHOT_ENABLED", "1").lower() not in ("0", "false", "no")
+snapshot_batch_size = int(os.getenv("SOUP_SNAPSHOT_BATCH_SIZE", 10000))
+
+# Keyset pagination of the graph, nodes and relationships endpoints
+page_size_default = int(os.getenv("SOUP_PAGE_SIZE", 1000))
+page_size_max = int(os.getenv("SOUP_PAGE_SIZE_MAX", 10000))
+
+# Columnar export (Arrow IPC stream or Parquet): number of records for each record batch (row group)
+export_batch_size = int(os.getenv("SOUP_EXPORT_BATCH_SIZE", 50000))
+
+# HTTP response compression (gzip, brotli and zstd when installed) of the responses bigger than the min size
+compression_enabled = os.getenv("SOUP_COMPRESSION_ENABLED", "1").lower() not in ("0", "false", "no")
+compression_min_size = int(os.getenv("SOUP_COMPRESSION_MIN_SIZE", 1024))
+compression_gzip_level = int(os.getenv("SOUP_COMPRESSION_GZIP_LEVEL", 6))
+compression_brotli_quality = int(os.getenv("SOUP_COMPRESSION_BROTLI_QUALITY", 5))
+compression_zstd_level = int(os.getenv("SOUP_COMPRESSION_ZSTD_LEVEL", 3))
+
+# Folder of the backups saved by the Engine (the downloads are streamed)
+backup_folder = os.getenv("SOUP_BACKUP_FOLDER", "/tmp")
+
+# Graph payload formats (triples: one entry for each edge with the full source and target nodes)
+graph_formats = ('triples', 'normalized', 'columnar')
+
 
 def get_db_connector():
     """
-    Get the database configuration
+    Get the database configuration. Every connector shares the same process-wide pooled driver
     :return: ApiResponse model
     """
 
@@ -30,16 +76,70 @@ def get_db_connector():
         memgraph_host = os.getenv("MEMGRAPH_HOST", "memgraph")
         memgraph_port = int(os.getenv("MEMGRAPH_PORT", 7687))
         uri_mem = f'bolt://{memgraph_host}:{memgraph_port}'
-        auth_mem = ("", "")
-        database_connector = MemgraphConnector(uri_mem, auth_mem)
     else:
         uri_mem = 'bolt://localhost:7687'
-        auth_mem = ("", "")
-        database_connector = MemgraphConnector(uri_mem, auth_mem)
+
+    auth_mem = ("", "")
+    database_connector = MemgraphConnector(uri_mem, auth_mem,
+                                           max_connection_pool_size=memgraph_pool_size,
+                                           connection_acquisition_timeout=memgraph_acquisition_timeout,
+                                           liveness_check_timeout=memgraph_liveness_check_timeout,
+                                           max_connection_lifetime=memgraph_max_connection_lifetime)
 
     return database_connector
 
 
+def get_page_parameters(args):
+    """
+    Get the keyset pagination parameters (the after and page_size query arguments)
+    :param args: the request arguments
+    :return: the cursor and the page size (None, None if the request is not paginated)
+    """
+
+    after = args.get('after', type=int)
+    page_size = args.get('page_size', type=int)
+
+    if after is None and page_size is None:
+        return None, None
+
+    page_size = min(max(page_size or page_size_default, 1), page_size_max)
+    return after, page_size
+
+
+def get_graph_format(args):
+    """
+    Get the graph payload format (the format query argument): triples (default), normalized or columnar
+    :param args: the request arguments
+    :return: the graph format (triples for the unknown formats)
+    """
+
+    graph_format = args.get('format', default='triples', type=str)
+    return graph_format if graph_format in graph_formats else 'triples'
+
+
+def is_ndjson_request(request):
+    """
+    Check if the client asked for the streaming NDJSON response (Accept header or stream=ndjson query argument)
+    :param request: the request
+    :return: True for the NDJSON response
+    """
+
+    return (request.args.get('stream', type=str) == 'ndjson'
+            or 'application/x-ndjson' in request.headers.get('Accept', ''))
+
+
+def get_next_cursor(last_cursor, records_count, page_size):
+    """
+    Get the cursor of the next page
+    :param last_cursor: the cursor of the last record
+    :param records_count: the number of records of the page
+    :param page_size: the page size
+    :return: the cursor (None if it is the last page)
+    """
+
+    return last_cursor if records_count == page_size else None
+
+
 def string_to_datetime(timestamp_str):
     """
     Convert a string to datetime
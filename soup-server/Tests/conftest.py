@@ -0,0 +1,17 @@
+"""
+------------------------------------------------------------------------
+File : conftest.py
+Description: Pytest configuration (the Engine modules are imported from the soup-server folder)
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
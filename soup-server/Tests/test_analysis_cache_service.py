@@ -0,0 +1,53 @@
+"""
+------------------------------------------------------------------------
+File : test_analysis_cache_service.py
+Description: Tests of the analysis results cache keys
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import copy
+
+from Services.analysis_cache_service import AnalysisCacheService
+
+DATASET_CONFIG = {
+    'dataset_name': 'orders',
+    'dataset_description': 'Orders log',
+    'all_columns': ['case', 'activity', 'timestamp', 'item'],
+    'standard_columns': ['case', 'activity', 'timestamp'],
+    'filtered_columns': ['item'],
+    'values_columns': ['case', 'item'],
+    'trigger_target_rows': [],
+    'date_created': '2026-10-18T10:00:00.000',
+    'date_modified': '2026-10-18T10:00:00.000',
+    'process_info': {'init_time': '2026-10-18T10:00:00.000'}
+}
+
+ANALYSIS = {'analysis_name': 'frequent', 'frequence': [{'entity': 'case', 'operator': '>=', 'frequency': 5}]}
+
+
+# A build (process information and dates) does not change the key
+def test_cache_key_ignores_build_information():
+    rebuilt_config = copy.deepcopy(DATASET_CONFIG)
+    rebuilt_config['date_modified'] = '2026-10-19T08:30:00.000'
+    rebuilt_config['dataset_description'] = 'Orders log (updated)'
+    rebuilt_config['process_info'] = {'init_time': '2026-10-19T08:30:00.000'}
+
+    assert AnalysisCacheService.get_cache_key_s(DATASET_CONFIG, ANALYSIS) == \
+        AnalysisCacheService.get_cache_key_s(rebuilt_config, dict(ANALYSIS, analysis_name='renamed'))
+
+
+# The graph configuration fields and the filters change the key
+def test_cache_key_depends_on_graph_configuration():
+    changed_config = copy.deepcopy(DATASET_CONFIG)
+    changed_config['values_columns'] = ['case']
+
+    key = AnalysisCacheService.get_cache_key_s(DATASET_CONFIG, ANALYSIS)
+
+    assert AnalysisCacheService.get_cache_key_s(changed_config, ANALYSIS)[:32] != key[:32]
+    assert AnalysisCacheService.get_cache_key_s(DATASET_CONFIG, dict(ANALYSIS, frequence=[]))[32:] != key[32:]
@@ -0,0 +1,59 @@
+"""
+------------------------------------------------------------------------
+File : test_df_relation_service.py
+Description: Tests of the :DF relationships builders
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from Services.Graph.df_relation_service import DfRelationService
+
+
+# Connector of an in-memory EKG: the (event, entity, timestamp) tuples and the written :DF relationships
+class InMemoryConnector:
+
+    # Init model
+    def __init__(self, tuples):
+        self.tuples = tuples
+        self.relationships = []
+
+    # Stream the event tuples of the entity type
+    def stream_query(self, query, params=None):
+        return iter(self.tuples)
+
+    # Write the :DF relationships (MERGE writes a relationship only if the same one does not exist)
+    def run_batched_write(self, query, rows, batch_size=10000, parameters=None):
+        rows = list(rows)
+
+        for row in rows:
+            relationship = (row['source'], row['target'], parameters['type'], row['entity_id'])
+
+            if ' CREATE ' in f' {query} ' or relationship not in self.relationships:
+                self.relationships.append(relationship)
+
+        return {'rows': len(rows)}
+
+
+# Running the engine builder again on a built entity type does not change the :DF relationships
+def test_engine_df_relations_are_idempotent():
+    tuples = [
+        {'event_id': 1, 'entity_id': 'o1', 'timestamp': 10},
+        {'event_id': 2, 'entity_id': 'o1', 'timestamp': 20},
+        {'event_id': 3, 'entity_id': 'o1', 'timestamp': 30},
+        {'event_id': 4, 'entity_id': 'o2', 'timestamp': 15},
+        {'event_id': 5, 'entity_id': 'o2', 'timestamp': 25}
+    ]
+    database_connector = InMemoryConnector(tuples)
+
+    DfRelationService.create_df_relations_s(database_connector, 'Order', engine='engine')
+    relationships = list(database_connector.relationships)
+
+    DfRelationService.create_df_relations_s(database_connector, 'Order', engine='engine')
+
+    assert len(relationships) == 3
+    assert database_connector.relationships == relationships
@@ -0,0 +1,45 @@
+"""
+------------------------------------------------------------------------
+File : test_export_service.py
+Description: Tests of the columnar export types
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import pytest
+
+from Services.export_service import get_export_columns, get_property_types, to_column_value, to_record_batch, pa
+
+# The records of two batches: the later values need wider types than the first batch
+FIRST_BATCH = [{'id': 1, 'properties': {'cost': 10, 'flag': True}},
+               {'id': 2, 'properties': {'cost': 12, 'flag': False}}]
+SECOND_BATCH = [{'id': 3, 'properties': {'cost': 12.5, 'flag': 'unknown', 'late': 'yes'}}]
+
+
+# The types are widened with the values of all the batches and no value is lost
+def test_property_types_are_widened_on_all_the_records():
+    keys = ['cost', 'flag', 'late']
+    columns = get_export_columns(keys, get_property_types(FIRST_BATCH + SECOND_BATCH, keys), False)
+    schema = pa.schema([(name, column_type) for name, _, column_type in columns])
+
+    assert schema.field('cost').type == pa.float64()
+    assert schema.field('flag').type == pa.string()
+    assert schema.field('late').type == pa.string()
+
+    table = pa.Table.from_batches([to_record_batch(FIRST_BATCH, columns, schema),
+                                   to_record_batch(SECOND_BATCH, columns, schema)])
+
+    assert table.column('cost').to_pylist() == [10.0, 12.0, 12.5]
+    assert table.column('flag').to_pylist() == ['True', 'False', 'unknown']
+    assert table.column('late').to_pylist() == [None, None, 'yes']
+
+
+# A value that does not fit the column is an error
+def test_value_that_does_not_fit_the_column_is_an_error():
+    with pytest.raises(ValueError):
+        to_column_value(12.5, pa.int64())
@@ -0,0 +1,25 @@
+"""
+------------------------------------------------------------------------
+File : test_filter_query_lib.py
+Description: Tests of the filter query library
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from Utils.filter_query_lib import filter_activity_frequency
+
+
+# The activity frequency query keeps the Cypher map literals of the inferred DF relationships
+def test_filter_activity_frequency_query():
+    query, parameters = filter_activity_frequency('Order', '>=', 5)
+
+    assert 'MERGE (prev)-[:DF {Inferred: true}]->(next)' in query
+    assert 'MATCH (e:Event)-[:CORR]->(t:Entity {Type: $ent_type})' in query
+    assert 'WHERE SIZE(Events) >= $frequency' in query
+    assert '{{' not in query and '}}' not in query
+    assert parameters == {'ent_type': 'Order', 'frequency': 5}
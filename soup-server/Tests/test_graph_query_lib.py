@@ -0,0 +1,26 @@
+"""
+------------------------------------------------------------------------
+File : test_graph_query_lib.py
+Description: Tests of the graph query library
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from Utils.graph_query_lib import load_event_node_query, load_entity_node_query
+
+# A dataset name with a quote
+CSV_PATH = "/soup/o'hare/o'hare.csv"
+
+
+# The event and entity loads escape the csv location in the same way
+def test_load_queries_escape_the_csv_location():
+    event_query, _ = load_event_node_query(CSV_PATH, 'case', 'timestamp', 'activity', [])
+    entity_query = load_entity_node_query(CSV_PATH.replace('.csv', '_entity.csv'))
+
+    assert event_query.startswith("LOAD CSV FROM '/soup/o\\'hare/o\\'hare.csv' WITH HEADER AS row ")
+    assert entity_query.startswith("LOAD CSV FROM '/soup/o\\'hare/o\\'hare_entity.csv' WITH HEADER AS row ")
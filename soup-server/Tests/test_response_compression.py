@@ -0,0 +1,49 @@
+"""
+------------------------------------------------------------------------
+File : test_response_compression.py
+Description: Tests of the HTTP response compression
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+import json
+import zlib
+import pytest
+
+from Shared.response_compression import compress_stream, get_available_encodings, brotli, zstandard
+
+
+# Get a streaming decompressor of the encoding: (decompress function)
+def get_decompressor(encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+
+    if encoding == 'br':
+        return brotli.Decompressor().process
+
+    return zlib.decompressobj(31).decompress
+
+
+# Each streamed chunk can be decoded before the generator is exhausted
+@pytest.mark.parametrize('encoding', get_available_encodings())
+def test_compress_stream_flushes_each_chunk(encoding):
+    lines = [json.dumps({'id': index, 'ActivityName': f'Activity {index % 7}'}) + '\n' for index in range(2000)]
+    batches = [''.join(lines[start:start + 500]) for start in range(0, len(lines), 500)]
+
+    stream = compress_stream(iter(batches), encoding)
+    decompress = get_decompressor(encoding)
+    received = b''
+
+    for batch in batches:
+        received += decompress(next(stream))
+        assert received.endswith(batch.encode('utf-8'))
+
+    for compressed_chunk in stream:
+        received += decompress(compressed_chunk)
+
+    assert received == ''.join(batches).encode('utf-8')
@@ -10,17 +10,21 @@ License : MIT
 ------------------------------------------------------------------------
 """
 
+# Import
+from Utils.general_query_lib import check_property_key, check_relationship_type, check_number, get_page_query
+
 
 # ---------- Standard queries ----------
 
 def create_class_multi_query(matching_perspectives):
     """
     Create aggregate multi graph query
-    :param matching_perspectives: the perspectives to match
-    :return: the complete query
+    :param matching_perspectives: the perspectives to match (validated, they stay in the query text)
+    :return: the complete query and the parameters
     """
 
     class_type = "Class"
+    matching_perspectives = [check_property_key(p) for p in matching_perspectives]
 
     # Event_Id based on matching_perspectives
     event_id_parts = [f'{p.lower()}' for p in matching_perspectives]
@@ -28,7 +32,7 @@ def create_class_multi_query(matching_perspectives):
 
     perspectives_dict = {p: f"{p.lower()}" for p in matching_perspectives}
     perspectives_dict["Event_Id"] = event_id
-    perspectives_dict["Type"] = f'"{class_type}"'
+    perspectives_dict["Type"] = "$class_type"
 
     # get unique vlaues / p.lower() is the variable name
     class_properties = ", ".join([f"{key}: {value}" for key, value in perspectives_dict.items()])
@@ -38,33 +42,34 @@ def create_class_multi_query(matching_perspectives):
     class_creation = f"MERGE (c:Class {{{class_properties}}})"
 
     # retrieve events 
-    match_events = "MATCH (e:Event {" + ", ".join([f"{p}: {p.lower()}" for p in matching_perspectives]) + "})"
+    match_events = ("MATCH (e:Event {" + ", ".join([f"{p}: {p.lower()}" for p in matching_perspectives]) + "})"
+                    "\nWHERE NOT e:FilteredOut")
 
     # infer OBS relationship 
     merge_relationship = "MERGE (e)-[:OBSERVED]->(c)"
 
     # create final query
-    main_query = f"MATCH (e:Event)\n{with_distinct}\n{class_creation}\nWITH c, " + ", ".join(
+    main_query = f"MATCH (e:Event)\nWHERE NOT e:FilteredOut\n{with_distinct}\n{class_creation}\nWITH c, " + ", ".join(
         [f"{p.lower()}" for p in matching_perspectives]) + "\n"
     main_query += f"{match_events}\n{merge_relationship}"
-    return main_query
+    return main_query, {'class_type': class_type}
 
 
 def class_df_aggregation(rel_type, class_rel_type):
     """
     Create direct follow aggregation query
     :param rel_type: the type
-    :param class_rel_type: the class relation tye
-    :return: the complete query
+    :param class_rel_type: the class relation type (validated, it stays in the query text)
+    :return: the complete query and the parameters
     """
 
     return f"""
             MATCH (c1 : Class) <-[:OBSERVED]- (e1 : Event) 
             -[r]-> (e2 : Event) -[:OBSERVED]-> (c2 : Class)
-            WHERE c1.Type = c2.Type and type(r) = '{rel_type}'
+            WHERE c1.Type = c2.Type and type(r) = $rel_type AND NOT e1:FilteredOut AND NOT e2:FilteredOut
             WITH r.Type as CType, c1, count(r) AS df_freq, c2
-            MERGE (c1) -[:{class_rel_type} {{Type:CType, edge_weight: df_freq}}]-> (c2)
-            """
+            MERGE (c1) -[:{check_relationship_type(class_rel_type)} {{Type:CType, edge_weight: df_freq}}]-> (c2)
+            """, {'rel_type': check_relationship_type(rel_type)}
 
 
 # ---------- Util queries ----------
@@ -78,6 +83,17 @@ def get_nodes_class_query():
     return "MATCH (e:Class) RETURN e AS node"
 
 
+def get_nodes_class_page_query(after, page_size):
+    """
+    Get a page of class nodes
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+
+    return get_page_query("(e:Class)", None, "id(e)", "e AS node", after, page_size)
+
+
 def get_count_nodes_class_query():
     """
     Get all class nodes count
@@ -93,7 +109,20 @@ def get_obs_relation_query():
     :return: the query
     """
 
-    return "MATCH (e:Event)-[obs:OBSERVED]->(c:Class) RETURN e, obs, c"
+    return ("MATCH (e:Event)-[obs:OBSERVED]->(c:Class) "
+            "RETURN e, obs, c, id(e) AS source_id, id(c) AS target_id")
+
+
+def get_obs_relation_page_query(after, page_size):
+    """
+    Get a page of observation relations
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+
+    return get_page_query("(e:Event)-[obs:OBSERVED]->(c:Class)", None, "id(obs)",
+                          "e, obs, c, id(e) AS source_id, id(c) AS target_id", after, page_size)
 
 
 def get_count_obs_relationships_query():
@@ -111,7 +140,20 @@ def get_dfc_relation_query():
     :return: the query
     """
 
-    return "MATCH (c1:Class)-[dfc:DF_C]->(c2:Class) RETURN c1, dfc, c2"
+    return ("MATCH (c1:Class)-[dfc:DF_C]->(c2:Class) "
+            "RETURN c1, dfc, c2, id(c1) AS source_id, id(c2) AS target_id")
+
+
+def get_dfc_relation_page_query(after, page_size):
+    """
+    Get a page of dfc relations
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+
+    return get_page_query("(c1:Class)-[dfc:DF_C]->(c2:Class)", None, "id(dfc)",
+                          "c1, dfc, c2, id(c1) AS source_id, id(c2) AS target_id", after, page_size)
 
 
 def get_count_dfc_relationships_query():
@@ -136,19 +178,32 @@ def get_complete_class_graph_query():
             """)
 
 
+def get_page_class_graph_query(after, page_size):
+    """
+    Get a page of the class graph (ordered by the DF_C relationship id)
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+
+    return get_page_query("(c1:Class)-[r:DF_C]->(c2:Class)", None, "id(r)",
+                          "c1 as source, id(c1) as source_id, properties(r) as edge, "
+                          "id(r) as edge_id, c2 as target, id(c2) as target_id", after, page_size)
+
+
 def get_limit_class_graph_query(limit):
     """
     Get complete class graph with limit query
     :param limit: the limit
-    :return: the complete query
+    :return: the complete query and the parameters
     """
 
-    return (f"""
+    return ("""
             MATCH (c1:Class)-[r:DF_C]->(c2:Class)
             RETURN c1 as source, id(c1) as source_id, properties(r) as edge, 
             id(r) as edge_id, c2 as target, id(c2) as target_id
-            LIMIT {limit}
-            """)
+            LIMIT $limit
+            """), {'limit': int(check_number(limit))}
 
 
 def set_class_weight():
@@ -10,6 +10,20 @@ License : MIT
 ------------------------------------------------------------------------
 """
 
+# Causal node types (they are written inside the query text)
+CAUSAL_NODE_TYPES = {'confounder', 'collider'}
+
+
+def check_causal_node_type(node_type):
+    """
+    Validate the causal node type
+    :param node_type: the node type
+    :return: the node type
+    """
+    if node_type not in CAUSAL_NODE_TYPES:
+        raise ValueError(f"Invalid causal node type: {node_type}")
+    return node_type
+
 
 def reveal_causal_rels(trigger, target):
     confounder_q = find_causal_node(trigger, target, 'confounder')
@@ -24,18 +38,19 @@ def reveal_causal_rels(trigger, target):
 
     trigger_q = set_trigger_df(trigger)
 
+    # Every item is a (query, parameters) pair
     queries = [confounder_q, confounder_rel_q, collider_q, collider_rel_q, target_q, trigger_q]
     return queries
 
 
 def find_causal_node(trigger, target, node_type):
+    relation = check_causal_node_type(node_type)
     direction = '>' if node_type == 'collider' else '<'
-    relation = node_type
     orderby = 'ASC' if node_type == 'collider' else 'DESC'
 
     return (f"""
-           MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
-            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {{Type: "{target}"}})
+           MATCH (e:Event)-[:CORR]->(a:Entity {{Type: $trigger}})
+            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {{Type: $target}})
             WITH a, b, e
             ORDER BY e.Timestamp
             WITH a, b, COLLECT(e) AS event_list, MIN(toString(e.Timestamp)) AS min_timestamp
@@ -57,21 +72,21 @@ def find_causal_node(trigger, target, node_type):
             WITH a, fe ORDER BY fe.Timestamp {orderby}
             WITH a, collect(fe) AS fee
             WITH a, fee[0] AS {relation}_node
-            SET {relation}_node.relation = '{relation}'
+            SET {relation}_node.relation = $relation
            """
-            )
+            ), {'trigger': trigger, 'target': target, 'relation': relation}
 
 
 def set_causal_rels(trigger, target, node_type):
+    relation = check_causal_node_type(node_type)
     direction = '>' if node_type == 'collider' else '<'
-    relation = node_type
     orderby = 'DESC' if node_type == 'collider' else 'ASC'
     connection = ['<-', '-'] if node_type == 'collider' else ['-', '->']
 
     return (f"""
-        MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
-        WHERE e.relation = '{relation}'
-        MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {{Type: "{target}"}})
+        MATCH (e:Event)-[:CORR]->(a:Entity {{Type: $trigger}})
+        WHERE e.relation = $relation
+        MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {{Type: $target}})
         WITH e, a, b, e1
         ORDER BY e1.Timestamp {orderby}
         WITH DISTINCT b, a, e1, e
@@ -81,43 +96,43 @@ def set_causal_rels(trigger, target, node_type):
         MERGE (e){connection[0]}[:DF {{Type: a.Type, relation: 'causal'}}]{connection[1]}(out_{relation})
         """
 
-            )
+            ), {'trigger': trigger, 'target': target, 'relation': relation}
 
 
 def set_target_df(trigger, target):
-    return (f"""
-            MATCH (no:Entity {{Type:"{trigger}"}})<-[:CORR]-(e:Event)-[:CORR]->(n:Entity {{Type:"{target}"}})
+    return ("""
+            MATCH (no:Entity {Type: $trigger})<-[:CORR]-(e:Event)-[:CORR]->(n:Entity {Type: $target})
             WITH e, n, no
             ORDER BY e.Timestamp, ID(e)
             WITH n, no, collect(e) AS event_list
             UNWIND range(0, size(event_list)-2) AS i
             WITH no, n, event_list[i] AS e1, event_list[i+1] AS e2
-            MERGE (e1)-[df:DF {{Type:n.Type, ID:n.Value, edge_weight: 1}}]->(e2)
-            MERGE (e1)-[df0:DF {{Type:no.Type, ID:no.Value, relation: 'causal', edge_weight: 1}}]->(e2)
+            MERGE (e1)-[df:DF {Type:n.Type, ID:n.Value, edge_weight: 1}]->(e2)
+            MERGE (e1)-[df0:DF {Type:no.Type, ID:no.Value, relation: 'causal', edge_weight: 1}]->(e2)
            """
-            )
+            ), {'trigger': trigger, 'target': target}
 
 
 def set_trigger_df(trigger):
-    return (f"""
-            MATCH (e:Event)-[:CORR]->(a:Entity {{Type:"{trigger}"}})
+    return ("""
+            MATCH (e:Event)-[:CORR]->(a:Entity {Type: $trigger})
             WITH e, a
             ORDER BY e.Timestamp, ID(e)
             WITH a, collect(e) AS event_list
             UNWIND range(0, size(event_list)-2) AS i
             WITH a, event_list[i] AS e1, event_list[i+1] AS e2
             WHERE not (e1.relation = 'confounder' AND e2.relation = 'collider')
-            MERGE (e1)-[df:DF {{Type:a.Type, ID:a.Value, edge_weight: 1}}]->(e2)
-           """)
+            MERGE (e1)-[df:DF {Type:a.Type, ID:a.Value, edge_weight: 1}]->(e2)
+           """), {'trigger': trigger}
 
 
 ########################
 
 
 def find_confounder_node(trigger, target):
-    return (f"""
-            MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
-            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {{Type: "{target}"}})
+    return ("""
+            MATCH (e:Event)-[:CORR]->(a:Entity {Type: $trigger})
+            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {Type: $target})
             WITH a, b, e
             ORDER BY e.Timestamp
             WITH a, b, COLLECT(e) AS event_list, MIN(e.Timestamp) AS min_timestamp
@@ -141,30 +156,30 @@ def find_confounder_node(trigger, target):
             WITH a, fee[0] AS confounder_node
             SET confounder_node.relation = 'confounder'
            """
-            )
+            ), {'trigger': trigger, 'target': target}
 
 
 def set_confounder_rels(trigger, target):
-    return (f"""
-        MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
+    return ("""
+        MATCH (e:Event)-[:CORR]->(a:Entity {Type: $trigger})
         WHERE e.relation = 'confounder'
-        MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {{Type: "{target}"}})
+        MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {Type: $target})
         WITH e, a, b, e1
         ORDER BY e1.Timestamp
         WITH DISTINCT b, a, e1, e
         WITH b, a, collect(e1) AS event_list, e
         WHERE all(ev IN event_list WHERE e.Timestamp < ev.Timestamp)
         WITH e, a, event_list[0] as out_confounder
-        MERGE (e)-[:DF {{Type: a.Type, relation: 'causal'}}]->(out_confounder)
+        MERGE (e)-[:DF {Type: a.Type, relation: 'causal'}]->(out_confounder)
            """
 
-            )
+            ), {'trigger': trigger, 'target': target}
 
 
 def find_collider_node(trigger, target):
-    return (f"""
-            MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
-            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {{Type: "{target}"}})
+    return ("""
+            MATCH (e:Event)-[:CORR]->(a:Entity {Type: $trigger})
+            OPTIONAL MATCH (e)-[:CORR]->(b:Entity {Type: $target})
             WITH e, a, b
             ORDER BY e.Timestamp
             WITH a, b, COLLECT(e) AS event_list, MIN(e.Timestamp) AS min_timestamp
@@ -188,14 +203,14 @@ def find_collider_node(trigger, target):
             WITH a, collect(fe) AS fee
             WITH a, fee[0] AS collider_node
             SET collider_node.relation = 'collider'
-           """)
+           """), {'trigger': trigger, 'target': target}
 
 
 def set_collider_rels(trigger, target):
-    return (f"""
-            MATCH (e:Event)-[:CORR]->(a:Entity {{Type: "{trigger}"}})
+    return ("""
+            MATCH (e:Event)-[:CORR]->(a:Entity {Type: $trigger})
             WHERE e.relation = 'collider'
-            MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {{Type: "{target}"}})
+            MATCH (a)<-[:CORR]-(e1:Event)-[:CORR]->(b:Entity {Type: $target})
             WITH e, a, b, e1
             ORDER BY e1.Timestamp DESC
             WITH DISTINCT b, a, e1, e
@@ -203,5 +218,5 @@ def set_collider_rels(trigger, target):
             WHERE all(ev IN event_list WHERE e.Timestamp > ev.Timestamp)
             // Get the first event occurrence with higher timestamp value
             WITH e, a, event_list[0] as out_collider
-            MERGE (e)<-[:DF {{Type: a.Type, relation: 'causal'}}]-(out_collider)
-           """)
+            MERGE (e)<-[:DF {Type: a.Type, relation: 'causal'}]-(out_collider)
+           """), {'trigger': trigger, 'target': target}
@@ -0,0 +1,68 @@
+"""
+------------------------------------------------------------------------
+File : export_query_lib.py
+Description: Cypher queries for the columnar export of the graph data
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# The exported data: (MATCH pattern, WHERE conditions, exported variable, source variable, target variable)
+EXPORT_KINDS = {
+    'event-nodes': ("(n:Event)", "NOT n:FilteredOut", "n", None, None),
+    'entity-nodes': ("(n:Entity)", None, "n", None, None),
+    'corr': ("(e:Event)-[r:CORR]->(e1:Entity)", "NOT e:FilteredOut", "r", "e", "e1"),
+    'df': ("(e:Event)-[r:DF]->(e1:Event)", "NOT e:FilteredOut AND NOT e1:FilteredOut", "r", "e", "e1"),
+    'obs': ("(e:Event)-[r:OBSERVED]->(c:Class)", None, "r", "e", "c"),
+    'dfc': ("(c1:Class)-[r:DF_C]->(c2:Class)", None, "r", "c1", "c2")
+}
+
+
+# ---------- Export queries ----------
+
+def get_export_keys_query(kind):
+    """
+    Get the property keys of the exported data (the columns of the export)
+    :param kind: the export kind
+    :return: the query
+    """
+    pattern, conditions, variable, _, _ = get_export_kind(kind)
+    where = f"WHERE {conditions}" if conditions else ""
+
+    return (f"""
+            MATCH {pattern}
+            {where}
+            UNWIND keys({variable}) AS key
+            RETURN DISTINCT key
+            """)
+
+
+def get_export_query(kind):
+    """
+    Get the exported data: the id and the properties (and the source and target ids for the relationships)
+    :param kind: the export kind
+    :return: the query
+    """
+    pattern, conditions, variable, source, target = get_export_kind(kind)
+    where = f"WHERE {conditions}" if conditions else ""
+    endpoints = f"id({source}) AS source_id, id({target}) AS target_id, " if source else ""
+
+    return (f"""
+            MATCH {pattern}
+            {where}
+            RETURN id({variable}) AS id, {endpoints}properties({variable}) AS properties
+            """)
+
+
+def get_export_kind(kind):
+    """
+    Validate the export kind
+    :param kind: the export kind
+    :return: the export kind definition
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Invalid export kind: {kind}")
+    return EXPORT_KINDS[kind]
@@ -10,38 +10,46 @@ License : MIT
 ------------------------------------------------------------------------
 """
 
+# Import
+from Utils.general_query_lib import check_operator, check_number
+
 
 def timestamp_filter_query(start_date, end_date):
     """
     Timestamp filter query
     :param start_date: the start date
     :param end_date: the end date
-    :return the filtered graph
+    :return the filtered graph query and the parameters
     """
-    start_date = clean_timestamp(start_date)
-    end_date = clean_timestamp(end_date)
-
-    return (f"MATCH (e1:Event)-[r:DF]->(e2:Event) "
-            f"WHERE e1.Timestamp >= localDateTime({start_date}) AND e1.Timestamp <= localDateTime({end_date}) "
-            f"AND e2.Timestamp >= localDateTime({start_date}) AND e2.Timestamp <= localDateTime({end_date}) "
-            f"RETURN e1 as source, id(e1) as source_id, properties(r) as edge, "
-            f"id(r) as edge_id, e2 as target, id(e2) as target_id ")
+    return ("MATCH (e1:Event)-[r:DF]->(e2:Event) "
+            "WHERE NOT e1:FilteredOut AND NOT e2:FilteredOut "
+            "AND e1.Timestamp >= localDateTime($start_date) AND e1.Timestamp <= localDateTime($end_date) "
+            "AND e2.Timestamp >= localDateTime($start_date) AND e2.Timestamp <= localDateTime($end_date) "
+            "RETURN e1 as source, id(e1) as source_id, properties(r) as edge, "
+            "id(r) as edge_id, e2 as target, id(e2) as target_id "), {
+        'start_date': clean_timestamp(start_date),
+        'end_date': clean_timestamp(end_date)
+    }
 
 
 def timestamp_filter_delete_query(start_date, end_date):
     """
-    Timestamp filter delete query
+    Timestamp filter delete query (the events are hidden from the view, not deleted)
     :param start_date: the start date
     :param end_date: the end date
-    :return the filtered graph
+    :return the filtered graph query and the parameters
     """
-    start_date = clean_timestamp(start_date)
-    end_date = clean_timestamp(end_date)
-
-    return (f"MATCH (e1:Event)-[r:DF]->(e2:Event) "
-            f"WHERE NOT (e1.Timestamp >= localDateTime('{start_date}') AND e1.Timestamp <= localDateTime('{end_date}')) "
-            f"AND NOT (e2.Timestamp >= localDateTime('{start_date}') AND e2.Timestamp <= localDateTime('{end_date}')) "
-            f"DETACH DELETE e1, e2, r")
+    return ("MATCH (e1:Event)-[r:DF]->(e2:Event) "
+            "WHERE NOT e1:FilteredOut AND NOT e2:FilteredOut "
+            "AND NOT (e1.Timestamp >= localDateTime($start_date) AND e1.Timestamp <= localDateTime($end_date)) "
+            "AND NOT (e2.Timestamp >= localDateTime($start_date) AND e2.Timestamp <= localDateTime($end_date)) "
+            "UNWIND [e1, e2] AS e "
+            "WITH DISTINCT e "
+            "SET e:FilteredOut "
+            "RETURN count(e) AS rows"), {
+        'start_date': clean_timestamp(start_date),
+        'end_date': clean_timestamp(end_date)
+    }
 
 
 def performance_filter_query(start_activity_name, end_activity_name, duration):
@@ -50,33 +58,41 @@ def performance_filter_query(start_activity_name, end_activity_name, duration):
     :param start_activity_name: the start activity name
     :param end_activity_name: the end activity name
     :param duration: the duration
-    :return: the filtered graph
+    :return: the filtered graph query and the parameters
     """
-    return (f"MATCH (start: Event {{ActivityName: '{start_activity_name}'}}) "
-            f"MATCH (end: Event {{ActivityName: '{end_activity_name}'}}) "
-            f"WHERE start.Timestamp < end.Timestamp "
-            f"WITH start, end, duration.between(start.Timestamp, end.Timestamp) AS duration "
-            f"WHERE duration.seconds > {duration} "
-            f"MERGE (start)-[r:HAS_DURATION {{duration_seconds: duration.seconds}}]->(end) "
-            f"RETURN start, r, end")
+    return ("MATCH (start: Event {ActivityName: $start_activity}) "
+            "MATCH (end: Event {ActivityName: $end_activity}) "
+            "WHERE NOT start:FilteredOut AND NOT end:FilteredOut AND start.Timestamp < end.Timestamp "
+            "WITH start, end, duration.between(start.Timestamp, end.Timestamp) AS duration "
+            "WHERE duration.seconds > $duration "
+            "MERGE (start)-[r:HAS_DURATION {duration_seconds: duration.seconds}]->(end) "
+            "RETURN start, r, end"), {
+        'start_activity': start_activity_name,
+        'end_activity': end_activity_name,
+        'duration': check_number(duration)
+    }
 
 
 def performance_filter_delete_query(start_activity_name, end_activity_name, duration):
     """
-    Performance filter delete query
+    Performance filter delete query (the events are hidden from the view, not deleted)
     :param start_activity_name: the start activity name
     :param end_activity_name: the end activity name
     :param duration: the duration
-    :return: the filtered graph
+    :return: the filtered graph query and the parameters
     """
-    return (f"MATCH (start: Event {{ActivityName: '{start_activity_name}'}}) "
-            f"MATCH (end: Event {{ActivityName: '{end_activity_name}'}}) "
-            f"WHERE start.Timestamp < end.Timestamp "
-            f"WITH start, end, (end.Timestamp - start.Timestamp) AS time_diff "
-            f"WITH start, end, time_diff, "
-            f"(time_diff.day * 86400) + (time_diff.hour * 3600) + (time_diff.minute * 60) + time_diff.second AS total_seconds "
-            f"WHERE total_seconds <= {duration} "
-            f"DETACH DELETE start, end")
+    return ("MATCH (start: Event {ActivityName: $start_activity}) "
+            "MATCH (end: Event {ActivityName: $end_activity}) "
+            "WHERE NOT start:FilteredOut AND NOT end:FilteredOut AND start.Timestamp < end.Timestamp "
+            "WITH start, end, (end.Timestamp - start.Timestamp) AS time_diff "
+            "WITH start, end, time_diff, "
+            "(time_diff.day * 86400) + (time_diff.hour * 3600) + (time_diff.minute * 60) + time_diff.second AS total_seconds "
+            "WHERE total_seconds <= $duration "
+            "SET start:FilteredOut, end:FilteredOut"), {
+        'start_activity': start_activity_name,
+        'end_activity': end_activity_name,
+        'duration': check_number(duration)
+    }
 
 
 def clean_timestamp(timestamp):
@@ -97,30 +113,44 @@ def clean_timestamp(timestamp):
 ########################## NEW FILTERS ##########################
 
 ######## ACTIVITY FILTERS ########
-def exclude_activity_filter_query(activity):
+def exclude_activities_filter_query(activities):
     """
-    Exclude an activity from the EKG and infers the DF relationships between its predecessors and successors.
+    Exclude a list of activities from the EKG view in a single pass (index seek on ActivityName).
+    Each visible predecessor is bridged to the first visible successor of the same DF chain (Type and ID)
+    that is not excluded, then the excluded events are hidden with the :FilteredOut label
+    :param activities: the activities to exclude
+    :return: the query and the parameters
     """
-    query = f"""
-        MATCH (e:Event {{ActivityName: '{activity}'}})
-        OPTIONAL MATCH (pred:Event)-[inRel:DF]->(e)
-        OPTIONAL MATCH (e)-[outRel:DF]->(succ:Event)
-        WITH e, pred, succ, inRel, outRel
-        FOREACH (_ IN CASE WHEN pred IS NOT NULL AND succ IS NOT NULL AND inRel IS NOT NULL AND outRel IS NOT NULL AND inRel.Type = outRel.Type THEN [1] ELSE [] END |
-            MERGE (pred)-[newRel:DF {{Type: inRel.Type}}]->(succ)
-            SET newRel.edge_weight = inRel.edge_weight
-        )
-        WITH DISTINCT e
-        DETACH DELETE e
+    query = """
+        MATCH (pred:Event)-[inRel:DF]->(e:Event)
+        WHERE e.ActivityName IN $activities AND NOT e:FilteredOut
+        AND NOT pred:FilteredOut AND NOT pred.ActivityName IN $activities
+        OPTIONAL MATCH (e)-[:DF *1.. (r, n | r.Type = inRel.Type AND r.ID = inRel.ID
+                                      AND NOT n:FilteredOut AND n.ActivityName IN $activities)]->(next:Event)
+        WITH pred, inRel, e, collect(next) AS excluded_run
+        UNWIND [e] + excluded_run AS last
+        MATCH (last)-[:DF {Type: inRel.Type, ID: inRel.ID}]->(succ:Event)
+        WHERE NOT succ:FilteredOut AND NOT succ.ActivityName IN $activities
+        MERGE (pred)-[newRel:DF {Type: inRel.Type, Inferred: true}]->(succ)
+        SET newRel.edge_weight = inRel.edge_weight
+        WITH count(DISTINCT newRel) AS bridged
+        MATCH (e:Event)
+        WHERE e.ActivityName IN $activities AND NOT e:FilteredOut
+        SET e:FilteredOut
+        RETURN count(e) AS rows, bridged
     """
-    return query
-
+    return query, {'activities': list(activities)}
 
 
 ######## PERFORMANCE FILTERS ########
-def generic_trace_duration_query(ent_type):
-    return (f'''
-                MATCH (e:Event)-[:CORR]->(t:Entity {{Type: "{ent_type}"}})
+def generic_trace_duration_query():
+    """
+    Duration of the traces of the $ent_type entity type
+    :return: the cypher query (first part)
+    """
+    return ('''
+                MATCH (e:Event)-[:CORR]->(t:Entity {Type: $ent_type})
+                WHERE NOT e:FilteredOut
                 WITH e, t.Value AS entity ORDER BY e.Timestamp ASC
                 WITH entity, COLLECT(e) AS events
                 WITH entity, HEAD(events) AS StartNode, LAST(events) AS EndNode
@@ -135,10 +165,10 @@ def get_entity_trace_duration(ent_type):
     :return: the cypher query
     :query_returns: the entity and the duration (only in HH:M:SS format)
     """
-    query = generic_trace_duration_query(ent_type)
+    query = generic_trace_duration_query()
     return query + ('''\n
             RETURN entity AS entity_id, duration AS iso_duration
-            ''')
+            '''), {'ent_type': ent_type}
 
 
 def filter_entity_performance(ent_type, operator, duration):
@@ -147,16 +177,17 @@ def filter_entity_performance(ent_type, operator, duration):
     :param ent_type: the entity type
     :param operator: >, <, >=, <=, =, !=
     :param duration: the duration
-    :return: the cypher query and a filtered EKG
+    :return: the cypher query and the parameters
     """
-    query = generic_trace_duration_query(ent_type)
-    duration_iso = f"PT{duration}S"
+    query = generic_trace_duration_query()
     return query + (f'''\n
-            WHERE duration {operator} duration("{duration_iso}")
+            WHERE duration {check_operator(operator)} duration($duration)
             WITH entity
-            MATCH (e:Event)-[:CORR]->(t:Entity  {{Type: "{ent_type}", Value: entity}})
-            DETACH DELETE e
-            ''')
+            MATCH (e:Event)-[:CORR]->(t:Entity  {{Type: $ent_type, Value: entity}})
+            WHERE NOT e:FilteredOut
+            SET e:FilteredOut
+            RETURN count(e) AS rows
+            '''), {'ent_type': ent_type, 'duration': f"PT{duration}S"}
 
 
 ######## FREQUENCY FILTERS ########
@@ -168,11 +199,12 @@ def get_activity_frequency_query(ent_type):
     :return: the cypher query
     :query_returns: the activity and the frequency
     """
-    return (f'''
-            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: "{ent_type}"}})
+    return ('''
+            MATCH (e:Event)-[:CORR]->(t:Entity {Type: $ent_type})
+            WHERE NOT e:FilteredOut
             RETURN e.ActivityName AS Activity, count(*) AS Occurrences
             ORDER BY Occurrences DESC
-            ''')
+            '''), {'ent_type': ent_type}
 
 
 def filter_activity_frequency(ent_type, operator, frequency):
@@ -181,27 +213,31 @@ def filter_activity_frequency(ent_type, operator, frequency):
     :param ent_type: the entity type
     :param operator: >, <, >=, <=, =, !=
     :param frequency: the frequency
-    :return: the cypher query and a filtered EKG
+    :return: the cypher query and the parameters
     """
     return (f'''
-            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: "{ent_type}"}})
+            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: $ent_type}})
+            WHERE NOT e:FilteredOut
             WITH e.ActivityName AS Activity, COLLECT(e) as Events
-            WHERE SIZE(Events) {operator} {frequency}
+            WHERE SIZE(Events) {check_operator(operator)} $frequency
             UNWIND Events AS e_keep
             WITH COLLECT(e_keep) AS EventsToKeep
 
-            // Match all other events (those NOT in EventsToKeep)
+            // Match all other visible events (those NOT in EventsToKeep)
             MATCH (e:Event)
-            WHERE NOT e IN EventsToKeep
+            WHERE NOT e:FilteredOut AND NOT e IN EventsToKeep
             // Find predecessors and successors of the event in the DF chain
             OPTIONAL MATCH (prev)-[df1:DF]->(e)-[df2:DF]->(next)
-            // Create a new connection from the predecessor to the successor if both exist
+            WHERE NOT prev:FilteredOut AND NOT next:FilteredOut
+            // Create a new (inferred) connection from the predecessor to the successor if both exist
             FOREACH (_ IN CASE WHEN prev IS NOT NULL AND next IS NOT NULL THEN [1] ELSE [] END | 
-                MERGE (prev)-[:DF]->(next)
+                MERGE (prev)-[:DF {{Inferred: true}}]->(next)
             )
-            // Delete the original event and its DF relationships
-            DETACH DELETE e
-            ''')
+            // Hide the original event (and so its DF relationships) from the view
+            WITH DISTINCT e
+            SET e:FilteredOut
+            RETURN count(e) AS rows
+            '''), {'ent_type': ent_type, 'frequency': check_number(frequency)}
 
 
 ######## VARIANT FILTERS ########
@@ -213,15 +249,16 @@ def get_variant_query(ent_type):
     :return: the cypher query
     :query_returns: the activity and the frequency
     """
-    return (f'''
-            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: "{ent_type}"}})
+    return ('''
+            MATCH (e:Event)-[:CORR]->(t:Entity {Type: $ent_type})
+            WHERE NOT e:FilteredOut
             WITH e, t.Value AS entity 
             ORDER BY e.Timestamp ASC
             WITH entity, COLLECT(e.ActivityName) AS events
             WITH events, COUNT(*) AS event_count
             RETURN events, event_count
             ORDER BY event_count DESC
-            ''')
+            '''), {'ent_type': ent_type}
 
 
 def filter_entity_variant(ent_type, operator, variant):
@@ -230,15 +267,44 @@ def filter_entity_variant(ent_type, operator, variant):
     :param ent_type: the entity type
     :param operator: >, <, >=, <=, =, !=
     :param variant: the variant expressed as a number of trace occurrences
+    :return: the cypher query and the parameters
     """
     return (f'''    
-            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: "{ent_type}"}})
+            MATCH (e:Event)-[:CORR]->(t:Entity {{Type: $ent_type}})
+            WHERE NOT e:FilteredOut
             WITH e, t AS entity
             ORDER BY e.Timestamp ASC
             WITH entity, COLLECT(e.ActivityName) AS events
             WITH events, COUNT(*) AS event_count, COLLECT(entity) AS entities
-            WHERE event_count {operator} {variant}  
-            MATCH (e2:Event)-[:CORR]->(t2:Entity {{Type: "{ent_type}"}})
-            WHERE t2 IN entities
-            DETACH DELETE e2
-            ''')
+            WHERE event_count {check_operator(operator)} $variant  
+            MATCH (e2:Event)-[:CORR]->(t2:Entity {{Type: $ent_type}})
+            WHERE NOT e2:FilteredOut AND t2 IN entities
+            SET e2:FilteredOut
+            RETURN count(e2) AS rows
+            '''), {'ent_type': ent_type, 'variant': check_number(variant)}
+
+
+######## FILTER VIEW ########
+
+def drop_filter_view_queries():
+    """
+    Drop the current filter view: remove the inferred DF relationships and show the hidden events again
+    :return: the list of queries
+    """
+    return ["MATCH ()-[r:DF {Inferred: true}]->() DELETE r",
+            "MATCH (e:FilteredOut) REMOVE e:FilteredOut"]
+
+
+def get_view_count_query():
+    """
+    Get the count of the visible nodes and relationships (the view of the current analysis)
+    :return: the query
+    """
+    return ("""
+            MATCH (n)
+            WHERE NOT n:FilteredOut
+            WITH count(n) AS node_count
+            OPTIONAL MATCH (a)-[r]->(b)
+            WHERE NOT a:FilteredOut AND NOT b:FilteredOut
+            RETURN node_count, count(r) AS relationship_count
+            """)
@@ -11,6 +11,84 @@ License : MIT
 """
 
 
+# Import
+import re
+
+# Identifiers that Cypher can not receive as $parameters (they must stay in the query text)
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+RELATIONSHIP_TYPES = {'CORR', 'DF', 'OBSERVED', 'DF_C', 'HAS_DURATION'}
+COMPARISON_OPERATORS = {'>', '<', '>=', '<=', '=', '!=', '<>'}
+
+
+# ---------- Query validation ----------
+
+def check_property_key(key):
+    """
+    Validate a property key before writing it inside the query text
+    :param key: the property key
+    :return: the property key
+    """
+    if not isinstance(key, str) or not IDENTIFIER_PATTERN.match(key):
+        raise ValueError(f"Invalid property key: {key}")
+    return key
+
+
+def check_relationship_type(rel_type):
+    """
+    Validate a relationship type against the EKG relationship types
+    :param rel_type: the relationship type
+    :return: the relationship type
+    """
+    if rel_type not in RELATIONSHIP_TYPES:
+        raise ValueError(f"Invalid relationship type: {rel_type}")
+    return rel_type
+
+
+def check_operator(operator):
+    """
+    Validate a comparison operator
+    :param operator: the operator
+    :return: the operator
+    """
+    if operator not in COMPARISON_OPERATORS:
+        raise ValueError(f"Invalid comparison operator: {operator}")
+    return operator
+
+
+def check_number(value):
+    """
+    Validate a numeric value (also if it is received as a string)
+    :param value: the value
+    :return: the value as int or float
+    """
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def get_page_query(pattern, conditions, cursor, returns, after, page_size):
+    """
+    Keyset pagination on the internal ids: the page starts after the cursor of the previous page,
+    so every page is a bounded ORDER BY ... LIMIT (no SKIP over the previous pages)
+    :param pattern: the MATCH pattern
+    :param conditions: the WHERE conditions (or None)
+    :param cursor: the cursor expression (e.g. id(r))
+    :param returns: the RETURN expressions
+    :param after: the cursor of the previous page (None for the first page)
+    :param page_size: the page size
+    :return: the query and the parameters (the records have the cursor key)
+    """
+    where = f"{conditions} AND {cursor} > $after" if conditions else f"{cursor} > $after"
+
+    return (f"MATCH {pattern} "
+            f"WHERE {where} "
+            f"RETURN {returns}, {cursor} AS cursor "
+            f"ORDER BY cursor "
+            f"LIMIT $page_size"), {
+        'after': -1 if after is None else int(check_number(after)),
+        'page_size': int(check_number(page_size))
+    }
+
+
 # ---------- Generic query ----------
 
 
@@ -38,6 +116,7 @@ def get_max_standard_graph_data():
 
     return """
             MATCH (e1:Event)-[r:DF]->(e2:Event)
+            WHERE NOT e1:FilteredOut AND NOT e2:FilteredOut
             WITH collect(DISTINCT e1) + collect(DISTINCT e2) AS allNodes, collect(DISTINCT r) AS allRels
             RETURN size(apoc.coll.toSet(allNodes)) AS totalNodes, size(allRels) AS totalRels
             """
@@ -72,6 +151,15 @@ def drop_event_index():
     return "DROP INDEX ON :Event(Event_Id)"
 
 
+def drop_graph_index_queries():
+    """
+    Drop the label-property indexes of the standard graph (also the previous :Entity(Value) index)
+    :return: the list of queries
+    """
+    return ["DROP INDEX ON :Entity(Type)", "DROP INDEX ON :Entity(Type, Value)", drop_entity_index(),
+            "DROP INDEX ON :Event(Timestamp)", drop_event_index(), "DROP INDEX ON :Event(ActivityName)"]
+
+
 def delete_all_data_query():
     """
     Delete all data inside database
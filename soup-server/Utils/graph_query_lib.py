@@ -10,32 +10,79 @@ License : MIT
 ------------------------------------------------------------------------
 """
 
+# Import
+from Utils.general_query_lib import check_property_key, check_number, get_page_query
+
 
 # ---------- Standard queries ----------
 
-def load_event_node_query(container_csv_path, event_id_col, timestamp_col, activity_col, cypher_properties):
+def event_properties_string(property_keys, source='row'):
+    """
+    Build the other event properties read from the csv row
+    :param property_keys: the property keys (validated, they stay in the query text)
+    :param source: the variable that holds the row
+    :return: the properties string
+    """
+    return ''.join(f", {check_property_key(key)}: coalesce({source}.{key}, '')" for key in property_keys)
+
+
+def csv_location_literal(container_csv_path):
+    """
+    Quote the LOAD CSV location (it must be a string literal, it cannot be a query parameter)
+    :param container_csv_path: the container csv file path
+    :return: the escaped string literal
+    """
+    return "'" + str(container_csv_path).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def load_event_node_query(container_csv_path, event_id_col, timestamp_col, activity_col, property_keys):
     """
-    Load function
+    Load function. The LOAD CSV location must be a literal, the columns are validated identifiers
     :param container_csv_path: the container csv file path
     :param event_id_col: the event id column
     :param timestamp_col: the timestamp column
     :param activity_col: the activity column
-    :param cypher_properties: other properties
-    :return: the load query
+    :param property_keys: other properties keys
+    :return: the load query and the parameters
     """
-    properties_string = ', '.join(cypher_properties)
-    return (f"LOAD CSV FROM '{container_csv_path}' WITH HEADER AS row "
-            f"CREATE (e:Event {{Event_Id: row.{event_id_col}, Timestamp: localDateTime(row.{timestamp_col}), ActivityName: row.{activity_col}, {properties_string}}});")
+    return (f"LOAD CSV FROM {csv_location_literal(container_csv_path)} WITH HEADER AS row "
+            f"CREATE (e:Event {{Event_Id: row.{check_property_key(event_id_col)}, "
+            f"Timestamp: localDateTime(row.{check_property_key(timestamp_col)}), "
+            f"ActivityName: row.{check_property_key(activity_col)}{event_properties_string(property_keys)}}});"), {}
 
 
-def create_node_event_query(cypher_properties):
+def create_node_event_query(property_keys):
     """
     Create event nodes query
-    :param cypher_properties: the properties
+    :param property_keys: the properties keys (values are read from the $properties map)
     :return the query
     """
-    return (
-        f"CREATE (e:Event {{Event_Id: $event_id, Timestamp: localDateTime($timestamp), ActivityName: $activity_name, {', '.join(cypher_properties)}}})")
+    return ("CREATE (e:Event {Event_Id: $event_id, Timestamp: localDateTime($timestamp), "
+            f"ActivityName: $activity_name{event_properties_string(property_keys, '$properties')}}})")
+
+
+def create_event_nodes_batch_query(event_id_col, timestamp_col, activity_col, property_keys):
+    """
+    Create event nodes query for batched writes (rows are sent as the $batch parameter)
+    :param event_id_col: the event id column
+    :param timestamp_col: the timestamp column
+    :param activity_col: the activity column
+    :param property_keys: other properties keys
+    :return: the query
+    """
+    return (f"UNWIND $batch AS row "
+            f"CREATE (e:Event {{Event_Id: row.{check_property_key(event_id_col)}, "
+            f"Timestamp: localDateTime(row.{check_property_key(timestamp_col)}), "
+            f"ActivityName: row.{check_property_key(activity_col)}{event_properties_string(property_keys)}}})")
+
+
+def create_entity_nodes_batch_query():
+    """
+    Create entity nodes query for batched writes (rows are sent as the $batch parameter)
+    :return: the query
+    """
+    return ("UNWIND $batch AS row "
+            "MERGE (e:Entity {Value: row.value, Type: row.type})")
 
 
 def load_entity_node_query(container_csv_path):
@@ -44,7 +91,7 @@ def load_entity_node_query(container_csv_path):
     :param container_csv_path: the container csv file path
     :return: the load entity node query
     """
-    return (f"LOAD CSV FROM '{container_csv_path}' WITH HEADER AS row "
+    return (f"LOAD CSV FROM {csv_location_literal(container_csv_path)} WITH HEADER AS row "
             f"MERGE (e:Entity {{Value: row.value, Type: row.type}})")
 
 
@@ -78,20 +125,38 @@ def create_event_index_id():
     """
 
 
-def create_entity_index():
+def create_entity_index_type():
+    """
+    Create type index for entity nodes
+    :return: the query
+    """
+    return "CREATE INDEX ON :Entity(Type)"
+
+
+def create_entity_index_type_value():
     """
-    Create index for nodes
+    Create composite (type, value) index for entity nodes
     :return: the query
     """
-    return "CREATE INDEX ON :Entity(Value)"
+    return "CREATE INDEX ON :Entity(Type, Value)"
+
+
+def create_graph_index_queries():
+    """
+    Create the label-property indexes used by the load, CORR, DF, causal and filter queries
+    :return: the list of queries
+    """
+    return [create_entity_index_type(), create_entity_index_type_value(), create_event_index_time(),
+            create_event_index_id(), create_event_index()]
 
 
 def create_corr_relation_query(key):
     """
     Create correlation query, checks if an entity has multiple values
     :param key: the key
-    :return: the correlation query
+    :return: the correlation query and the parameters
     """
+    key = check_property_key(key)
     return (f"""
             MATCH (e:Event) 
             WITH e, 
@@ -101,26 +166,49 @@ def create_corr_relation_query(key):
                 END AS entities
             UNWIND entities AS entity_id
             WITH DISTINCT entity_id, e
-            MATCH (ent:Entity {{Value: entity_id}})
-            MERGE (e)-[c:CORR {{Type: '{key}'}}]->(ent)
-            """)
+            MATCH (ent:Entity {{Type: $type, Value: entity_id}})
+            MERGE (e)-[c:CORR {{Type: $type}}]->(ent)
+            """), {'type': key}
 
 
 def create_df_relation_query(key):
     """
     Create direct follow query
     :param key: the key
-    :return: the query for df relationships
+    :return: the query for df relationships and the parameters
     """
-    return (f"""
-            MATCH (e:Event)-[:CORR]->(n:Entity)
-            WHERE n.Type = '{key}'
+    return ("""
+            MATCH (n:Entity {Type: $type})<-[:CORR]-(e:Event)
             WITH n, e AS nodes ORDER BY e.Timestamp, ID(e)
             WITH n, collect(nodes) AS event_node_list
             UNWIND range(0, size(event_node_list)-2) AS i
             WITH n, event_node_list[i] AS e1, event_node_list[i+1] AS e2
-            MERGE (e1)-[df:DF {{ Type:n.Type, ID:n.Value, edge_weight: 1}}]->(e2)
-            """)
+            MERGE (e1)-[df:DF { Type:n.Type, ID:n.Value, edge_weight: 1}]->(e2)
+            """), {'type': key}
+
+
+def get_df_event_tuples_query(key):
+    """
+    Get the (event id, entity, timestamp) tuples of an entity type (engine-side DF computation)
+    :param key: the key
+    :return: the query and the parameters
+    """
+    return ("""
+            MATCH (n:Entity {Type: $type})<-[:CORR]-(e:Event)
+            RETURN id(e) AS event_id, n.Value AS entity_id, timestamp(e.Timestamp) AS timestamp
+            """), {'type': key}
+
+
+def create_df_relations_batch_query():
+    """
+    Create direct follow relationships query for batched writes (rows are sent as the $batch parameter).
+    The relationships are merged as in create_df_relation_query, so the query can run again on a built key
+    :return: the query (it needs the $type parameter)
+    """
+    return ("UNWIND $batch AS row "
+            "MATCH (e1:Event) WHERE id(e1) = row.source "
+            "MATCH (e2:Event) WHERE id(e2) = row.target "
+            "MERGE (e1)-[:DF {Type: $type, ID: row.entity_id, edge_weight: 1}]->(e2)")
 
 
 # ---------- Util queries ----------
@@ -130,7 +218,17 @@ def get_nodes_event_query():
     Get event nodes
     :return: the query
     """
-    return "MATCH (e:Event) RETURN e AS node"
+    return "MATCH (e:Event) WHERE NOT e:FilteredOut RETURN e AS node"
+
+
+def get_nodes_event_page_query(after, page_size):
+    """
+    Get a page of event nodes
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+    return get_page_query("(e:Event)", "NOT e:FilteredOut", "id(e)", "e AS node", after, page_size)
 
 
 def get_count_nodes_event_query():
@@ -138,7 +236,7 @@ def get_count_nodes_event_query():
     Get count of nodes events
     :return: the query
     """
-    return " MATCH (n: Event) RETURN COUNT(n) as node_count "
+    return " MATCH (n: Event) WHERE NOT n:FilteredOut RETURN COUNT(n) as node_count "
 
 
 def get_nodes_entity_query():
@@ -149,6 +247,16 @@ def get_nodes_entity_query():
     return " MATCH (e:Entity) RETURN e AS node"
 
 
+def get_nodes_entity_page_query(after, page_size):
+    """
+    Get a page of entity nodes
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+    return get_page_query("(e:Entity)", None, "id(e)", "e AS node", after, page_size)
+
+
 def get_nodes_entity_query_distinct():
     """
     Get distinct entity nodes
@@ -177,6 +285,7 @@ def get_nodes_details_query():
     """
     return ("""
             MATCH (event:Event)
+            WHERE NOT event:FilteredOut
             WITH collect(event) AS data, 'events' AS type, size(collect(event)) AS count
             RETURN data, type, count
             UNION
@@ -189,19 +298,21 @@ def get_nodes_details_query():
 def get_nodes_details_length_query(limit):
     """
     Get node details with limit
-    :param limit: the    :return:  query
+    :param limit: the limit
+    :return: the query and the parameters
     """
-    return (f"""
+    return ("""
             MATCH (event:Event)
+            WHERE NOT event:FilteredOut
             WITH collect(event) AS data, 'events' AS type, size(collect(event)) AS count
             RETURN data, type, count
-            LIMIT {limit}
+            LIMIT $limit
             UNION
             MATCH (entity:Entity)
             WITH collect(entity) AS data, 'entities' AS type, size(collect(entity)) AS count
             RETURN data, type, count
-            LIMIT {limit}
-            """)
+            LIMIT $limit
+            """), {'limit': int(check_number(limit))}
 
 
 def get_corr_relation_query():
@@ -209,7 +320,19 @@ def get_corr_relation_query():
     Get correlation relationships query
     :return: the query
     """
-    return "MATCH (e:Event)-[corr:CORR]->(e1:Entity) RETURN e, corr, e1"
+    return ("MATCH (e:Event)-[corr:CORR]->(e1:Entity) WHERE NOT e:FilteredOut "
+            "RETURN e, corr, e1, id(e) AS source_id, id(e1) AS target_id")
+
+
+def get_corr_relation_page_query(after, page_size):
+    """
+    Get a page of correlation relationships
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+    return get_page_query("(e:Event)-[corr:CORR]->(e1:Entity)", "NOT e:FilteredOut", "id(corr)",
+                          "e, corr, e1, id(e) AS source_id, id(e1) AS target_id", after, page_size)
 
 
 def get_count_corr_rel_query():
@@ -217,7 +340,8 @@ def get_count_corr_rel_query():
     Get count of correlation relationships query
     :return: the query
     """
-    return "MATCH (e:Event)-[corr:CORR]->(e1:Entity) RETURN COUNT(corr) as corr_count"
+    return ("MATCH (e:Event)-[corr:CORR]->(e1:Entity) WHERE NOT e:FilteredOut "
+            "RETURN COUNT(corr) as corr_count")
 
 
 def get_df_relation_query():
@@ -225,7 +349,19 @@ def get_df_relation_query():
     Get df relationships query
     :return: the query
     """
-    return "MATCH (e:Event)-[df:DF]->(e1:Event) RETURN e, df, e1"
+    return ("MATCH (e:Event)-[df:DF]->(e1:Event) WHERE NOT e:FilteredOut AND NOT e1:FilteredOut "
+            "RETURN e, df, e1, id(e) AS source_id, id(e1) AS target_id")
+
+
+def get_df_relation_page_query(after, page_size):
+    """
+    Get a page of df relationships
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+    return get_page_query("(e:Event)-[df:DF]->(e1:Event)", "NOT e:FilteredOut AND NOT e1:FilteredOut", "id(df)",
+                          "e, df, e1, id(e) AS source_id, id(e1) AS target_id", after, page_size)
 
 
 def get_count_df_rel_query():
@@ -233,7 +369,8 @@ def get_count_df_rel_query():
     Get count of df relationships query
     :return: the query
     """
-    return "MATCH (e:Event)-[df:DF]->(e1:Event) RETURN COUNT(df) as df_count"
+    return ("MATCH (e:Event)-[df:DF]->(e1:Event) WHERE NOT e:FilteredOut AND NOT e1:FilteredOut "
+            "RETURN COUNT(df) as df_count")
 
 
 def get_complete_standard_graph_query():
@@ -243,6 +380,7 @@ def get_complete_standard_graph_query():
     """
     return ("""
             MATCH (e1:Event)-[r:DF]->(e2:Event)
+            WHERE NOT e1:FilteredOut AND NOT e2:FilteredOut
             RETURN e1 as source, id(e1) as source_id, properties(r) as edge, 
             id(r) as edge_id, e2 as target, id(e2) as target_id
             """)
@@ -252,14 +390,27 @@ def get_limit_standard_graph_query(limit):
     """
     Get limit standard graph query
     :param limit: the limit
-    :return: the query
+    :return: the query and the parameters
     """
-    return f"""
+    return """
             MATCH (e1:Event)-[r:DF]->(e2:Event)
+            WHERE NOT e1:FilteredOut AND NOT e2:FilteredOut
             RETURN e1 as source, id(e1) as source_id, properties(r) as edge, 
             id(r) as edge_id, e2 as target, id(e2) as target_id
-            LIMIT {limit}
-            """
+            LIMIT $limit
+            """, {'limit': int(check_number(limit))}
+
+
+def get_page_standard_graph_query(after, page_size):
+    """
+    Get a page of the standard graph (ordered by the DF relationship id)
+    :param after: the cursor of the previous page
+    :param page_size: the page size
+    :return: the query and the parameters
+    """
+    return get_page_query("(e1:Event)-[r:DF]->(e2:Event)", "NOT e1:FilteredOut AND NOT e2:FilteredOut", "id(r)",
+                          "e1 as source, id(e1) as source_id, properties(r) as edge, "
+                          "id(r) as edge_id, e2 as target, id(e2) as target_id", after, page_size)
 
 
 def get_nan_entities():
@@ -285,7 +436,7 @@ def get_activities_name_query():
     """
     return ("""
             MATCH (n) 
-            WHERE n.ActivityName IS NOT NULL
+            WHERE n.ActivityName IS NOT NULL AND NOT n:FilteredOut
             RETURN COLLECT(DISTINCT n.ActivityName) AS activityNames
             """)
 
@@ -298,7 +449,7 @@ def get_min_max_timestamp_query():
 
     return ("""
             MATCH (n)
-            WHERE n.Timestamp IS NOT NULL
+            WHERE n.Timestamp IS NOT NULL AND NOT n:FilteredOut
             RETURN 
             MIN(n.Timestamp.year * 10000000000 + n.Timestamp.month * 100000000 + n.Timestamp.day * 1000000 + n.Timestamp.hour * 10000 + n.Timestamp.minute * 100 + n.Timestamp.second) AS minTimestamp,
             MAX(n.Timestamp.year * 10000000000 + n.Timestamp.month * 100000000 + n.Timestamp.day * 1000000 + n.Timestamp.hour * 10000 + n.Timestamp.minute * 100 + n.Timestamp.second) AS maxTimestamp
@@ -309,13 +460,13 @@ def change_nan(entity):
     """
     Change specific property
     :param entity: the entity
-    :return: the query
+    :return: the query and the parameters
     """
-    entity = entity.replace("'", "")
+    entity = check_property_key(entity.replace("'", ""))
     return f"""
             MATCH (n:Event)
             SET n.{entity} = toString(n.{entity})
-            """
+            """, {}
 
 
 def get_distinct_entities_keys():
@@ -0,0 +1,136 @@
+"""
+------------------------------------------------------------------------
+File : snapshot_query_lib.py
+Description: Cypher queries for the EKG snapshot and restore
+Date creation: 18-10-2026
+Project : soup-server
+Author: Alessio Giacché
+Copyright: Copyright (c) 2024 Alessio Giacché <ale.giacc.dev@gmail.com>
+License : MIT
+------------------------------------------------------------------------
+"""
+
+# Import
+from Utils.general_query_lib import check_property_key, check_relationship_type
+
+# The labels of the base EKG nodes saved in the snapshot
+SNAPSHOT_LABELS = ['Event', 'Entity']
+
+# The Cypher functions used to restore the temporal properties
+TEMPORAL_FUNCTIONS = {'localDateTime', 'dateTime', 'date', 'localTime', 'duration'}
+
+
+# ---------- Snapshot queries ----------
+
+def get_snapshot_nodes_query(label):
+    """
+    Get the nodes of the base EKG with a label (the filter view is excluded)
+    :param label: the label
+    :return: the query
+    """
+    label = check_snapshot_label(label)
+    return (f"""
+            MATCH (n:{label})
+            WHERE NOT n:FilteredOut
+            RETURN id(n) AS sid, properties(n) AS properties
+            """)
+
+
+def get_snapshot_relationships_query(source_label, target_label):
+    """
+    Get the relationships of the base EKG between two labels (the inferred relationships are excluded)
+    :param source_label: the source label
+    :param target_label: the target label
+    :return: the query
+    """
+    source_label = check_snapshot_label(source_label)
+    target_label = check_snapshot_label(target_label)
+    return (f"""
+            MATCH (a:{source_label})-[r]->(b:{target_label})
+            WHERE NOT a:FilteredOut AND NOT b:FilteredOut AND r.Inferred IS NULL
+            RETURN id(a) AS source, id(b) AS target, type(r) AS type, properties(r) AS properties
+            """)
+
+
+# ---------- Restore queries ----------
+
+def create_snapshot_sid_index(label):
+    """
+    Create the temporary snapshot id index (used to match the relationships endpoints)
+    :param label: the label
+    :return: the query
+    """
+    return f"CREATE INDEX ON :{check_snapshot_label(label)}(_sid)"
+
+
+def drop_snapshot_sid_index(label):
+    """
+    Drop the temporary snapshot id index
+    :param label: the label
+    :return: the query
+    """
+    return f"DROP INDEX ON :{check_snapshot_label(label)}(_sid)"
+
+
+def restore_nodes_batch_query(label, temporal_keys):
+    """
+    Restore nodes query for batched writes (rows are sent as the $batch parameter)
+    :param label: the label
+    :param temporal_keys: the temporal property keys with the Cypher function used to restore them
+    :return: the query
+    """
+    temporal_set = "".join([f", n.{check_property_key(key)} = {check_temporal_function(function)}"
+                            f"(row.temporal.{key})"
+                            for key, function in temporal_keys.items()])
+
+    return (f"UNWIND $batch AS row "
+            f"CREATE (n:{check_snapshot_label(label)} {{_sid: row.sid}}) "
+            f"SET n += row.properties{temporal_set}")
+
+
+def restore_relationships_batch_query(source_label, target_label, rel_type):
+    """
+    Restore relationships query for batched writes (rows are sent as the $batch parameter)
+    :param source_label: the source label
+    :param target_label: the target label
+    :param rel_type: the relationship type
+    :return: the query
+    """
+    return (f"UNWIND $batch AS row "
+            f"MATCH (a:{check_snapshot_label(source_label)} {{_sid: row.source}}) "
+            f"MATCH (b:{check_snapshot_label(target_label)} {{_sid: row.target}}) "
+            f"CREATE (a)-[r:{check_relationship_type(rel_type)}]->(b) "
+            f"SET r = row.properties")
+
+
+def remove_snapshot_sid_query(label):
+    """
+    Remove the temporary snapshot id from the restored nodes
+    :param label: the label
+    :return: the query
+    """
+    return f"MATCH (n:{check_snapshot_label(label)}) WHERE n._sid IS NOT NULL REMOVE n._sid"
+
+
+# ---------- Validation ----------
+
+def check_snapshot_label(label):
+    """
+    Validate a snapshot label
+    :param label: the label
+    :return: the label
+    """
+    if label not in SNAPSHOT_LABELS:
+        raise ValueError(f"Invalid snapshot label: {label}")
+    return label
+
+
+def check_temporal_function(function):
+    """
+    Validate a temporal function
+    :param function: the Cypher function
+    :return: the function
+    """
+    if function not in TEMPORAL_FUNCTIONS:
+        raise ValueError(f"Invalid temporal function: {function}")
+    return function
@@ -25,8 +25,13 @@ from Controllers.graph_json_controller import graph_json_controller_bp
 from Controllers.dataset_controller import dataset_controller_bp
 from Controllers.filters_controller import filters_controller_bp
 from Controllers.onboarding_controller import onboarding_controller_bp
+from Controllers.job_controller import job_controller_bp
+from Controllers.export_controller import export_controller_bp
+from Controllers.backup_controller import backup_controller_bp
 from Shared.support_config import get_db_connector
+from Shared.response_compression import init_response_compression
 from Models.api_response_model import ApiResponse
+from Models.docker_client_model import DockerClient
 from Models.logger_model import Logger
 
 # App
@@ -42,6 +47,9 @@ app.register_blueprint(graph_json_controller_bp)
 app.register_blueprint(dataset_controller_bp)
 app.register_blueprint(filters_controller_bp)
 app.register_blueprint(onboarding_controller_bp)
+app.register_blueprint(job_controller_bp)
+app.register_blueprint(export_controller_bp)
+app.register_blueprint(backup_controller_bp)
 
 # Init the Socket
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -52,6 +60,9 @@ app.config['socketio'] = socketio
 # Add application CORS
 CORS(app)
 
+# Compress the responses (Accept-Encoding negotiation)
+init_response_compression(app)
+
 # Configure SOUP Docker folder and volume
 docker_soup_path = '/soup'
 
@@ -63,6 +74,18 @@ log.setLevel(logging.ERROR)
 logger = Logger()
 
 
+# Count the Docker API calls of each request (X-Docker-Api-Calls header)
+@app.before_request
+def reset_docker_api_calls():
+    DockerClient.reset_api_calls()
+
+
+@app.after_request
+def add_docker_api_calls_header(response):
+    response.headers['X-Docker-Api-Calls'] = str(DockerClient.get_api_calls())
+    return response
+
+
 # Welcome, API
 @app.route('/api/v2/welcome', methods=['GET'])
 def welcome_api():
@@ -118,6 +141,31 @@ def connect_database():
         return jsonify(response.to_dict()), 500
 
 
+@app.route('/api/v2/memgraph-pool', methods=['GET'])
+def memgraph_pool_statistics():
+    """
+    Get the Memgraph connection pool statistics
+    :return: ApiResponse model
+    """
+
+    response = ApiResponse()
+
+    try:
+        database_connector = get_db_connector()
+
+        response.http_status_code = 200
+        response.message = "Memgraph connection pool statistics"
+        response.response_data = database_connector.get_pool_statistics()
+        return jsonify(response.to_dict()), 200
+    except Exception as e:
+        response.http_status_code = 500
+        response.message = f"Internal Server Error: {e}"
+        response.response_data = None
+
+        logger.error(f'Internal Server Error: {e}')
+        return jsonify(response.to_dict()), 500
+
+
 # Main (run the Server on 8080)
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080, debug=True)